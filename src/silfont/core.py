@@ -5,9 +5,9 @@ __copyright__ = 'Copyright (c) 2014-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'David Raymond'
 
-from glob import glob
 from collections import OrderedDict
-import sys, os, argparse, datetime, shutil, csv, configparser
+import sys, os, argparse, shutil, csv, time, contextlib, io
+# Other modules, including font libraries, are imported when needed to keep start-up time down, eg for -h
 
 import silfont
 
@@ -15,6 +15,8 @@ class loggerobj(object):
     # For handling log messages.
     # Use S for severe errors caused by data, parameters supplied by user etc
     # Use X for severe errors caused by bad code to get traceback exception
+    # Messages can be passed lazily, either as a format string plus arguments, eg log("Renamed %s to %s", "I", old, new),
+    # or as a function returning the message, so no formatting is done for messages that are not going to be output
 
     def __init__(self, logfile=None, loglevels="", leveltext="",  loglevel="W", scrlevel="P"):
         self.logfile = logfile
@@ -22,6 +24,8 @@ class loggerobj(object):
         self.leveltext = leveltext
         self.errorcount = 0
         self.warningcount = 0
+        self._stampsecs = None  # Time stamps are only formatted once per second
+        self._stamp = ""
         if not self.loglevels: self.loglevels = {'X': 0,       'S': 1,       'E': 2,       'P': 3,       'W': 4,       'I': 5,       'V': 6}
         if not self.leveltext: self.leveltext = ('Exception ', 'Severe:   ', 'Error:    ', 'Progress: ', 'Warning:  ', 'Info:     ', 'Verbose:  ')
         super(loggerobj, self).__setattr__("loglevel", "E") # Temp values so invalid log levels can be reported
@@ -41,12 +45,23 @@ class loggerobj(object):
         super(loggerobj, self).__setattr__(name, value)
         if name == "scrlevel" : self._basescrlevel = value # Used by resetscrlevel
 
-    def log(self, logmessage, msglevel="W"):
+    def log(self, logmessage, msglevel="W", *args):
         levelval = self.loglevels[msglevel]
-        message = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S ") + self.leveltext[levelval] + str(logmessage)
-        #message = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[0:22] +" "+ self.leveltext[levelval] + logmessage  ## added milliseconds for timing tests
-        if levelval <= self.loglevels[self.scrlevel]: print(message)
-        if self.logfile and levelval <= self.loglevels[self.loglevel]: self.logfile.write(message + "\n")
+        screen = levelval <= self.loglevels[self.scrlevel]
+        tofile = self.logfile and levelval <= self.loglevels[self.loglevel]
+        if screen or tofile:
+            if callable(logmessage):
+                logmessage = logmessage()
+            elif args:
+                logmessage = logmessage % args
+            secs = int(time.time())
+            if secs != self._stampsecs:
+                self._stampsecs = secs
+                self._stamp = time.strftime("%Y-%m-%d %H:%M:%S ", time.localtime(secs))
+            message = self._stamp + self.leveltext[levelval] + str(logmessage)
+            #message = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[0:22] +" "+ self.leveltext[levelval] + logmessage  ## added milliseconds for timing tests
+            if screen: print(message)
+            if tofile: self.logfile.write(message + "\n")
         if msglevel == "S":
             print("\n **** Fatal error - exiting ****")
             sys.exit(1)
@@ -54,6 +69,10 @@ class loggerobj(object):
         if msglevel == "E": self.errorcount += 1
         if msglevel == "W": self.warningcount += 1
 
+    def wanted(self, msglevel):  # True if a message at msglevel would be output, eg to skip building costly messages
+        levelval = self.loglevels[msglevel]
+        return levelval <= self.loglevels[self.scrlevel] or bool(self.logfile and levelval <= self.loglevels[self.loglevel])
+
     def raisescrlevel(self, level): # Temporarily increase screen logging
         if level not in self.loglevels or level == "X" : self.log("Invalid scrlevel: " + level, "X")
         if self.loglevels[level] > self.loglevels[self.scrlevel]:
@@ -65,6 +84,74 @@ class loggerobj(object):
     def resetscrlevel(self):
         self.scrlevel = self._basescrlevel
 
+class profiler(object):
+    # For recording the time and peak memory used by phases of a script, based on the profile parameter.
+    # Code to be timed is put in "with profiler.phase(name):" blocks, which can be nested.  Does nothing unless started.
+
+    def __init__(self):
+        self.mode = ""  # "" (off), "times" or "cprofile"
+        self.phases = []  # List of [name, nesting depth, seconds, peak memory]
+        self.stack = []  # For nested phases, [phase, highest peak memory seen so far] for each enclosing phase
+        self.cprofile = None
+
+    def start(self, mode, logger):
+        mode = mode.lower()
+        if mode not in ("", "times", "cprofile"): logger.log("Invalid value '" + mode + "' for profile parameter", "S")
+        self.mode = mode
+        if mode == "": return
+        import tracemalloc
+        tracemalloc.start()
+        if mode == "cprofile":
+            import cProfile
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        self.startphase(name)
+        try:
+            yield
+        finally:
+            self.endphase()
+
+    def startphase(self, name):  # Use phase() where possible; startphase() and endphase() are for long blocks of code
+        if not self.mode: return
+        import tracemalloc
+        self.phases.append([name, len(self.stack), time.perf_counter(), 0])
+        peak = tracemalloc.get_traced_memory()[1]
+        if self.stack: self.stack[-1][1] = max(self.stack[-1][1], peak)
+        if hasattr(tracemalloc, "reset_peak"): tracemalloc.reset_peak()  # Not in Python 3.8, so peaks will include earlier phases
+        self.stack.append([self.phases[-1], 0])
+
+    def endphase(self):
+        if not self.mode: return
+        import tracemalloc
+        (entry, peak) = self.stack.pop()
+        entry[2] = time.perf_counter() - entry[2]
+        entry[3] = max(peak, tracemalloc.get_traced_memory()[1])
+        if self.stack: self.stack[-1][1] = max(self.stack[-1][1], entry[3])
+
+    def report(self, logger, profilefile=""):
+        # Log a table of the phases, then stop profiling
+        if not self.mode: return
+        if self.cprofile: self.cprofile.disable()
+        import tracemalloc
+        tracemalloc.stop()
+        lines = ["Profile of phases - times in seconds and peak memory in KB:", "  {:<50}{:>10}{:>12}".format("Phase", "Seconds", "Peak KB")]
+        for (name, depth, secs, peak) in self.phases:
+            lines.append("  {:<50}{:>10.3f}{:>12}".format("  " * depth + name, secs, peak // 1024))
+        logger.log("\n".join(lines), "P")
+        if self.cprofile:
+            import pstats
+            if profilefile:
+                self.cprofile.dump_stats(profilefile)
+                logger.log("cProfile statistics written to " + profilefile, "P")
+            else:
+                out = io.StringIO()
+                pstats.Stats(self.cprofile, stream=out).sort_stats("cumulative").print_stats(25)
+                logger.log("cProfile statistics:\n" + out.getvalue(), "P")
+        self.mode = ""
+
 
 class parameters(object):
     # Object for holding parameters information, organised by class (eg logging)
@@ -77,7 +164,7 @@ class parameters(object):
         # Default parameters for all modules
         defparams = {}
         defparams['system'] = {'version': silfont.__version__, 'copyright': silfont.__copyright__}  # Code treats these as read-only
-        defparams['logging'] = {'scrlevel': 'P', 'loglevel': 'W'}
+        defparams['logging'] = {'scrlevel': 'P', 'loglevel': 'W', 'profile': '', 'profilefile': ''}
         defparams['backups'] = {'backup': True, 'backupdir': 'backups', 'backupkeep': 5}
         # Default parameters for UFO module
         defparams['outparams'] = OrderedDict([ # Use ordered dict so parameters show in logical order with -h p
@@ -98,13 +185,25 @@ class parameters(object):
                                   'x', 'y', 'angle', 'type', 'smooth', 'name', 'format', 'color', 'identifier'])
             ])
         defparams['ufometadata'] = {"checkfix": "check"}   # Apply metadata fixes when reading UFOs
+        defparams['performance'] = OrderedDict([
+            ("lazyGlifs", False),    # Only parse glifs when first accessed
+            ("parallel", 0),         # Number of processes to use for reading and writing glifs
+            ("normCache", False),    # Use the normalization cache to skip glifs already normalized
+            ("checkfixCache", False), # Use the check & fix cache to skip checks on metadata checked in previous runs
+            ("outputManifest", False), # Record digests of files output, so they need not be read when next writing there
+            ("cacheDir", ""),        # Directory for cache files - "" for the user's cache directory
+            ("cacheSize", 100000),   # Maximum number of entries in each cache file
+            ("compactPoints", False),  # Store contour points in arrays rather than as xml elements
+            ("digestInput", False),  # Keep only a digest of glifs as read, rather than the full text
+            ("batchProcesses", 0)])  # Number of processes to use for processing fonts in batch mode
 
         self.paramshelp = {} # Info used when outputting help about parame options
         self.paramshelp["classdesc"] = {
             "logging": "controls the level of log messages go to screen or log files.",
             "backups": "controls backup settings for scripts that output fonts - by default backups are made if the output font is overwriting the input font",
             "outparams": "Output options for UFOs - cover UFO version and normalization",
-            "ufometadata": "controls if UFO metadata be checked, or checked and fixed"
+            "ufometadata": "controls if UFO metadata be checked, or checked and fixed",
+            "performance": "Options to speed up processing of UFOs - only apply to scripts using pysilfont's own UFO code"
         }
         self.paramshelp["paramsdesc"] = {
             "scrlevel": "Logging level for screen messages - one of S,E,P.W,I or V",
@@ -126,13 +225,26 @@ class parameters(object):
             "floatAttribs": "List of float attributes - used when setting decimal precision",
             "intAttribs": "List of attributes that should be integers",
             "attribOrders.glif": "Order in which to output glif attributes",
-            "checkfix": "Should check & fix tests be done - one of None, Check or Fix"
+            "checkfix": "Should check & fix tests be done - one of None, Check or Fix",
+            "lazyGlifs": "Only read glifs when first accessed. Unread glifs are not normalized on output",
+            "parallel": "Number of processes to use for reading and writing glifs - 0 or 1 for no parallel processing",
+            "normCache": "Skip reading and normalizing glifs known to be normalized from previous runs",
+            "checkfixCache": "Skip check & fix tests on fontinfo.plist and lib.plist if unchanged since a previous run, reporting the previous results",
+            "outputManifest": "Record digests of files written so unchanged files need not be read when next writing to an existing UFO",
+            "cacheDir": "Directory for cache files. Default is pysilfont in the user's cache directory",
+            "cacheSize": "Maximum number of entries in each cache file",
+            "compactPoints": "Store contour points in arrays to reduce memory use",
+            "digestInput": "Keep only a digest of the text of glifs read, to reduce memory use",
+            "batchProcesses": "Number of processes to use for processing fonts in batch mode - 0 or 1 to process them in turn",
+            "profile": "Report time and memory used by each phase - times, or cprofile to add cProfile statistics",
+            "profilefile": "File to save cProfile statistics to. If not set, a summary is logged instead"
         }
         self.paramshelp["defaultsdesc"] = { # For use where default needs clarifying with text
             "indentIncr" : "<two spaces>",
             "indentFirst": "<two spaces>",
             "plistIndentFirst": "<No indent>",
-            "UFOversion": "<Existing version>"
+            "UFOversion": "<Existing version>",
+            "cacheDir": "<User cache directory>"
         }
 
         self.classes = {}  # Dictionary containing a list of parameters in each class
@@ -140,6 +252,7 @@ class parameters(object):
         self.types = {}  # Python type for each parameter deduced from initial values supplied
         self.listtypes = {}  # If type is dict, the type of values in the dict
         self.logger = loggerobj()
+        self.profiler = profiler()  # Set up by execute() if the profile parameter is set
         defset = _paramset(self, "default", "defaults")
         self.sets = {"default": defset}
         self.lcase = {}  # Lower case index of parameters names
@@ -160,6 +273,7 @@ class parameters(object):
         # sourcedesc should be added for user-supplied data (eg config file) for reporting purposes
         dict = {}
         if configfile:
+            import configparser
             config = configparser.ConfigParser()
             config.read_file(open(configfile, encoding="utf-8"))
             if sourcedesc is None: sourcedesc = configfile
@@ -184,7 +298,7 @@ class parameters(object):
         print("\nMost pysilfont scripts have -p, --params options which can be used to change default behaviour of scripts.  For example '-p scrlevel=w' will log warning messages to screen \n")
         print("Listed below are all such parameters, grouped by purpose.  Not all apply to all scripts - "
               "in partucular outparams and ufometadata only apply to scripts using pysilfont's own UFO code")
-        for classn in ("logging", "backups", "ufometadata", "outparams"):
+        for classn in ("logging", "backups", "ufometadata", "outparams", "performance"):
             print("\n" + classn[0].upper() + classn[1:] + " - " + phelp["classdesc"][classn])
             for param in self.classes[classn]:
                 if param == "format1Glifs": continue # Param due to be phased out
@@ -306,7 +420,119 @@ class csvreader(object):    # Iterator for csv files, skipping comments and chec
             yield row
 
 
-def execute(tool, fn, scriptargspec, chain = None):
+class csvtable(object):
+    # Table of data from a csv file with headers, such as glyph_data.csv, indexed on the values in one column (by default
+    # glyph_name).  Rows are kept in a dict keyed on those values, so lookups, deletions and additions don't depend on the
+    # size of the table, and the order of rows is kept.  incsv can be a csvreader or a file name.
+    # - headers: the column headers if the csv has no header line, eg ["glyph_name", "ps_name"] for a simple 2 column file
+    # - required: other headers that must be present
+    # - types: functions to convert values for columns, keyed on header, used by value(), column() and sort()
+    # Data is only read when read() is called or when iterating over readrows(), which yields (key, row) for each row as
+    # it is read so scripts can process large files in one pass.
+    # Rows with empty keys and repeated keys are ignored with a warning, and rows with keys starting with # are ignored
+    def __init__(self, incsv, keyheader="glyph_name", headers=None, required=(), types=None, logger=None, name="glyph_data"):
+        if isinstance(incsv, str): incsv = csvreader(incsv, logger=logger)
+        self.incsv = incsv
+        self.logger = logger if logger else incsv.logger
+        self.name = name  # Used in log messages
+        self.keyheader = keyheader
+        self.types = dict(types) if types else {}
+        self.rows = {}  # The data, keyed on values in the key column
+        self.linenums = {}  # Line numbers in the input csv for each row
+        self.hasheaderline = headers is None
+        self.headers = list(incsv.firstline if headers is None else headers)
+        for header in (keyheader,) + tuple(required):
+            if header not in self.headers: self.logger.log("No " + header + " field in csv headers", "S")
+        self.cols = {header: col for (col, header) in enumerate(self.headers)}  # Column number for each header
+        self.keycol = self.cols[keyheader]
+        incsv.numfields = len(self.headers)
+        self._read = False
+
+    def readrows(self, include=None):
+        # Read the data, yielding (key, row) for each row added.  If include is supplied, only rows for which
+        # include(key, row) is True are added
+        if self._read: self.logger.log("csv data has already been read", "X")
+        self._read = True
+        incsv = self.incsv
+        if self.hasheaderline: next(incsv.reader, None)  # Skip first line with headers in
+        (rows, linenums, keycol) = (self.rows, self.linenums, self.keycol)
+        for row in incsv:
+            key = row[keycol].strip()
+            if include is not None and not include(key, row): continue
+            if key.startswith("#"): continue
+            if key == "":
+                self.logger.log("%s line %d: empty %s in %s; ignored" % (self.name, incsv.line_num, self._keydesc(), self.name), "W")
+                continue
+            if key in rows:
+                self.logger.log("%s line %d: %s %s previously seen in %s; ignored" % (self.name, incsv.line_num, self._keydesc(), key, self.name), "W")
+                continue
+            rows[key] = row
+            linenums[key] = incsv.line_num
+            yield (key, row)
+
+    def read(self, include=None):  # Read all the data
+        for item in self.readrows(include): pass
+        return self
+
+    def _keydesc(self):
+        return "glyph name" if self.keyheader == "glyph_name" else self.keyheader
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, key):
+        return key in self.rows
+
+    def __iter__(self):  # Iterate over keys in row order
+        return iter(self.rows)
+
+    def __getitem__(self, key):  # Returns the row as a list of values
+        return self.rows[key]
+
+    def items(self):
+        return self.rows.items()
+
+    def value(self, key, header, default=None):
+        # Return the value for the row and column, converted using types if a function is set for the column
+        if header not in self.cols: return default
+        value = self.rows[key][self.cols[header]]
+        convert = self.types.get(header)
+        return convert(value) if convert else value
+
+    def column(self, header):  # Yield (key, value) for all rows for the column, converting values as for value()
+        col = self.cols[header]
+        convert = self.types.get(header)
+        for (key, row) in self.rows.items(): yield (key, convert(row[col]) if convert else row[col])
+
+    def add(self, row, replace=False, headers=None):
+        # Add a row to the end of the table.  If headers (for the values in row) is supplied, the row is rearranged to
+        # match the table's columns, with empty values for missing columns.  If the key is already present, the row is
+        # only added if replace is True, in which case the old row is deleted.  Returns True if the row was added
+        if headers is not None:
+            pos = {header: col for (col, header) in enumerate(headers)}
+            row = [row[pos[header]] if header in pos else "" for header in self.headers]
+        key = row[self.keycol].strip()
+        if key in self.rows:
+            if not replace: return False
+            self.delete(key)
+        self.rows[key] = row
+        return True
+
+    def delete(self, key):
+        del self.rows[key]
+        self.linenums.pop(key, None)
+
+    def sort(self, header, reverse=False):  # Sort rows on the values in a column, converted as for value()
+        self.rows = dict(sorted(self.rows.items(), key=lambda item: self.value(item[0], header), reverse=reverse))
+
+    def write(self, filename):  # Write the table out, with the headers line if the input had one, one row at a time
+        with open(filename, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            if self.hasheaderline: writer.writerow(self.headers)
+            for row in self.rows.values(): writer.writerow(row)
+
+
+def execute(tool, fn, scriptargspec, chain = None, argv = None, params = None):
     # Function to handle parameter parsing, font and file opening etc in command-line scripts
     # Supports opening (and saving) fonts using PysilFont UFO (UFO), fontParts (FP) or fontTools (FT)
     # Special handling for:
@@ -315,6 +541,9 @@ def execute(tool, fn, scriptargspec, chain = None):
     #   -l  opens log file and also creates a logger function to write to the log file
     #   -p  other parameters. Includes backup settings and loglevel/scrlevel settings for logger
     #       for UFOlib scripts, also includes all outparams keys and ufometadata settings
+    # For UFO scripts, if the input font is a designspace file or a wildcard pattern, the script is run on each font in
+    # turn (batch mode) - see runbatch().  argv defaults to sys.argv.  params can be supplied so the caller has access to
+    # the logger even if execute() fails - see batchfont()
 
     argspec = list(scriptargspec)
 
@@ -323,19 +552,14 @@ def execute(tool, fn, scriptargspec, chain = None):
         chainfirst = True
         chain = None
 
-    params = chain["params"] if chain else parameters()
+    if chain: params = chain["params"]
+    if params is None: params = parameters()
     logger = chain["logger"] if chain else params.logger  # paramset has already created a basic logger
-    argv   = chain["argv"]   if chain else sys.argv
-
-    if tool == "UFO":
-        from silfont.ufo import Ufont
-    elif tool == "FT":
-        from fontTools import ttLib
-    elif tool == "FP":
-        from fontParts.world import OpenFont
-    elif tool == "" or tool is None:
+    argv   = chain["argv"]   if chain else (argv if argv else sys.argv)
+
+    if tool == "" or tool is None:
         tool = None
-    else:
+    elif tool not in ("UFO", "FT", "FP"):
         logger.log("Invalid tool in call to execute()", "X")
         return
     basemodule = sys.modules[fn.__module__]
@@ -451,6 +675,12 @@ def execute(tool, fn, scriptargspec, chain = None):
         if fppval is None: fppval = ""  # For scripts that can be run with no positional parameters
         (fppath, fpbase, fpext) = splitfn(fppval)  # First pos param use for defaulting
 
+    # Check for batch mode
+    batchfonts = None
+    if tool == "UFO" and not chain and not chainfirst and arginfo[0].get('type') == 'infont' and isinstance(fppval, str):
+        batchfonts = batchfontlist(fppval, logger)
+        if batchfonts is not None and fpext.lower() != ".designspace": fpbase = "batch"  # Rather than a wildcard pattern
+
     # Process parameters
     if chain:
         execparams = params.sets["main"]
@@ -524,7 +754,7 @@ def execute(tool, fn, scriptargspec, chain = None):
                         logger.log("Directory " + parent + " does not exist", "S")
                 logger.log('Opening log file for output: ' + logname, "P")
                 try:
-                    logfile = open(logname, "w", encoding="utf-8")
+                    logfile = open(logname, "w", encoding="utf-8", buffering=65536)  # Large buffer, since logging can be verbose
                 except Exception as e:
                     print(e)
                     sys.exit(1)
@@ -536,6 +766,14 @@ def execute(tool, fn, scriptargspec, chain = None):
         logger.log("Running:  " + " ".join(argv), "P")
         if not quiet: logger.scrlevel = execparams['scrlevel'].upper()
         setattr(args, 'logger', logger)
+        params.profiler.start(execparams['profile'], logger)
+    profiler = params.profiler
+
+    if batchfonts is not None:
+        runbatch(tool, fn, scriptargspec, argv, fppval, batchfonts, args, arginfo, params, logger)
+        profiler.report(logger, execparams['profilefile'])
+        reportcompletion(logger, quiet, logname, logfile)
+        return (args, None)
 
 # Process the argument values returned from argparse
 
@@ -635,20 +873,30 @@ def execute(tool, fn, scriptargspec, chain = None):
 # Open fonts - needs to be done after processing other arguments so logger and params are defined
 
     for name, aval in infontlist:
-        if chain and name == 'ifont':
+        if chain and name == arginfo[0]['name']:  # Chained font replaces the first positional parameter, usually ifont
             aval = chain["font"]
         else:
-            if tool == "UFO": aval = Ufont(aval, params=params)
-            if tool == "FT" : aval = ttLib.TTFont(aval)
-            if tool == "FP" : aval = OpenFont(aval)
+            with profiler.phase("Open font " + aval):
+                if tool == "UFO":
+                    from silfont.ufo import Ufont
+                    aval = Ufont(aval, params=params)
+                if tool == "FT":
+                    from fontTools import ttLib
+                    aval = ttLib.TTFont(aval)
+                if tool == "FP":
+                    from fontParts.world import OpenFont
+                    aval = OpenFont(aval)
         setattr(args, name, aval)  # Assign the font object to args attribute
 
 # All arguments processed, now call the main function
     setattr(args, "paramsobj", params)
     setattr(args, "cmdlineargs", argv)
-    newfont = fn(args)
+    with profiler.phase("Run script " + os.path.basename(argv[0])):
+        newfont = fn(args)
 # If an output font is expected and one is returned, output the font
-    if chainfirst: chain = True # Special handling for first call of chaining
+    if chainfirst:
+        profiler.report(logger, execparams['profilefile'])
+        chain = True # Special handling for first call of chaining
     if newfont:
         if chain:  # return font to be handled by chain()
             return (args, newfont)
@@ -669,12 +917,14 @@ def execute(tool, fn, scriptargspec, chain = None):
                                 sys.exit(1)
                         backupbase = os.path.join(backupdir, outfontbase+outfontext)
                         # Work out backup name based on existing backups
+                        from glob import glob
                         nums = sorted([int(i[len(backupbase)+1-len(i):-1]) for i in glob(backupbase+".*~")])  # Extract list of backup numbers from existing backups
                         newnum = max(nums)+1 if nums else 1
                         backupname = backupbase+"."+str(newnum)+"~"
                         # Backup the font
                         logger.log("Backing up input font to "+backupname, "P")
-                        shutil.copytree(outfont, backupname)
+                        with profiler.phase("Backup font"):
+                            shutil.copytree(outfont, backupname)
                         # Purge old backups
                         for i in range(0, len(nums) - backupmax + 1):
                             backupname = backupbase+"."+str(nums[i])+"~"
@@ -683,16 +933,24 @@ def execute(tool, fn, scriptargspec, chain = None):
                     else:
                         logger.log("No font backup done due to backup parameter setting", "I")
                 # Output the font
-                if tool in ("FT", "FP"):
-                    logger.log("Saving font to " + outfont, "P")
-                    newfont.save(outfont)
-                else:  # Must be Pyslifont Ufont
-                    newfont.write(outfont)
+                with profiler.phase("Write font " + outfont):
+                    if tool in ("FT", "FP"):
+                        logger.log("Saving font to " + outfont, "P")
+                        newfont.save(outfont)
+                    else:  # Must be Pyslifont Ufont
+                        newfont.write(outfont)
             else:
                 logger.log("Font returned to execute() but no output font is specified in arg spec", "X")
     elif chain:             # ) When chaining return just args - the font can be accessed by args.ifont
         return (args, None) # ) assuming that the script has not changed the input font
 
+    profiler.report(logger, execparams['profilefile'])
+    reportcompletion(logger, quiet, logname, logfile)
+
+    return (args, newfont)
+
+
+def reportcompletion(logger, quiet, logname, logfile):  # Report error and warning counts at the end of execute()
     if logger.errorcount or logger.warningcount:
         message = "Command completed with " + str(logger.errorcount) + " errors and " + str(logger.warningcount) + " warnings"
         if logger.scrlevel in ("S", "E") and logname != "":
@@ -710,7 +968,95 @@ def execute(tool, fn, scriptargspec, chain = None):
     else:
         logger.log("Command completed with no warnings", "P")
 
-    return (args, newfont)
+
+def batchfontlist(fontspec, logger):
+    # Return the list of fonts to process in batch mode, or None if fontspec is a single font.  fontspec can be a
+    # designspace file, in which case its sources are used, or a wildcard pattern, eg "source/*.ufo".  A font that exists
+    # is never treated as a pattern, so names like "Foo[wght].ufo" work
+    if fontspec.lower().endswith(".designspace"):
+        if not os.path.isfile(fontspec): logger.log("Designspace file " + fontspec + " does not exist", "S")
+        import fontTools.designspaceLib as DSD
+        fonts = []
+        for source in DSD.DesignSpaceDocument.fromfile(fontspec).sources:
+            if source.path not in fonts: fonts.append(source.path)  # Sources can share a UFO, eg for sparse layers
+    elif not os.path.exists(fontspec) and any(c in fontspec for c in "*?["):
+        from glob import glob
+        fonts = sorted(glob(fontspec))
+    else:
+        return None
+    if not fonts: logger.log("No fonts found for " + fontspec, "S")
+    return fonts
+
+
+def runbatch(tool, fn, scriptargspec, argv, fontspec, fonts, args, arginfo, params, logger):
+    # Run the script on each font in turn in batch mode, or in parallel if batchProcesses is set.  Each font has its own
+    # log file (based on the script's default log name) and error and warning counts are added to the batch logger
+    for ainfo in arginfo:
+        if ainfo.get('type') == 'outfont' and getattr(args, ainfo['name']):
+            logger.log("An output font can't be specified in batch mode - each font is output to itself", "S")
+    logopts = ('-l', '--log')
+    for a in scriptargspec:
+        if a[:-2][-1] == '--log': logopts = a[:-2]
+    batchprocesses = params.sets["main"]["batchProcesses"]
+    if not str(batchprocesses).isdigit(): logger.log("batchProcesses must be a whole number", "S")
+    processes = int(batchprocesses)
+
+    # Create argv for each font, replacing fontspec with the font and removing any log file option
+    fontargvs = []
+    for font in fonts:
+        fontargv = [argv[0]]
+        skip = replaced = False
+        for arg in argv[1:]:
+            if skip:
+                skip = False
+            elif arg in logopts:
+                skip = True
+            elif arg.split("=", 1)[0] in logopts or (arg[0:2] in logopts and arg[0:2] != "--"):  # eg --log=x or -lx
+                pass
+            elif arg == fontspec and not replaced:
+                fontargv.append(font)
+                replaced = True
+            else:
+                fontargv.append(arg)
+        fontargvs.append(fontargv)
+
+    logger.log("Batch mode: processing %d fonts from %s", "P", len(fonts), fontspec)
+    if processes > 1:
+        import concurrent.futures
+        with concurrent.futures.ProcessPoolExecutor(processes) as pool:
+            results = list(pool.map(batchfont, [tool] * len(fonts), [fn] * len(fonts), [scriptargspec] * len(fonts), fontargvs))
+    else:
+        results = []
+        for i, fontargv in enumerate(fontargvs):
+            logger.log("Batch mode: processing font %d of %d: %s", "P", i + 1, len(fonts), fonts[i])
+            with params.profiler.phase("Process font " + fonts[i]):
+                results.append(batchfont(tool, fn, scriptargspec, fontargv))
+
+    # Summarise results
+    for font, (errors, warnings, failure) in zip(fonts, results):
+        if failure is not None:
+            logger.log("%s: failed with %s", "E", font, failure)
+        else:
+            logger.log("%s: %d errors and %d warnings", "P", font, errors, warnings)
+            logger.errorcount += errors
+            logger.warningcount += warnings
+
+
+def batchfont(tool, fn, scriptargspec, argv):
+    # Process a single font for runbatch(), returning error and warning counts plus a description of any failure, so one
+    # font failing does not stop the rest being processed
+    params = parameters()
+    logger = params.logger
+    try:
+        execute(tool, fn, scriptargspec, argv=argv, params=params)
+    except SystemExit:
+        return (None, None, "a severe error")  # The script exited
+    except Exception as e:
+        logger.log("Unexpected error: %s: %s" % (type(e).__name__, e), "E")
+        return (None, None, "an unexpected error: %s: %s" % (type(e).__name__, e))
+    finally:  # Close the font's log file even if it failed, so buffered messages are not lost
+        if logger.logfile: logger.logfile.close()
+    return (logger.errorcount, logger.warningcount, None)
 
 
 def chain(argv, function, argspec, font, params, logger, quiet):  # Chain multiple command-line scripts using UFO module together without writing font to disk
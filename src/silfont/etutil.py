@@ -7,6 +7,7 @@ __author__ = 'David Raymond'
 
 from xml.etree import ElementTree as ET
 import silfont.core
+import silfont.util as UT
 
 import re, os, codecs, io, collections
 
@@ -16,6 +17,12 @@ _elementprotect = {
     '>' : '&gt;' }
 _attribprotect = dict(_elementprotect)
 _attribprotect['"'] = '&quot;' # Copy of element protect with double quote added
+# Translation tables for str.translate(), which is much faster than using re.sub() for each string
+_elementtable = str.maketrans(_elementprotect)
+_attribtable = str.maketrans(_attribprotect)
+_attribsortcache = {} # Cached attribute orderings for ETWriter, keyed on attributeOrder contents
+_numcache = {} # Cached formatted values for numeric attributes, since the same values occur many times
+_cachemax = 100000 # Caches are cleared when they reach this size, so memory use stays bounded
 
 class ETWriter(object) :
     """ General purpose ElementTree pretty printer complete with options for attribute order
@@ -38,73 +45,101 @@ class ETWriter(object) :
         self.intAttribs = intAttribs
 
     def _protect(self, txt, base=_attribprotect) :
+        if base is _attribprotect : return txt.translate(_attribtable)
+        if base is _elementprotect : return txt.translate(_elementtable)
         return re.sub(r'['+r"".join(base.keys())+r"]", lambda m: base[m.group(0)], txt)
 
-    def serialize_xml(self, base = None, indent = '') :
+    def serialize_xml(self, base = None, indent = '', subelements = None) :
         # Create the xml and return as a string
-        outstrings = []
-        outstr=""
+        # If subelements (a list of elements) is supplied, it is output as the contents of base in place of base's own
+        # sub-elements, so a tree does not have to be built just for output (see ufo.prepGlifForOutput())
+        out = []
         if base is None :
             base = self.root
-            outstr += '<?xml version="1.0" encoding="UTF-8"?>\n'
+            out.append('<?xml version="1.0" encoding="UTF-8"?>\n')
             if '.pi' in base.attrib : # Processing instructions
-                for pi in base.attrib['.pi'].split(",") : outstr += '<?{}?>\n'.format(pi)
-
-            if '.doctype' in base.attrib : outstr += '<!DOCTYPE {}>\n'.format(base.attrib['.doctype'])
-
+                for pi in base.attrib['.pi'].split(",") : out.append('<?' + pi + '?>\n')
+
+            if '.doctype' in base.attrib : out.append('<!DOCTYPE ' + base.attrib['.doctype'] + '>\n')
+
+        # Set up values used for every element, so they are not recalculated for each one
+        attribOrder = self.attributeOrder
+        orderkey = tuple(sorted(attribOrder.items(), key=lambda x: x[0]))
+        if orderkey not in _attribsortcache :
+            if len(_attribsortcache) > 100 : _attribsortcache.clear()
+            _attribsortcache[orderkey] = {}
+        self._sortcache = _attribsortcache[orderkey] # Sorted attributes (excluding .xxx ones) keyed on unsorted ones
+        if len(self._sortcache) > _cachemax : self._sortcache.clear()
+        self._floatAttribs = set(self.floatAttribs) if self.precision is not None else set()
+        self._intAttribs = set(self.intAttribs)
+        self._inlineelem = set(self.inlineelem)
+
+        if len(_numcache) > _cachemax : _numcache.clear()
+        self._serialize(base, indent, out, subelements)
+        return "".join(out)
+
+    def _serialize(self, base, indent, out, subelements = None) :
+        # Recursively add the xml for base to out, a list of strings
+        children = base if subelements is None else subelements
         tag = base.tag
         attribs = base.attrib
+        inline = tag in self._inlineelem
 
         if '.comments' in attribs :
-            for c in attribs['.comments'].split(",") : outstr += '{}<!--{}-->\n'.format(indent, c)
-
-        i = indent if tag not in self.inlineelem else ""
-        outstr += '{}<{}'.format(i, tag)
-
-        for k in sorted(list(attribs.keys()), key=lambda x: self.attributeOrder.get(x, x)):
-            if k[0] != '.' :
+            for c in attribs['.comments'].split(",") : out.append(indent + '<!--' + c + '-->\n')
+
+        line = '<' + tag if inline else indent + '<' + tag  # Built up then added to out in one go
+
+        if attribs :
+            keys = tuple(attribs)
+            sortedkeys = self._sortcache.get(keys)
+            if sortedkeys is None :
+                attribOrder = self.attributeOrder
+                sortedkeys = [k for k in sorted(keys, key=lambda x: attribOrder.get(x, x)) if k[0] != '.']
+                self._sortcache[keys] = sortedkeys
+            floatAttribs = self._floatAttribs
+            intAttribs = self._intAttribs
+            for k in sortedkeys :
                 att = attribs[k]
-                if self.precision is not None and k in self.floatAttribs :
+                if k in floatAttribs :
                     if "." in att:
-                        num = round(float(att), self.precision)
-                        att = int(num) if num == int(num) else num
-                elif k in self.intAttribs :
-                        att = int(round(float(att)))
+                        key = (att, self.precision)
+                        if key not in _numcache :
+                            num = round(float(att), self.precision)
+                            _numcache[key] = str(int(num) if num == int(num) else num)
+                        att = _numcache[key]
+                elif k in intAttribs :
+                    if att not in _numcache : _numcache[att] = str(int(round(float(att))))
+                    att = _numcache[att]
                 else:
-                    att = self._protect(att)
-                outstr += ' {}="{}"'.format(k, att)
-
-        if len(base) or (base.text and base.text.strip()) :
-            outstr += '>'
-            if base.text and base.text.strip() :
+                    att = att.translate(_attribtable)
+                line += ' ' + k + '="' + att + '"'
+
+        text = base.text
+        if text and not text.strip() : text = None
+        if len(children) or text :
+            out.append(line + '>')
+            if text :
                 if tag not in self.takesCData :
-                    t = base.text
-                    if self.indentML : t = t.replace('\n', '\n' + indent)
-                    t = self._protect(t, base=_elementprotect)
+                    if self.indentML : text = text.replace('\n', '\n' + indent)
+                    out.append(text.translate(_elementtable))
                 else :
-                    t = "<![CDATA[\n\t" + indent + base.text.replace('\n', '\n\t' + indent) + "\n" + indent + "]]>"
-                outstr += t
-            if len(base) :
-                if base[0].tag not in self.inlineelem : outstr += '\n'
-                if base == self.root:
-                    incr = self.indentFirst
-                else:
-                    incr = self.indentIncr
-                outstrings.append(outstr); outstr=""
-                for b in base : outstrings.append(self.serialize_xml(base=b, indent=indent + incr))
-                if base[-1].tag not in self.inlineelem : outstr += indent
-            outstr += '</{}>'.format(tag)
+                    out.append("<![CDATA[\n\t" + indent + text.replace('\n', '\n\t' + indent) + "\n" + indent + "]]>")
+            if len(children) :
+                if children[0].tag not in self._inlineelem : out.append('\n')
+                incr = self.indentFirst if base is self.root else self.indentIncr
+                subindent = indent + incr
+                for b in children : self._serialize(b, subindent, out)
+                if children[-1].tag not in self._inlineelem : out.append(indent)
+            line = '</' + tag + '>'
         else :
-            outstr += '/>'
+            line += '/>'
         if base.tail and base.tail.strip() :
-            outstr += self._protect(base.tail, base=_elementprotect)
-        if tag not in self.inlineelem : outstr += "\n"
+            line += base.tail.translate(_elementtable)
+        out.append(line if inline else line + "\n")
 
-        if '.commentsafter' in base.attrib :
-            for c in base.attrib['.commentsafter'].split(",") : outstr += '{}<!--{}-->\n'.format(indent, c)
-
-        outstrings.append(outstr)
-        return "".join(outstrings)
+        if '.commentsafter' in attribs :
+            for c in attribs['.commentsafter'].split(",") : out.append(indent + '<!--' + c + '-->\n')
 
 class _container(object) :
     # Parent class for other objects
@@ -124,27 +159,37 @@ class _container(object) :
 class xmlitem(_container):
     """ The xml data item for an xml file"""
 
-    def __init__(self, dirn = None, filen = None, parse = True, logger=None) :
+    def __init__(self, dirn = None, filen = None, parse = True, logger=None, xmldata=None, keepstr=True) :
+        # xmldata can be supplied if the file has already been read by readxmlfile(), eg in parallel by another process
+        # If keepstr is False, only a digest of the xml read is kept (indigest) and inxmlstr is re-read from disk if used
         self.logger = logger if logger else silfont.core.loggerobj()
         self._contents = {}
         self.dirn = dirn
         self.filen = filen
         self.inxmlstr = ""
+        self.indigest = None
+        self.inpath = None # Path the item was read from - filen may change later, eg if a glif is renamed
         self.outxmlstr = ""
         self.etree = None
         self.type = None
         if filen and dirn :
             fulln = os.path.join( dirn, filen)
-            self.inxmlstr = io.open(fulln, "rt", encoding="utf-8").read()
-            if parse :
-                try:
-                    self.etree = ET.fromstring(self.inxmlstr)
-                except:
-                    try:
-                        self.etree = ET.fromstring(self.inxmlstr.encode("utf-8"))
-                    except Exception as e:
-                        self.logger.log("Failed to parse xml for " + fulln, "E")
-                        self.logger.log(str(e), "S")
+            self.inpath = fulln
+            if xmldata is None : xmldata = readxmlfile(fulln, parse, keepstr)
+            (self.inxmlstr, self.etree, error, self.indigest) = xmldata
+            if error :
+                self.logger.log("Failed to parse xml for " + fulln, "E")
+                self.logger.log(error, "S")
+
+    @property
+    def inxmlstr(self) :
+        if self._inxmlstr is None : # Only the digest was kept, so read again from disk
+            return readxmlfile(self.inpath, False)[0]
+        return self._inxmlstr
+
+    @inxmlstr.setter
+    def inxmlstr(self, value) :
+        self._inxmlstr = value
 
     def write_to_file(self,dirn,filen) :
         outfile = io.open(os.path.join(dirn,filen),'w', encoding="utf-8")
@@ -264,6 +309,29 @@ class ETelement(_container):
                 if multi and val == [] : self.parseerrors.append("No " + ename + " elements ")
                 if not multi and val == None : self.parseerrors.append("No " + ename + " element")
 
+def readxmlfile(fulln, parse = True, keepstr = True) :
+    # Read an xml file and optionally parse it. Returns (xml string, etree, error message, digest)
+    # If keepstr is False, the xml string is returned as None and the digest of the xml is returned instead
+    # Kept at module level so it can be used with process pools
+    return parsexmldata(readxmlbytes(fulln), parse, keepstr)
+
+def readxmlbytes(fulln) : # Read an xml file as bytes, with line endings normalized as for reading in text mode
+    with io.open(fulln, "rb") as f : data = f.read()
+    if b"\r" in data : data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
+
+def parsexmldata(data, parse = True, keepstr = True) : # As readxmlfile() for xml already read by readxmlbytes()
+    inxmlstr = data.decode("utf-8") if keepstr else None
+    digest = None if keepstr else UT.textdigest(data)
+    etree = None
+    error = None
+    if parse :
+        try:
+            etree = ET.fromstring(data) # Parse from bytes, so the parser handles the decoding
+        except Exception as e:
+            error = str(e)
+    return (inxmlstr, etree, error, digest)
+
 def makeAttribOrder(attriblist) : # Turn a list of attrib names into an attributeOrder dict for ETWriter
         return dict(map(lambda x:(x[1], x[0]), enumerate(attriblist)))
 
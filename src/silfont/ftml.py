@@ -6,7 +6,6 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'David Raymond'
 
 from xml.etree import ElementTree as ET
-from fontTools import ttLib
 import re
 from xml.sax.saxutils import quoteattr
 import silfont.core
@@ -419,6 +418,7 @@ def parsefontsrc(text, allowplain = False) : # Check fontsrc text is valid and r
         return ("local("+text+")", None , text)
 
 def getfontinfo(filename) : # peek inside the font for the name, weight, style
+        from fontTools import ttLib
         f = ttLib.TTFont(filename)
         # take name from name table, NameID 1, platform ID 3, Encoding ID 1 (possible fallback platformID 1, EncodingID =0)
         n = f['name'] # name table from font
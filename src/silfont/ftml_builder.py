@@ -5,12 +5,16 @@ __copyright__ = 'Copyright (c) 2018-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'Bob Hallissy'
 
+from silfont.core import csvtable
 from silfont.ftml import Fxml, Ftestgroup, Ftest, Ffontsrc
-from palaso.unicode.ucd import get_ucd
 from itertools import product
 import re
 import collections.abc
 
+def get_ucd(*args):  # palaso is only imported when unicode data is needed
+    from palaso.unicode.ucd import get_ucd
+    return get_ucd(*args)
+
 # This module comprises two related functionalities:
 #  1. The FTML object which acts as a staging object for ftml test data. The methods of this class
 #     permit a gradual build-up of an ftml file, e.g.,
@@ -468,14 +472,9 @@ class FTMLBuilder(object):
         # Get headings from csvfile:
         fl = incsv.firstline
         if fl is None: self.logger.log("Empty input file", "S")
-        # required columns:
-        try:
-            nameCol = fl.index('glyph_name');
-            usvCol = fl.index('USV')
-        except ValueError as e:
-            self.logger.log('Missing csv input field: ' + str(e), 'S')
-        except Exception as e:
-            self.logger.log('Error reading csv input field: ' + str(e), 'S')
+        table = csvtable(incsv, required=('USV',), logger=self.logger)
+        nameCol = table.keycol
+        usvCol = table.cols['USV']
         # optional columns:
         # If -f specified, make sure we have the fonts column
         if whichfont is not None:
@@ -487,8 +486,6 @@ class FTMLBuilder(object):
         featCol = fl.index('Feat') if 'Feat' in fl else None
         bcp47Col = fl.index('bcp47tags') if 'bcp47tags' in fl else None
 
-        next(incsv.reader, None)  # Skip first line with headers
-
         # RE that matches names of glyphs we don't care about
         namesToSkipRE = re.compile('^(?:[._].*|null|cr|nonmarkingreturn|tab|glyph_name)$',re.IGNORECASE)
 
@@ -501,33 +498,24 @@ class FTMLBuilder(object):
         # RE that matches space-separated USV sequences
         USVsRE = re.compile(r'^[0-9A-Fa-f]{4,6}(?:\s+[0-9A-Fa-f]{4,6})*$')
 
-        # keep track of glyph names we've seen to detect duplicates
-        namesSeen = set()
-        psnamesSeen = set()
-
-        # OK, process all records in glyph_data
-        for line in incsv:
-            gname = line[nameCol].strip()
-
-            # things to ignore:
+        # things to ignore:
+        def include(gname, line):
             if namesToSkipRE.match(gname):
-                continue
+                return False
             if whichfont is not None and line[fontsCol] != '*' and line[fontsCol].lower().find(whichfont) < 0:
-                continue
-            if len(gname) == 0:
-                self._csvWarning('empty glyph name in glyph_data; ignored')
-                continue
-            if gname.startswith('#'):
-                continue
-            if gname in namesSeen:
-                self._csvWarning('glyph name %s previously seen in glyph_data; ignored' % gname)
-                continue
+                return False
+            return True
 
+        # keep track of ps names we've seen to detect duplicates; the table ignores duplicate glyph names
+        psnamesSeen = set()
+
+        # OK, process all records in glyph_data
+        for (gname, line) in table.readrows(include):
             psname = line[psCol].strip() or gname   # If psname absent, working name will be production name
             if psname in psnamesSeen:
                 self._csvWarning('psname %s previously seen; ignored' % psname)
+                table.delete(gname)
                 continue
-            namesSeen.add(gname)
             psnamesSeen.add(psname)
 
             # compute basename-- the glyph name without extensions:
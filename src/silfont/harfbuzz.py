@@ -5,6 +5,9 @@ import gi
 gi.require_version('HarfBuzz', '0.0')
 from gi.repository import HarfBuzz as hb
 from gi.repository import GLib
+from array import array
+from collections import OrderedDict
+import weakref
 
 class Glyph(object):
     def __init__(self, gid, **kw):
@@ -15,51 +18,126 @@ class Glyph(object):
     def __repr__(self):
         return "[{gid}@({offset[0]},{offset[1]})+({advance[0]},{advance[1]})]".format(**self.__dict__)
 
+class ShapeResult(object):
+    'Shaped glyphs for a string, held in arrays with one entry per glyph rather than as Glyph objects'
+
+    def __init__(self, num_glyphs):
+        self.gids = array('I', [0]) * num_glyphs
+        self.clusters = array('I', self.gids)
+        self.flags = array('I', self.gids)
+        self.x_offsets = array('i', [0]) * num_glyphs
+        self.y_offsets = array('i', self.x_offsets)
+        self.x_advances = array('i', self.x_offsets)
+        self.y_advances = array('i', self.x_offsets)
+
+    def __len__(self):
+        return len(self.gids)
+
+    def __getitem__(self, i):
+        return Glyph(self.gids[i], cluster = self.clusters[i],
+                     offset = (self.x_offsets[i], self.y_offsets[i]),
+                     advance = (self.x_advances[i], self.y_advances[i]),
+                     flags = self.flags[i])
+
+    def glyphs(self):
+        'Return a list of Glyph objects, as returned by shape_text()'
+        return [self[i] for i in range(len(self))]
+
+    def __repr__(self):
+        return repr(self.glyphs())
+
+class Shaper(object):
+    '''Shape text with a font, keeping the HarfBuzz face and font between calls.
+    f can be a fontTools TTFont or a font file name.  Settings for each combination of features, lang, dir and script
+    used are kept for the most recent cachesize combinations, so shaping many strings with the same settings doesn't
+    process them again each time.'''
+
+    def __init__(self, f, shapers="", cachesize=32):
+        if isinstance(f, str):
+            with open(f, 'rb') as fontfile:
+                fontdata = fontfile.read()
+        else:
+            fontfile = f.reader.file
+            fontfile.seek(0, 0)
+            fontdata = fontfile.read()
+        blob = hb.glib_blob_create(GLib.Bytes.new(fontdata))
+        self.face = hb.face_create(blob, 0)
+        del blob
+        self.font = hb.font_create(self.face)
+        self.upem = hb.face_get_upem(self.face)
+        hb.font_set_scale(self.font, self.upem, self.upem)
+        hb.ot_font_set_funcs(self.font)
+        self.shapers = shapers
+        self.cachesize = cachesize
+        self._configs = OrderedDict()  # Processed settings, with the most recently used last
+        self._buf = hb.buffer_create()  # Reused for each string
+
+    def _config(self, features, lang, dir, script):
+        key = (tuple(features), lang, dir, script)
+        config = self._configs.get(key)
+        if config is None:
+            feats = []
+            for feat_string in features:
+                (ok, feat) = hb.feature_from_string(feat_string)
+                if ok: feats.append(feat)
+            config = (feats,
+                      hb.language_from_string(lang) if lang else None,
+                      hb.direction_from_string(dir) if dir else None,
+                      hb.script_from_string(script) if script else None)
+            self._configs[key] = config
+            if len(self._configs) > self.cachesize: self._configs.popitem(last=False)
+        else:
+            self._configs.move_to_end(key)
+        return config
+
+    def shape(self, text, features=[], lang=None, dir="", script=""):
+        'Shape a single string, returning a ShapeResult'
+        (feats, language, direction, scriptobj) = self._config(features, lang, dir, script)
+        return self._shape(text, feats, language, direction, scriptobj)
+
+    def shape_many(self, texts, features=[], lang=None, dir="", script=""):
+        'Shape a list of strings with the same settings, returning a list of ShapeResults'
+        (feats, language, direction, scriptobj) = self._config(features, lang, dir, script)
+        return [self._shape(text, feats, language, direction, scriptobj) for text in texts]
+
+    def _shape(self, text, feats, language, direction, scriptobj):
+        buf = self._buf
+        hb.buffer_clear_contents(buf)
+        hb.buffer_add_utf8(buf, text.encode('utf-8'), 0, -1)
+        hb.buffer_guess_segment_properties(buf)
+        if direction is not None:
+            hb.buffer_set_direction(buf, direction)
+        if scriptobj is not None:
+            hb.buffer_set_script(buf, scriptobj)
+        if language is not None:
+            hb.buffer_set_language(buf, language)
+        if self.shapers:
+            hb.shape_full(self.font, buf, feats, self.shapers)
+        else:
+            hb.shape(self.font, buf, feats)
+
+        num_glyphs = hb.buffer_get_length(buf)
+        info = hb.buffer_get_glyph_infos(buf)
+        pos = hb.buffer_get_glyph_positions(buf)
+        res = ShapeResult(num_glyphs)
+        for i in range(num_glyphs):
+            (ginfo, gpos) = (info[i], pos[i])
+            res.gids[i] = ginfo.codepoint
+            res.clusters[i] = ginfo.cluster
+            res.flags[i] = ginfo.mask
+            res.x_offsets[i] = gpos.x_offset
+            res.y_offsets[i] = gpos.y_offset
+            res.x_advances[i] = gpos.x_advance
+            res.y_advances[i] = gpos.y_advance
+        return res
+
+# Shapers created by shape_text(), so the font is only loaded once for each TTFont
+_shapers = weakref.WeakKeyDictionary()
+
 def shape_text(f, text, features = [], lang=None, dir="", script="", shapers=""):
-    fontfile = f.reader.file
-    fontfile.seek(0, 0)
-    fontdata = fontfile.read()
-    blob = hb.glib_blob_create(GLib.Bytes.new(fontdata))
-    face = hb.face_create(blob, 0)
-    del blob
-    font = hb.font_create(face)
-    upem = hb.face_get_upem(face)
-    del face
-    hb.font_set_scale(font, upem, upem)
-    hb.ot_font_set_funcs(font)
-
-    buf = hb.buffer_create()
-    t = text.encode('utf-8')
-    hb.buffer_add_utf8(buf, t, 0, -1)
-    hb.buffer_guess_segment_properties(buf)
-    if dir:
-        hb.buffer_set_direction(buf, hb.direction_from_string(dir))
-    if script:
-        hb.buffer_set_script(buf, hb.script_from_string(script))
-    if lang:
-        hb.buffer_set_language(buf, hb.language_from_string(lang))
-    
-    feats = []
-    if len(features):
-        for feat_string in features:
-            if hb.feature_from_string(feat_string, -1, aFeats):   # noqa: F821
-                feats.append(aFeats)   # noqa: F821
-    if shapers:
-        hb.shape_full(font, buf, feats, shapers)
-    else:
-        hb.shape(font, buf, feats)
-
-    num_glyphs = hb.buffer_get_length(buf)
-    info = hb.buffer_get_glyph_infos(buf)
-    pos = hb.buffer_get_glyph_positions(buf)
-
-    glyphs = []
-    for i in range(num_glyphs):
-        glyphs.append(Glyph(info[i].codepoint, cluster = info[i].cluster,
-                        offset = (pos[i].x_offset, pos[i].y_offset),
-                        advance = (pos[i].x_advance, pos[i].y_advance),
-                        flags = info[i].mask))
-    return glyphs
+    fshapers = _shapers.setdefault(f, {})
+    if shapers not in fshapers: fshapers[shapers] = Shaper(f, shapers)
+    return fshapers[shapers].shape(text, features, lang, dir, script).glyphs()
 
 if __name__ == '__main__':
     import sys
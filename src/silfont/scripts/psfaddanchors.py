@@ -8,6 +8,7 @@ __author__ = 'David Rowe'
 from silfont.core import execute
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input UFO'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output UFO','nargs': '?' }, {'type': 'outfont'}),
@@ -72,5 +73,5 @@ def doit(args) :
         infont.logger.log("Error parsing XML input file: " + str(mess), "S")
         return # but really should terminate after logging Severe error above
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
@@ -17,6 +17,7 @@ from silfont.comp import CompGlyph
 from silfont.etutil import ETWriter
 from silfont.util import parsecolors
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input UFO'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output UFO','nargs': '?' }, {'type': 'outfont'}),
@@ -91,7 +92,7 @@ def doit(args):
             elif e.tag == 'advance': adv = int(e.get('width'))
             elif e.tag == 'base':
                 addtolist(e,None)
-        logger.log(str(glyphlist),"V")
+        logger.log("%s", "V", glyphlist)
 
         # find each component glyph and compute x,y position
         xadvance = lsb
@@ -153,17 +154,18 @@ def doit(args):
                     continue # skip this anchor
                 # add anchor (adjusted for position in targetglyph)
                 targetglyphanchors[thisanchorname] = ( int( dic['x'] ) + xOffset, int( dic['y'] ) + yOffset )
-                logger.log("Adding anchor " + thisanchorname + ": " + str(targetglyphanchors[thisanchorname]), "V")
-            logger.log(str(targetglyphanchors),"V")
+                logger.log("Adding anchor %s: %s", "V", thisanchorname, targetglyphanchors[thisanchorname])
+            logger.log("%s", "V", targetglyphanchors)
 
         if adv is not None:
             xadvance = adv  ### if adv specified, then this advance value overrides calculated value
         else:
             xadvance += rsb ### adjust with rsb
 
-        logger.log("Glyph: " + targetglyphname + ", " + str(targetglyphunicode) + ", " + str(xadvance), "V")
-        for c in componentlist:
-            logger.log(str(c), "V")
+        logger.log("Glyph: %s, %s, %s", "V", targetglyphname, targetglyphunicode, xadvance)
+        if logger.wanted("V"):
+            for c in componentlist:
+                logger.log(str(c), "V")
 
         # Flatten components unless -n set
         if not args.noflatten:
@@ -193,8 +195,9 @@ def doit(args):
             else:
                 componentlist = newcomponentlist
                 logger.log("Components flattened", "V")
-                for c in componentlist:
-                    logger.log(str(c), "V")
+                if logger.wanted("V"):
+                    for c in componentlist:
+                        logger.log(str(c), "V")
 
         # Check if this new glyph exists in the font already; if so, decide whether to replace, or issue warning
         preservedAPs = set()
@@ -308,5 +311,5 @@ def addtwo(a1, a2):
     b2 = int(a2) if a2 is not None else 0
     return b1 + b2
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
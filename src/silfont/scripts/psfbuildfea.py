@@ -76,6 +76,7 @@ class MyBuilder(Builder):
 
 
 #TODO: provide more argument info
+tool = None
 argspec = [
     ('input_fea', {'help': 'Input fea file'}, {}),
     ('input_font', {'help': 'Input font file'}, {}),
@@ -106,5 +107,5 @@ def doit(args) :
                     outf.write("{},{},{}\n".format(n, l.table, l.map_index))
     font.save(args.output)
 
-def cmd(): execute(None, doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
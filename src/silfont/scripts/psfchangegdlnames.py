@@ -11,6 +11,7 @@ __author__ = 'David Raymond'
 from silfont.core import execute
 import os, re
 
+tool = None
 argspec = [
     ('input',{'help': 'Input file or folder'}, {'type': 'filename'}),
     ('output',{'help': 'Output file or folder', 'nargs': '?'}, {}),
@@ -156,5 +157,5 @@ def doit(args) :
     if missed != [] : logger.log("Names were missed from the csv file - see log file for details","E")
     return
 
-def cmd() : execute(None,doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
@@ -11,14 +11,15 @@ __author__ = 'Alan Ward'
 # but I don't know exactly where in the UFO that is
 
 from silfont.core import execute
-import defcon, fontTools.ttLib, ufo2ft
 
+tool = None
 argspec = [
     ('iufo', {'help': 'Input UFO folder'}, {}),
     ('ittf', {'help': 'Input ttf file name'}, {}),
     ('ottf', {'help': 'Output ttf file name'}, {})]
 
 def doit(args):
+    import defcon, fontTools.ttLib, ufo2ft
     ufo = defcon.Font(args.iufo)
     ttf = fontTools.ttLib.TTFont(args.ittf)
     
@@ -31,5 +32,5 @@ def doit(args):
     
     args.logger.log('Done', 'P')
 
-def cmd(): execute(None, doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
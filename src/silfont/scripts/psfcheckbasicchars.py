@@ -10,6 +10,7 @@ __author__ = 'Victor Gaultney'
 from silfont.core import execute
 from silfont.util import required_chars
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('-r', '--rtl', {'help': 'Also include characters just for RTL scripts', 'action': 'store_true'}, {}),
@@ -64,5 +65,5 @@ def doit(args) :
 
     return
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
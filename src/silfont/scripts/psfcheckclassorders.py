@@ -17,6 +17,7 @@ import types
 from xml.etree import ElementTree as ET
 from silfont.core import execute
 
+tool = None
 argspec = [
     ('classes', {'help': 'class definition in XML format', 'nargs': '?', 'default': 'classes.xml'}, {'type': 'infile'}),
     ('glyphdata', {'help': 'Glyph info csv file', 'nargs': '?', 'default': 'glyph_data.csv'}, {'type': 'incsv'}),
@@ -139,5 +140,5 @@ def orderClass(classElement, logger):
 
 
 
-def cmd() : execute(None,doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
@@ -16,6 +16,7 @@ import glob
 from silfont.ftml import Fxml, Ftest
 from silfont.core import execute
 
+tool = None
 argspec = [
     ('inftml', {'help': 'Input ftml filename pattern (default: *.ftml) ', 'nargs' : '?', 'default' : '*.ftml'}, {}),
 ]
@@ -61,5 +62,5 @@ def doit(args):
                     if style not in usedStyles:
                         logger.log(f'  defined style "{style}" not used in any test', 'W')
 
-def cmd() : execute(None,doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
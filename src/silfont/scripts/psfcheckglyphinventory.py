@@ -8,8 +8,9 @@ __copyright__ = 'Copyright (c) 2020-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'Bob Hallissy'
 
-from silfont.core import execute
+from silfont.core import execute, csvtable
 
+tool = 'UFO'
 argspec = [
     ('ifont', {'help': 'Input UFO'}, {'type': 'infont'}),
     ('-i', '--input', {'help': 'Input text file, default glyph_data.csv in current directory', 'default': 'glyph_data.csv'}, {'type': 'incsv'}),
@@ -39,57 +40,38 @@ def doit(args):
     # If csv file, it must have headers for "glyph_name" and "USV"
     fl = incsv.firstline
     if fl is None: logger.log('Empty input file', 'S')
-    numfields = len(fl)
-    incsv.numfields = numfields
-    usvCol = None  # Use this as a flag later to determine whether to check USV inventory
-    if numfields > 1:  # More than 1 column, so must have headers
-        # Required columns:
-        try:
-            nameCol = fl.index('glyph_name');
-        except ValueError as e:
-            logger.log('Missing csv input field: ' + e.message, 'S')
-        except Exception as e:
-            logger.log('Error reading csv input field: ' + e.message, 'S')
-        # Optional columns:
-        usvCol = fl.index('USV') if 'USV' in fl else None
-
-        next(incsv.reader, None)  # Skip first line with headers in
-
-        glyphList = set()
-        for line in incsv:
-            gname = line[nameCol]
-            if len(gname) == 0 or line[0].strip().startswith('#'):
-                continue    # No need to include cases where name is blank or comment
-            if gname in glyphList:
-                csvWarning(f'glyph name {gname} previously seen; ignored')
-                continue
-            glyphList.add(gname)
-
-            if usvCol:
-                # Process USV field, which can be:
-                #   empty string -- unencoded glyph
-                #   single USV -- encoded glyph
-                #   USVs connected by '_' -- ligature (in glyph_data for test generation, not glyph encoding)
-                #   space-separated list of the above, where presence of multiple USVs indicates multiply-encoded glyph
-                for usv in line[usvCol].split():
-                    if '_' in usv:
-                        # ignore ligatures -- these are for test generation, not encoding
-                        continue
-                    try:
-                        uid = int(usv, 16)
-                    except Exception as e:
-                        csvWarning("invalid USV '%s' (%s); ignored: " % (usv, e.message))
-
-                    if uid in glyphFromCSVuid:
-                        csvWarning('USV %04X previously seen; ignored' % uid)
-                    else:
-                        # Remember this glyph encoding
-                        glyphFromCSVuid[uid] = gname
-                        uidsFromCSVglyph.setdefault(gname, set()).add(uid)
-    elif numfields == 1:   # Simple text file.
-        glyphList = set(line[0] for line in incsv)
+    if len(fl) > 1:  # More than 1 column, so must have headers
+        table = csvtable(incsv, logger=logger)
+    elif len(fl) == 1:   # Simple text file.
+        table = csvtable(incsv, headers=['glyph_name'], logger=logger)
     else:
         logger.log('Invalid csv file', 'S')
+    usvCol = table.cols.get('USV')  # Use this as a flag later to determine whether to check USV inventory
+
+    for (gname, line) in table.readrows():
+        if usvCol is not None:
+            # Process USV field, which can be:
+            #   empty string -- unencoded glyph
+            #   single USV -- encoded glyph
+            #   USVs connected by '_' -- ligature (in glyph_data for test generation, not glyph encoding)
+            #   space-separated list of the above, where presence of multiple USVs indicates multiply-encoded glyph
+            for usv in line[usvCol].split():
+                if '_' in usv:
+                    # ignore ligatures -- these are for test generation, not encoding
+                    continue
+                try:
+                    uid = int(usv, 16)
+                except Exception as e:
+                    csvWarning("invalid USV '%s' (%s); ignored: " % (usv, e))
+                    continue
+
+                if uid in glyphFromCSVuid:
+                    csvWarning('USV %04X previously seen; ignored' % uid)
+                else:
+                    # Remember this glyph encoding
+                    glyphFromCSVuid[uid] = gname
+                    uidsFromCSVglyph.setdefault(gname, set()).add(uid)
+    glyphList = set(table)
 
     # Get the list of glyphs in the UFO
     ufoList = set(font.deflayer.keys())
@@ -106,7 +88,7 @@ def doit(args):
     if len(notInUFO) == 0 and len(notInGlyphData) == 0:
         logger.log('No glyph inventory differences found', 'P')
 
-    if usvCol:
+    if usvCol is not None:
         # We can check encoding of glyphs in common
         inBoth = glyphList & ufoList   # Glyphs we want to examine
 
@@ -129,5 +111,5 @@ def doit(args):
         logger.log('Glyph encodings not compared', 'P')
 
 
-def cmd(): execute('UFO', doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
@@ -6,15 +6,16 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'David Raymond'
 
 from silfont.core import execute
-from fontParts.world import OpenFont
-import fontTools.designspaceLib as DSD
 
+tool = None
 argspec = [
     ('designspace', {'help': 'Design space file'}, {'type': 'filename'}),
     ('-l','--log', {'help': 'Log file'}, {'type': 'outfile', 'def': '_checkinterp.log'}),
     ]
 
 def doit(args) :
+    from fontParts.world import OpenFont
+    import fontTools.designspaceLib as DSD
     logger = args.logger
 
     ds = DSD.DesignSpaceDocument()
@@ -71,5 +72,5 @@ def doit(args) :
         else:
             logger.log("All the glyphs are interpolatable", "P")
 
-def cmd() : execute(None,doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
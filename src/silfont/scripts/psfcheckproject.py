@@ -7,11 +7,11 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'David Raymond'
 
 from silfont.core import execute, splitfn
-import fontTools.designspaceLib as DSD
 import glob, os
 import silfont.ufo as UFO
 import silfont.etutil as ETU
 
+tool = ''
 argspec = [
     ('ds', {'help': 'designspace files to check; wildcards allowed', 'nargs': "+"}, {'type': 'filename'})
 ]
@@ -20,6 +20,7 @@ argspec = [
 # For example projectroot, psource
 
 def doit(args):
+    import fontTools.designspaceLib as DSD
     logger = args.logger
 
     # Open all the supplied DS files and ufos within them
@@ -110,5 +111,5 @@ class Ufo(object): # Read just the bits for UFO needed for current checks for ef
                         break
                 self.unicodes[glyphn] = unicode
 
-def cmd(): execute('', doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
@@ -12,6 +12,7 @@ from xml.etree import ElementTree as ET
 
 # specify three parameters: input file (single line format), output file (XML format), log file
 # and optional -p indentFirst "   " -p indentIncr "   " -p "PSName,UID,with,at,x,y" for XML formatting.
+tool = None
 argspec = [
     ('input',{'help': 'Input file of CD in single line format'}, {'type': 'infile'}),
     ('output',{'help': 'Output file of CD in XML format'}, {'type': 'outfile', 'def': '_out.xml'}),
@@ -60,6 +61,6 @@ def doit(args) :
     
     return
 
-def cmd() : execute(None,doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()    
 
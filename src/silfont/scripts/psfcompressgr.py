@@ -5,6 +5,7 @@ __copyright__ = 'Copyright (c) 2017-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'Martin Hosken'
 
+tool = 'FT'
 argspec = [
     ('ifont',{'help': 'Input TTF'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output TTF','nargs': '?' }, {'type': 'outfont'}),
@@ -95,6 +96,6 @@ def doit(args) :
         infont[tag] = table
     return infont
 
-def cmd() : execute('FT', doit, argspec)
+def cmd() : execute(tool, doit, argspec)
 if __name__ == "__main__" : cmd()
 
@@ -10,6 +10,7 @@ from silfont.core import execute
 from silfont.ufo import makeFileName, Uglif
 import re
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -42,9 +43,6 @@ class Glyph:
         Glyph.nameMap[oldname] = self.newname
 
 
-# Mapping from decimal USV to glyphname in target font
-dusv2gname = None
-
 # RE for parsing glyph names and peeling off the .copyX if present in order to search for a unique name to use:
 gcopyRE = re.compile(r'(^.+?)(?:\.copy(\d+))?$')
 
@@ -53,12 +51,6 @@ def copyglyph(sfont, tfont, g, args):
     """copy glyph from source font to target font"""
     # Generally, 't' variables are target, 's' are source. E.g., tfont is target font.
 
-    global dusv2gname
-    if not dusv2gname:
-        # Create mappings to find existing glyph name from decimal usv:
-        dusv2gname = {int(unicode.hex, 16): gname for gname in tfont.deflayer for unicode in tfont.deflayer[gname]['unicode']}
-        # NB: Assumes font is well-formed and has at most one glyph with any particular Unicode value.
-
     # The layer where we want the copied glyph:
     tlayer = tfont.deflayer
 
@@ -66,13 +58,7 @@ def copyglyph(sfont, tfont, g, args):
     if g.newname in tlayer:
         # New name is already in font:
         tfont.logger.log("Replacing glyph '{0}' with new glyph".format(g.newname), "V")
-        glyph = tlayer[g.newname]
-        # While here, remove from our mapping any Unicodes from the old glyph:
-        for unicode in glyph["unicode"]:
-            dusv = int(unicode.hex, 16)
-            if dusv in dusv2gname:
-                del dusv2gname[dusv]
-        # Ok, remove old glyph from the layer
+        # Remove old glyph from the layer (which also removes its Unicodes from the layer's unicode index)
         tlayer.delGlyph(g.newname)
     else:
         # New name is not in the font:
@@ -101,16 +87,15 @@ def copyglyph(sfont, tfont, g, args):
         if g.dusv:
             # we want this glyph to be encoded.
             # First remove this Unicode from any other glyph in the target font
-            if g.dusv in dusv2gname:
-                oglyph = tlayer[dusv2gname[g.dusv]]
+            for oglyphn in tlayer.usvGlyphs(g.dusv):
+                oglyph = tlayer[oglyphn]
                 for unicode in oglyph["unicode"]:
                     if int(unicode.hex,16) == g.dusv:
                         oglyph.remove("unicode", object=unicode)
-                        tfont.logger.log("Removed USV {0:04X} from existing glyph '{1}'".format(g.dusv,dusv2gname[g.dusv]), "V")
+                        tfont.logger.log("Removed USV {0:04X} from existing glyph '{1}'".format(g.dusv,oglyphn), "V")
                         break
-            # Now add and record it:
+            # Now add it (the layer's unicode index is updated by glyph.add()):
             glyph.add("unicode", {"hex": '{:04X}'.format(g.dusv)})
-            dusv2gname[g.dusv] = g.newname
             tfont.logger.log("Added USV {0:04X} to glyph '{1}'".format(g.dusv, g.newname), "V")
 
     # Scale glyph if desired
@@ -120,10 +105,11 @@ def copyglyph(sfont, tfont, g, args):
                 if attr in e.attrib: e.set(attr, str(int(float(e.get(attr))* args.scale)))
 
     # Look through components, adjusting names and finding out if we need to copy some.
-    for component in glyph.etree.findall('./outline/component[@base]'):
-        oldname = component.get('base')
+    for component in (glyph['outline'].components if glyph['outline'] else []):
+        oldname = component.element.get('base')
+        if oldname is None: continue
         # Note: the following will cause recursion:
-        component.set('base', copyComponent(sfont, tfont, oldname ,args))
+        component.setBase(copyComponent(sfont, tfont, oldname ,args))
 
 
 
@@ -239,5 +225,5 @@ def doit(args) :
 
     return tfont
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
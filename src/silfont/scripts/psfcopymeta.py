@@ -10,6 +10,7 @@ from silfont.core import execute
 import silfont.ufo as UFO
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('fromfont',{'help': 'From font file'}, {'type': 'infont'}),
     ('tofont',{'help': 'To font file'}, {'type': 'infont'}),
@@ -144,5 +145,5 @@ def processnum(text, precision) : # Apply same processing to real numbers that n
     return text
 
 
-def cmd(): execute("UFO",doit, argspec)
+def cmd(): execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
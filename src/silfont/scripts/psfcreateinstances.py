@@ -23,12 +23,9 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Alan Ward'
 
 import os, re
-from mutatorMath.ufo.document import DesignSpaceDocumentReader
-from mutatorMath.ufo.instance import InstanceWriter
-from fontMath.mathGlyph import MathGlyph
-from mutatorMath.ufo import build as build_designspace
 from silfont.core import execute
 
+tool = None
 argspec = [
     ('designspace_path', {'help': 'Path to designspace document (or folder of them)'}, {}),
     ('-i', '--instanceName', {'help': 'Font name for instance to build'}, {}),
@@ -55,6 +52,8 @@ weightClasses = {
 }
 
 def InstanceWriterCF(output_path_prefix, calc_glyphs, fix_weight):
+    from mutatorMath.ufo.instance import InstanceWriter
+    from fontMath.mathGlyph import MathGlyph
 
     class LocalInstanceWriter(InstanceWriter):
         fixWeight = fix_weight
@@ -147,6 +146,8 @@ def progress_func(state="update", action=None, text=None, tick=0):
             logger.log("%s: %s\n%s" % (state, str(action), str(text)), 'I')
 
 def doit(args):
+    from mutatorMath.ufo.document import DesignSpaceDocumentReader
+    from mutatorMath.ufo import build as build_designspace
     global logger
     logger = args.logger
 
@@ -197,7 +198,7 @@ def doit(args):
     else:
         args.logger.log('Done with severe error', 'S')
 
-def cmd(): execute(None, doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
 
 # Future development might use: fonttools\Lib\fontTools\designspaceLib to read
@@ -9,6 +9,7 @@ import re
 from silfont.core import execute
 import re
 
+tool = ""
 argspec = [
     ('output',{'help': 'Output file containing composite definitions'}, {'type': 'outfile'}),
     ('-i','--input',{'help': 'Glyph info csv file'}, {'type': 'incsv', 'def': 'glyph_data.csv'}),
@@ -124,6 +125,6 @@ def doit(args):
 
     output.close()
 
-def cmd() : execute("",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
 
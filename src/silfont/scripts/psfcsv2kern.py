@@ -6,11 +6,9 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Martin Hosken'
 
 from silfont.core import execute
-from silfont.ufo import Uplist
-from xml.etree import ElementTree as ET
-import csv
 
 
+tool = "UFO"
 argspec = [
     ("ifont", {'help': 'Input font file'}, {'type': 'infont'}),
     ("ofont", {"help": "Output font file", "nargs": "?"}, {"type": "outfont"}),
@@ -18,28 +16,12 @@ argspec = [
 ]
 
 def doit(args):
-    kerns = {}
-    csvr = csv.reader(args.input)
-    for r in csvr:
-        key, skey, val = r
-        kerns.setdefault(key, {})[skey] = val
-    pd = ET.Element("plist")
-    kd = ET.SubElement(pd, "dict")
-    for k, v in kerns.items():
-        ET.SubElement(kd, "key").text = k
-        sd = ET.SubElement(kd, "dict")
-        for s, n in v.items():
-            ET.SubElement(sd, "key").text = s
-            ET.SubElement(sd, "integer").text = n
-    if hasattr(args.ifont, 'kerning'):
-        args.ifont.kerning.etree = pd
-    else:
-        plist = Uplist(font=args.ifont)
-        plist.etree = pd
-        args.ifont.kerning = plist
+    kerning = args.ifont.getKerning()
+    kerning.clear()  # Replace any existing kerning with that from the csv file
+    kerning.readcsv(args.input)
     return args.ifont
 
-def cmd() : execute("UFO", doit, argspec)
+def cmd() : execute(tool, doit, argspec)
 
 if __name__ == "__main__": cmd()
 
@@ -7,6 +7,7 @@ __author__ = 'Martin Hosken'
 
 from silfont.core import execute
 
+tool = 'FT'
 argspec = [
     ('ifont',{'help': 'Input TTF'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output TTF','nargs': '?' }, {'type': 'outfont'}),
@@ -42,6 +43,6 @@ def doit(args):
                     srec.Script.DefaultLangSys = lrec.LangSys
     return infont
 
-def cmd() : execute('FT', doit, argspec)
+def cmd() : execute(tool, doit, argspec)
 if __name__ == "__main__" : cmd()
 
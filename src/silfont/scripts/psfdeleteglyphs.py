@@ -8,6 +8,7 @@ __author__ = 'Victor Gaultney'
 from silfont.core import execute
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('ifont', {'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont', {'help': 'Output font file', 'nargs': '?'}, {'type': 'outfont'}),
@@ -49,15 +50,13 @@ def doit(args) :
     # Now loop round deleting the glyphs etc
     logger.log("Deleted glyphs:", "I")
 
-    # With groups and kerning, create dicts representing then plists (to make deletion of members easier) and indexes by glyph/member name
-    kgroupprefixes = {"public.kern1.": 1, "public.kern2.": 2}
+    # With groups, create a dict representing the plist (to make deletion of members easier) and an index by glyph name
     gdict = {}
-    kdict = {}
     groupsbyglyph = {}
-    ksetsbymember = {}
+    kerningdel = set()  # Names to remove from kerning pairs - deleted glyphs and their kern groups
 
     groups = font.groups if hasattr(font, "groups") else []
-    kerning = font.kerning if hasattr(font, "kerning") else []
+    kerning = font.getKerning() if hasattr(font, "kerning") else []
     if groups:
         for gname in groups:
             group = groups.getval(gname)
@@ -67,15 +66,6 @@ def doit(args) :
                     groupsbyglyph[glyph].append(gname)
                 else:
                     groupsbyglyph[glyph] = [gname]
-    if kerning:
-        for setname in kerning:
-            kset = kerning.getval(setname)
-            kdict[setname] = kset
-            for member in kset:
-                if member in ksetsbymember:
-                    ksetsbymember[member].append(setname)
-                else:
-                    ksetsbymember[member] = [setname]
 
     # Loop round doing the deleting
     for glyphn in sorted(deletelist):
@@ -102,36 +92,24 @@ def doit(args) :
         # First delete whole groups and kern pair sets
         for kerngroup in tocheck[1:]: # Don't check glyphn when deleting groups:
             if kerngroup in gdict: gdict.pop(kerngroup)
-        for setn in tocheck:
-            if setn in kdict: kdict.pop(setn)
+        kerningdel.update(tocheck)  # Pairs including these are removed from kerning below
         # Now delete members within groups and kern pair sets
         if glyphn in groupsbyglyph:
             for groupn in groupsbyglyph[glyphn]:
                 if groupn in gdict: # Need to check still there, since whole group may have been deleted above
                     group = gdict[groupn]
                     del group[group.index(glyphn)]
-        for member in tocheck:
-            if member in ksetsbymember:
-                for setn in ksetsbymember[member]:
-                    if setn in kdict: del kdict[setn][member]
-        # Now need to recreate groups.plist and kerning.plist
-        if groups:
-            for group in list(groups): groups.remove(group)  # Empty existing contents
-            for gname in gdict:
-                elem = ET.Element("array")
-                if gdict[gname]: # Only create if group is not empty
-                    for glyph in gdict[gname]:
-                        ET.SubElement(elem, "string").text = glyph
-                    groups.setelem(gname, elem)
-        if kerning:
-            for kset in list(kerning): kerning.remove(kset)  # Empty existing contents
-            for kset in kdict:
-                elem = ET.Element("dict")
-                if kdict[kset]:
-                    for member in kdict[kset]:
-                        ET.SubElement(elem, "key").text = member
-                        ET.SubElement(elem, "integer").text = str(kdict[kset][member])
-                    kerning.setelem(kset, elem)
+
+    # Now need to recreate groups.plist and update kerning
+    if groups:
+        for group in list(groups): groups.remove(group)  # Empty existing contents
+        for gname in gdict:
+            elem = ET.Element("array")
+            if gdict[gname]: # Only create if group is not empty
+                for glyph in gdict[gname]:
+                    ET.SubElement(elem, "string").text = glyph
+                groups.setelem(gname, elem)
+    if kerning: kerning.filter(lambda name: name not in kerningdel)  # Kern pair sets left empty are no longer output
 
     logger.log(str(len(deletelist)) + " glyphs deleted. Set logging to I to see details", "P")
     inalist = set(inliblists[0] + inliblists[1] + inliblists[2])
@@ -139,6 +117,6 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
 
@@ -10,6 +10,7 @@ from silfont.etutil import ETWriter
 from xml.etree import ElementTree as ET
 import re
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input UFO'}, {'type': 'infont'}),
     ('output',{'help': 'Output file exported anchor data in XML format', 'nargs': '?'}, {'type': 'outfile', 'def': '_anc.xml'}),
@@ -104,5 +105,5 @@ def doit(args) :
     etwobj=ETWriter(fontElement, indentFirst=indentFirst, indentIncr=indentIncr, attributeOrder=attributeOrder)
     ofile.write(etwobj.serialize_xml())
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
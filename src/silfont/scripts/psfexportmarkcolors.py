@@ -11,6 +11,7 @@ from silfont.util import parsecolors, colortoname
 import datetime
 
 suffix = "_colormap"
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('-o','--output',{'help': 'Output csv file'}, {'type': 'outfile', 'def': suffix+'.csv'}),
@@ -51,5 +52,5 @@ def doit(args) :
         if not color : outfile.write(glyphn + "," + colordef + "\n")
     return
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
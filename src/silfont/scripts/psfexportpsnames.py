@@ -10,6 +10,7 @@ from silfont.core import execute
 import datetime
 
 suffix = "_psnamesmap"
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('-o','--output',{'help': 'Ouput csv file'}, {'type': 'outfile', 'def': suffix+'.csv'}),
@@ -43,5 +44,5 @@ def doit(args) :
     if missingnames : font.logger("Some glyphs had no psnames - see log file","E")
     return
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
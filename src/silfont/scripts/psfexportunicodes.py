@@ -10,6 +10,7 @@ from silfont.core import execute
 import datetime
 
 suffix = "_unicodes"
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('-o','--output',{'help': 'Output csv file'}, {'type': 'outfile', 'def': suffix+'.csv'}),
@@ -39,5 +40,5 @@ def doit(args) :
             
     return
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
@@ -8,6 +8,7 @@ __author__ = 'David Raymond'
 
 from silfont.core import execute
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -44,5 +45,5 @@ def doit(args) :
 
     return args.ifont
 
-def cmd() : execute("UFO",doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
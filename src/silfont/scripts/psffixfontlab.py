@@ -11,6 +11,7 @@ from silfont.core import execute, splitfn
 from silfont.ufo import Ufont
 import os, shutil, glob
 
+tool = None
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'filename'}),
     ('-l','--log',{'help': 'Log file'}, {'type': 'outfile', 'def': '_fixfontlab.log'})]
@@ -165,5 +166,5 @@ def logchange(logger, logmess, key, old, new):
             logmess = logmess + " Old value: " + oldstr + ", new value: " + newstr
     logger.log(logmess, "I")
 
-def cmd() : execute(None,doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
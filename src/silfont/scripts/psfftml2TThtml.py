@@ -6,15 +6,16 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Bob Hallissy'
 
 from silfont.core import execute
-from fontTools import ttLib
+import silfont.util as UT
 from lxml import etree as ET    # using this because it supports xslt and HTML
 from collections import OrderedDict
 from subprocess import check_output, CalledProcessError
-import os, re
+import os, re, shutil, hashlib, time
 import gzip
 from glob import glob
 
 
+tool = None
 argspec = [
     ('ttfont', {'help': 'Input Tunable TTF file'}, {'type': 'filename'}),
     ('map', {'help': 'Feature mapping CSV file'}, {'type': 'incsv'}),
@@ -22,6 +23,9 @@ argspec = [
     ('--ftml', {'help': 'ftml file(s) to process. Can be used multiple times and can contain filename patterns.', 'action': 'append'}, {}),
     ('--xsl', {'help': 'standard xsl file. Default: ../tools/ftml.xsl', 'default': '../tools/ftml.xsl'}, {'type': 'filename'}),
     ('--norebuild', {'help': 'assume existing fonts are good', 'action': 'store_true'}, {}),
+    ('-j', '--jobs', {'help': 'Number of fonts to build at once. Default: number of CPUs', 'type': int}, {}),
+    ('--cache', {'help': 'Use and add to a cache of tuned fonts, so unchanged fonts are not rebuilt', 'action': 'store_true'}, {}),
+    ('--cachesize', {'help': 'Maximum number of tuned fonts to keep in the cache. Default: 50', 'type': int, 'default': 50}, {}),
     ]
 
 # Define globals needed everywhere:
@@ -30,6 +34,11 @@ logger = None
 sourcettf = None
 outputdir = None
 fontdir = None
+sourcedigest = None  # Digest of the contents of sourcettf, for cache keys
+fontcache = None     # fileCache recording the use of tuned fonts held in fontcachedir, or None if not caching
+fontcachedir = None
+pending = []         # Fonts to build, as (font_tag, settings file name, ttf name, cache key)
+staleage = 24 * 3600  # Age in seconds after which files in fontcachedir not in the cache are assumed left by killed runs
 
 
 # Dictionary of TypeTuner features, derived from 'feat_all.xml', indexed by feature name
@@ -221,9 +230,6 @@ def cache_font(feats, lang, norebuild):
         logger.log('Blindly using existing font {}'.format(font_tag), 'I')
         return font_tag
 
-    # Ok, need to build the font
-    logger.log('Building font {}'.format(font_tag), 'I')
-
     # Create and save the TypeTuner feature settings file
     sfname = os.path.join(fontdir, font_tag + '.xml')
     root = ET.XML('''\
@@ -243,20 +249,78 @@ def cache_font(feats, lang, norebuild):
     with open(sfname, '+wb')as f:
         f.write(xml)
 
-    # Now invoke TypeTuner to create the tuned font
+    # The font is built later, by build_fonts(), unless an identical one is in the cache
+    key = None
+    if fontcache is not None:
+        key = UT.textdigest(sourcedigest + font_tag + xml.decode('utf-8'))
+        if key in fontcache:
+            try:
+                shutil.copyfile(os.path.join(fontcachedir, key + '.ttf'), ttfname)
+                fontcache.get(key)  # Record as recently used
+                logger.log('Using cached font {}'.format(font_tag), 'I')
+                return font_tag
+            except OSError:  # Cached font has been removed, so build it again
+                pass
+    pending.append((font_tag, sfname, ttfname, key))
+
+    return font_tag
+
+def build_font(font_tag, sfname, ttfname):
+    'Invoke TypeTuner to create a tuned font, returning (output, error)'
     try:
         cmd = ['typetuner', '-o', ttfname, '-n', font_tag, sfname, sourcettf]
-        res = check_output(cmd)
-        if len(res):
-            print('\n', res)
+        return (check_output(cmd), None)
     except CalledProcessError as err:
-        logger.log("couldn't tune font: {}".format(err.output), 'S')
-
-    return font_tag
+        return (None, err.output)
+    except OSError as err:  # eg typetuner not installed
+        return (None, str(err))
+
+def build_fonts(jobs):
+    'Build all pending fonts, running up to jobs TypeTuner processes at once, then add them to the cache'
+    import concurrent.futures
+    if not pending: return
+    logger.log('Building {} fonts'.format(len(pending)), 'P')
+    with concurrent.futures.ThreadPoolExecutor(jobs or os.cpu_count()) as pool:  # Threads are enough since the work is done by TypeTuner
+        futures = [pool.submit(build_font, font_tag, sfname, ttfname) for (font_tag, sfname, ttfname, key) in pending]
+        for ((font_tag, sfname, ttfname, key), future) in zip(pending, futures):
+            (res, error) = future.result()
+            if error is not None: logger.log("couldn't tune font {}: {}".format(font_tag, error), 'S')
+            logger.log('Built font {}'.format(font_tag), 'I')
+            if len(res):
+                print('\n', res)
+            if key is not None:
+                tempn = os.path.join(fontcachedir, key + '.' + str(os.getpid()) + '.tmp')  # So other runs never see a partial file
+                shutil.copyfile(ttfname, tempn)
+                os.replace(tempn, os.path.join(fontcachedir, key + '.ttf'))
+                fontcache.set(key)
+    del pending[:]
+
+def save_cache(cachesize):
+    'Save the record of cached fonts, along with those recorded by other runs meanwhile, and remove fonts no longer in it'
+    fontcache.maxentries = cachesize
+    error = fontcache.save(merge=True)
+    if error:
+        logger.log(error, 'W')
+        return
+    # Only fonts dropped by this save are removed straight away, since other runs may be adding fonts they have built.
+    # Other files not in the cache (temporary or unrecorded fonts left by runs that were killed) are removed once stale
+    for key in fontcache.evicted:
+        try:
+            os.remove(os.path.join(fontcachedir, key + '.ttf'))
+        except OSError:
+            pass
+    stale = time.time() - staleage
+    for filen in glob(os.path.join(fontcachedir, '*')) + glob(fontcache.filen + '.*.tmp'):
+        if not (filen.endswith('.ttf') and os.path.basename(filen)[:-4] in fontcache):
+            try:
+                if os.path.getmtime(filen) < stale: os.remove(filen)
+            except OSError:
+                pass
 
 def doit(args) :
+    from fontTools import ttLib
 
-    global logger, sourcettf, outputdir, fontdir
+    global logger, sourcettf, outputdir, fontdir, sourcedigest, fontcache, fontcachedir
 
     logger = args.logger
     sourcettf = args.ttfont
@@ -267,6 +331,15 @@ def doit(args) :
     fontdir = os.path.join(outputdir, 'fonts')
     os.makedirs(fontdir, exist_ok = True)
 
+    # Tuned fonts are cached, keyed on the source font, the TypeTuner settings and the font name
+    if args.cache and not args.norebuild:
+        with open(sourcettf, 'rb') as f:
+            sourcedigest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+        cachedir = args.paramsobj.sets['main']['cacheDir']
+        fontcache = UT.fileCache.open(cachedir, 'typetuner', args.cachesize)
+        fontcachedir = os.path.join(cachedir if cachedir else UT.defaultcachedir(), 'typetuner')
+        os.makedirs(fontcachedir, exist_ok = True)
+
     # Read and save feature mapping
     for r in args.map:
         # remove empty cells from the end
@@ -384,6 +457,10 @@ def doit(args) :
             with open(outfname, '+wb')as f:
                 f.write(html)
 
+    # Build the fonts needed for all the html files
+    build_fonts(args.jobs)
+    if fontcache is not None: save_cache(args.cachesize)
+
 
-def cmd() : execute(None,doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
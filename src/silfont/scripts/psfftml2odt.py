@@ -6,7 +6,6 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'David Rowe'
 
 from silfont.core import execute
-from fontTools import ttLib
 from xml.etree import ElementTree as ET ### used to parse input FTML (may not be needed if FTML parser used)
 import re
 import os
@@ -21,6 +20,7 @@ from odf.text import H, P, SequenceDecl, SequenceDecls, Span
 
 # specify two parameters: input file (FTML/XML format), output file (ODT format)
 # preceded by optional log file plus zero or more font strings
+tool = ""
 argspec = [
     ('input',{'help': 'Input file in FTML format'}, {'type': 'infile'}),
     ('output',{'help': 'Output file (LO writer .odt)', 'nargs': '?'}, {'type': 'filename', 'def': '_out.odt'}),
@@ -88,6 +88,7 @@ def parsefeats(inputline):
     return ":" + "&".join( [f + '=' + featdic[f] for f in sorted(featdic)])
 
 def getfonts(fontsourcestrings, logfile, fromcommandline=True):
+    from fontTools import ttLib
     fontlist = []
     checkfontfamily = []
     checkembeddedfont = []
@@ -447,7 +448,7 @@ def doit(args) :
     LOdoc.save(args.output)
     return
 
-def cmd() : execute("",doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 
 if __name__ == "__main__": cmd()
 
@@ -8,6 +8,7 @@ __author__ = 'Bobby de Vos'
 from silfont.core import execute
 
 suffix = "_psfgetglyphnames"
+tool = "FP"
 argspec = [
     ('ifont',{'help': 'Font file to copy from'}, {'type': 'infont'}),
     ('glyphs',{'help': 'List of glyphs for psfcopyglyphs'}, {'type': 'outfile'}),
@@ -83,5 +84,5 @@ def doit(args) :
             glyphs.write(row + '\n')
 
 
-def cmd() : execute("FP",doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
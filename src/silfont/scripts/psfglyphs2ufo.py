@@ -8,12 +8,12 @@ __author__ = 'Victor Gaultney'
 from silfont.core import execute
 from silfont.ufo import obsoleteLibKeys
 
-import glyphsLib
 import silfont.ufo
 import silfont.etutil
 from io import open
 import os, shutil
 
+tool = None
 argspec = [
     ('glyphsfont', {'help': 'Input font file'}, {'type': 'filename'}),
     ('masterdir', {'help': 'Output directory for masters'}, {}),
@@ -24,6 +24,7 @@ argspec = [
     ('-r', '--restore', {'help': 'List of extra keys to restore to fontinfo.plist or lib.plist'}, {})]
 
 def doit(args):
+    import glyphsLib
     logger = args.logger
     masterdir = args.masterdir
     logger.log("Creating UFO objects from GlyphsApp file", "I")
@@ -281,5 +282,5 @@ def logchange(loglist, logmess, key, old, new):
         loglist.append(("Full new value: " + str(new), "V"))
     loglist.append(("Types: Old - " + str(type(old)) + ", New - " + str(type(new)), "V"))
 
-def cmd(): execute(None, doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == "__main__": cmd()
@@ -10,6 +10,7 @@ __author__ = 'Victor Gaultney'
 
 from silfont.core import execute
 
+tool = "FP"
 argspec = [
     ('ifont', {'help': 'Input font filename'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -70,5 +71,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("FP",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
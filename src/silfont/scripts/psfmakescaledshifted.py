@@ -10,6 +10,7 @@ from silfont.core import execute
 from silfont.util import parsecolors
 from ast import literal_eval as make_tuple
 
+tool = "FP"
 argspec = [
     ('ifont', {'help': 'Input font filename'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -113,5 +114,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("FP",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
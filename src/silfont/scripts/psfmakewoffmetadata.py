@@ -11,6 +11,7 @@ import silfont.ufo as UFO
 import re, os, datetime
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('font', {'help': 'Source font file'}, {'type': 'infont'}),
     ('-n', '--primaryname', {'help': 'Primary Font Name', 'required': True}, {}),
@@ -223,5 +224,5 @@ def attrprotect(txt):  # Switch special characters in text to use &...; format
     txt = re.sub(r'"', '&quot;', txt)
     return txt
 
-def cmd(): execute("UFO", doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == "__main__": cmd()
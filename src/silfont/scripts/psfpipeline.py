@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+__doc__ = '''Run a series of UFO scripts on a font, as listed in a job file, reading the font once and writing it once.
+The job file can be json, yaml or ini format - see scripts.md for details'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025, SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+from silfont.core import execute, chain
+import os, json, shlex, time, importlib, configparser
+
+tool = "UFO"
+argspec = [
+    ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
+    ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
+    ('-j','--job',{'help': 'Job file listing the scripts to run', 'required': True}, {'type': 'filename', 'def': None}),
+    ('-l','--log',{'help': 'Log file'}, {'type': 'outfile', 'def': '_pipeline.log'})]
+
+def doit(args) :
+    logger = args.logger
+    font = args.ifont
+    steps = readjob(args.job, logger)
+    profiler = args.paramsobj.profiler
+
+    timings = []
+    for (n, (script, scriptargs)) in enumerate(steps, 1):
+        modname = "silfont.scripts." + script
+        try:
+            module = importlib.import_module(modname)
+        except ImportError as e:
+            if isinstance(e, ModuleNotFoundError) and e.name in (modname, "silfont.scripts"):
+                logger.log("Step %d: %s is not a pysilfont script" % (n, script), "S")
+            logger.log("Step %d: unable to import %s: %s" % (n, script, e), "S")  # eg a dependency is missing
+        # Scripts using fontParts or fontTools also have an infont argument, but can't be passed a Ufont
+        if not (hasattr(module, "doit") and hasattr(module, "argspec")) or getattr(module, "tool", None) != "UFO":
+            logger.log("Step %d: %s can't be used in a pipeline since it does not process a UFO" % (n, script), "S")
+        # The input font name is only needed for parsing arguments and setting default file names - the font object is passed
+        argv = [script, font.ufodir] + scriptargs
+        logger.log("Step %d: %s" % (n, " ".join(argv)), "P")
+        start = time.perf_counter()
+        with profiler.phase("Step %d: %s" % (n, script)):
+            (sargs, newfont) = chain(argv, module.doit, module.argspec, font, args.paramsobj, logger, args.quiet)
+        timings.append((n, script, time.perf_counter() - start))
+        if newfont: font = newfont
+
+    lines = ["Pipeline step timings in seconds:"]
+    for (n, script, secs) in timings: lines.append("  {:>3} {:<30}{:>10.3f}".format(n, script, secs))
+    logger.log("\n".join(lines), "P")
+
+    return font
+
+def readjob(jobfile, logger):
+    # Return a list of (script, [arguments]) from the job file.  Arguments can be a list or a string to split as for a shell
+    if not os.path.isfile(jobfile): logger.log("Job file " + jobfile + " does not exist", "S")
+    ext = os.path.splitext(jobfile)[1].lower()
+    if ext == ".ini":
+        config = configparser.ConfigParser(interpolation=None)
+        config.read(jobfile, encoding="utf-8")
+        job = {"steps": [dict(config[section]) for section in config.sections()]}  # One section per step, in order
+    else:
+        with open(jobfile, encoding="utf-8") as f:
+            if ext in (".yaml", ".yml"):
+                try:
+                    import yaml
+                except ImportError:
+                    logger.log("PyYAML is needed for yaml job files - install it or use json or ini format", "S")
+                loader = yaml.safe_load
+            else:
+                loader = json.load
+            try:
+                job = loader(f)
+            except Exception as e:
+                logger.log("Invalid job file " + jobfile + ": " + str(e), "S")
+    if not isinstance(job, dict) or not isinstance(job.get("steps"), list) or not job["steps"]:
+        logger.log("Job file " + jobfile + " must contain a list of steps", "S")
+
+    steps = []
+    for (n, step) in enumerate(job["steps"], 1):
+        if not isinstance(step, dict) or "script" not in step:
+            logger.log("Step %d in job file has no script specified" % n, "S")
+        scriptargs = step.get("args", [])
+        if isinstance(scriptargs, str): scriptargs = shlex.split(scriptargs)
+        steps.append((step["script"], [str(arg) for arg in scriptargs]))
+    return steps
+
+def cmd() : execute(tool,doit, argspec)
+if __name__ == "__main__": cmd()
@@ -7,6 +7,7 @@ __author__ = 'David Raymond'
 
 from silfont.core import execute
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('key',{'help': 'Key(s) to remove','nargs': '*' }, {}),
@@ -67,5 +68,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
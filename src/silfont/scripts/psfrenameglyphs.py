@@ -12,6 +12,7 @@ import re
 import os
 from glob import glob
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -42,13 +43,13 @@ def doit(args) :
     publicGlyphOrder = publicOpenTypeCategories = csGlyphOrder = psnames = displayStrings = None
     if hasattr(font, 'lib'):
         if 'public.glyphOrder' in font.lib:
-            publicGlyphOrder = font.lib.getval('public.glyphOrder')     # This is an array
+            publicGlyphOrder = font.lib.getnative('public.glyphOrder')     # This is an array
         if 'public.openTypeCategories' in font.lib:
-            publicOpenTypeCategories = font.lib.getval('public.openTypeCategories')     # This is an array
+            publicOpenTypeCategories = font.lib.getnative('public.openTypeCategories')     # This is an array
         if 'com.schriftgestaltung.glyphOrder' in font.lib:
-            csGlyphOrder = font.lib.getval('com.schriftgestaltung.glyphOrder') # This is an array
+            csGlyphOrder = font.lib.getnative('com.schriftgestaltung.glyphOrder') # This is an array
         if 'public.postscriptNames' in font.lib:
-            psnames = font.lib.getval('public.postscriptNames')   # This is a dict keyed by glyphnames
+            psnames = font.lib.getnative('public.postscriptNames')   # This is a dict keyed by glyphnames
         if 'com.schriftgestaltung.customParameter.GSFont.DisplayStrings' in font.lib:
             displayStrings = font.lib.getval('com.schriftgestaltung.customParameter.GSFont.DisplayStrings')
     else:
@@ -253,46 +254,21 @@ def doit(args) :
             nameMap[oldname] = newname
             logger.log("Pass 2 (POTC): Renamed %s to %s" % (oldname, newname), "I")
 
-    # Rebuild font structures from the modified lists we have:
-
-    # Rebuild glyph order elements:
-    if publicGlyphOrder:
-        array = ET.Element("array")
-        for name in publicGlyphOrder:
-            ET.SubElement(array, "string").text = name
-        font.lib.setelem("public.glyphOrder", array)
-
-    if csGlyphOrder:
-        array = ET.Element("array")
-        for name in csGlyphOrder:
-            ET.SubElement(array, "string").text = name
-        font.lib.setelem("com.schriftgestaltung.glyphOrder", array)
-
-    # Rebuild postscriptNames:
-    if psnames:
-        dict = ET.Element("dict")
-        for n in psnames:
-            ET.SubElement(dict, "key").text = n
-            ET.SubElement(dict, "string").text = psnames[n]
-        font.lib.setelem("public.postscriptNames", dict)
-
-    # Rebuild public.openTypeCategories:
-    if publicOpenTypeCategories:
-        dict = ET.Element("dict")
-        for n in publicOpenTypeCategories:
-            ET.SubElement(dict, "key").text = n
-            ET.SubElement(dict, "string").text = publicOpenTypeCategories[n]
-        font.lib.setelem("public.openTypeCategories", dict)
-
-    # Iterate over all glyphs, and fix up any components that reference renamed glyphs
+    # The glyph orders, psnames and openTypeCategories have been updated in place, since getnative() was used above
+
+    # Fix up any components that reference renamed glyphs, using the layer's component graph to find the glyphs affected.
+    # Glyphs component info in the lib is not in the graph, so all glyphs need checking for that
     for layer in font.layers:
+        users = set()
+        for oldname in nameMap: users.update(layer.componentUsers(oldname))
         for name in layer:
             glyph = layer[name]
-            for component in glyph.etree.findall('./outline/component[@base]'):
-                oldname = component.get('base')
-                if oldname in nameMap:
-                    component.set('base', nameMap[oldname])
-                    logger.log(f'renamed component base {oldname} to {component.get("base")} in glyph {name} layer {layer.layername}', 'I')
+            if name in users:
+                for component in list(glyph['outline'].components):
+                    oldname = component.element.get('base')
+                    if oldname in nameMap:
+                        component.setBase(nameMap[oldname])
+                        logger.log('renamed component base %s to %s in glyph %s layer %s', 'I', oldname, nameMap[oldname], name, layer.layername)
             lib = glyph['lib']
             if lib:
                 if 'com.schriftgestaltung.Glyphs.ComponentInfo' in lib:
@@ -303,7 +279,8 @@ def doit(args) :
                                 oldname = component[i+1].text
                                 if oldname in nameMap:
                                     component[i+1].text = nameMap[oldname]
-                                    logger.log(f'renamed component info {oldname} to {nameMap[oldname]} in glyph {name} layer {layer.layername}', 'I')
+                                    glyph.changed = True
+                                    logger.log('renamed component info %s to %s in glyph %s layer %s', 'I', oldname, nameMap[oldname], name, layer.layername)
 
     # Delete anything we no longer need:
     for name in deletelater:
@@ -607,6 +584,7 @@ def mergeglyphs(mergefrom, mergeto): # Merge any "moving" anchors (i.e., those s
             else:
                 # Append anchor to glyph
                 mergeto['anchor'].append(a)
+            mergeto.changed = True
 
 def gettempname(f):
     ''' return a temporary glyph name that, when passed to function f(), returns true'''
@@ -621,5 +599,5 @@ def glyphsub(m): # Function passed to re.sub() when updating display strings
     gname = m.group(1)
     return '/' + csvmap[gname] if gname in csvmap else m.group(0)
 
-def cmd() : execute("UFO",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
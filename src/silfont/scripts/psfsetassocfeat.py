@@ -9,6 +9,7 @@ __author__ = 'David Raymond'
 from silfont.core import execute
 
 suffix = "_AssocFeat"
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -50,5 +51,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
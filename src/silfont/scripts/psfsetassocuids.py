@@ -10,6 +10,7 @@ from silfont.core import execute
 from xml.etree import ElementTree as ET
 
 suffix = "_AssocUIDs"
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -47,5 +48,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
@@ -7,8 +7,8 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Nicolas Spalinger'
 
 from silfont.core import execute
-from fontTools import ttLib
 
+tool = "FT"
 argspec = [
     ('-i', '--ifont', {'help': 'Input ttf font file'}, {}),
     ('-o', '--ofont', {'help': 'Output font file'}, {}),
@@ -16,6 +16,7 @@ argspec = [
 
 
 def doit(args):
+    from fontTools import ttLib
 
     ttf = ttLib.TTFont(args.ifont)
 
@@ -32,5 +33,5 @@ def doit(args):
     args.logger.log('Done', 'P')
 
 
-def cmd(): execute("FT", doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
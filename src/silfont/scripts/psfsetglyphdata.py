@@ -5,9 +5,9 @@ __copyright__ = 'Copyright (c) 2021-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'David Raymond'
 
-from silfont.core import execute
-import csv
+from silfont.core import execute, csvtable
 
+tool = ""
 argspec = [
     ('glyphdata', {'help': 'glyph_data csv file to update'}, {'type': 'incsv', 'def': 'glyph_data.csv'}),
     ('outglyphdata', {'help': 'Alternative output file name', 'nargs': '?'}, {'type': 'filename', 'def': None}),
@@ -31,28 +31,22 @@ def doit(args):
     if not(addcsv or dellist or sortheader): logger.log("At least one of -a, -d or -s must be specified", "S")
     if force and not addcsv: logger.log("-f should only be used with -a", "S")
 
+    def numeric(x):  # Used to convert values when sorting numerically
+        try:
+            numx = float(x)
+        except ValueError:
+            logger.log(f'Non-numeric value "{x}" in sort column; 0 used for sorting', "E")
+            numx = 0
+        return numx
+
     #
-    # Process the glyph_data.csv
+    # Read the glyph_data.csv
     #
 
-    # Process the headers line
-    gdheaders = gdcsv.firstline
-    if 'glyph_name' not in gdheaders: logger.log("No glyph_name header in glyph data csv", "S")
-    gdcsv.numfields = len(gdheaders)
-    gdheaders = {header: col for col, header in enumerate(gdheaders)} # Turn into dict of form header: column
-    gdnamecol = gdheaders["glyph_name"]
-    if sortheader and sortheader not in gdheaders:
-        logger.log(sortheader + " not in glyph data headers", "S")
-    next(gdcsv.reader, None)  # Skip first line with headers in
-
-    # Read the data in
+    types = {sortheader: numeric} if sortheader and not args.sortalpha else None
+    if sortheader and sortheader not in gdcsv.firstline: logger.log(sortheader + " not in glyph data headers", "S")
     logger.log("Reading in existing glyph data file", "P")
-    gddata = {}
-    gdorder = []
-    for line in gdcsv:
-        gname = line[gdnamecol]
-        gddata[gname] = line
-        gdorder.append(gname)
+    gddata = csvtable(gdcsv, types=types, logger=logger).read()
 
     # Delete records from dellist
 
@@ -61,9 +55,8 @@ def doit(args):
         dellist.numfields = 1
         for line in dellist:
             gname = line[0]
-            if gname in gdorder:
-                del gddata[gname]
-                gdorder.remove(gname)
+            if gname in gddata:
+                gddata.delete(gname)
                 logger.log(gname + " deleted from glyph data", "I")
             else:
                 logger.log(gname + "not in glyph data", "W")
@@ -75,56 +68,27 @@ def doit(args):
     if addcsv:
         # Check if addcsv has headers; if not use gdheaders
         addheaders = addcsv.firstline
-        headerssame = True
         if 'glyph_name' in addheaders:
-            if addheaders != gdcsv.firstline: headerssame = False
             next(addcsv.reader)
         else:
-            addheaders = gdheaders
-
+            addheaders = gddata.headers
         addcsv.numfields = len(addheaders)
-        addheaders = {header: col for col, header in enumerate(addheaders)}  # Turn into dict of form header: column
-        addnamecol = addheaders["glyph_name"]
+        addnamecol = addheaders.index("glyph_name")
 
         logger.log("Adding new records from add csv file", "P")
         for line in addcsv:
             gname = line[addnamecol]
             logtype = "added to"
-            if gname in gdorder:
-                if force: # Remove existing line
+            if gname in gddata:
+                if force:
                     logtype = "replaced in"
-                    del gddata[gname]
-                    gdorder.remove(gname)
                 else:
                     logger.log(gname + " already in glyphdata so new data not added", "W")
                     continue
             logger.log(f'{gname} {logtype} glyphdata', "I")
+            gddata.add(line, replace=True, headers=None if addheaders == gddata.headers else addheaders)
 
-            if not headerssame: # need to construct new line based on addheaders
-                newline = []
-                for header in gdheaders:
-                    val = line[addheaders[header]] if header in addheaders else ""
-                    newline.append(val)
-                line = newline
-
-            gddata[gname] = line
-            gdorder.append(gname)
-
-    # Finally sort the data if sortheader supplied
-    def numeric(x):
-        try:
-            numx = float(x)
-        except ValueError:
-            logger.log(f'Non-numeric value "{x}" in sort column; 0 used for sorting', "E")
-            numx = 0
-        return numx
-
-    if sortheader:
-        sortheaderpos = gdheaders[sortheader]
-        if args.sortalpha:
-            gdorder = sorted(gdorder, key=lambda x: gddata[x][sortheaderpos])
-        else:
-            gdorder = sorted(gdorder, key=lambda x: numeric(gddata[x][sortheaderpos]))
+    if sortheader: gddata.sort(sortheader)
 
     # Now write the data out
     outfile = args.outglyphdata
@@ -132,12 +96,8 @@ def doit(args):
         gdcsv.file.close()
         outfile = gdcsv.filename
     logger.log(f'Writing glyph data out to {outfile}', "P")
-    with open(outfile, "w", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(gdcsv.firstline)
-        for glyphn in gdorder:
-            writer.writerow(gddata[glyphn])
+    gddata.write(outfile)
 
-def cmd() : execute("",doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
 
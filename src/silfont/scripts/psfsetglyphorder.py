@@ -11,6 +11,7 @@ __author__ = 'David Raymond'
 from silfont.core import execute
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('ifont', {'help': 'Input font file'}, {'type': 'infont'}), 
     ('ofont', {'help': 'Output font file', 'nargs': '?'}, {'type': 'outfont'}),
@@ -87,5 +88,5 @@ def doit(args):
     return font
 
 
-def cmd(): execute("UFO", doit, argspec) 
+def cmd(): execute(tool, doit, argspec) 
 if __name__ == "__main__": cmd()
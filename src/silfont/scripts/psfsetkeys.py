@@ -11,6 +11,7 @@ import codecs
 import re
 
 suffix = "_setkeys"
+tool = "UFO"
 argspec = [
     ('ifont', {'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont', {'help': 'Output font file', 'nargs': '?'}, {'type': 'outfont'}),
@@ -219,5 +220,5 @@ def set_bitnumber_key_value(font_plist, key, value):
     font_plist.font.logger.log(key + " adjusted, new value: " + str(result_value), "I")
 
 
-def cmd() : execute("UFO",doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
@@ -12,6 +12,7 @@ from silfont.core import execute, splitfn
 from silfont.util import parsecolors
 import io
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -102,5 +103,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
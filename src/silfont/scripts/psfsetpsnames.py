@@ -7,9 +7,10 @@ __copyright__ = 'Copyright (c) 2015-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'David Raymond'
 
-from silfont.core import execute
+from silfont.core import execute, csvtable
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('ifont', {'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont', {'help': 'Output font file', 'nargs': '?'}, {'type': 'outfont'}),
@@ -26,41 +27,28 @@ def doit(args):
     gname = args.gname
     removemissing = args.removemissing
 
-    glyphlist = list(font.deflayer.keys())  # List to check every glyph has a psname supplied
+    glyphlist = set(font.deflayer.keys())  # To check every glyph has a psname supplied
 
     # Identify file format from first line
     fl = incsv.firstline
     if fl is None: logger.log("Empty input file", "S")
-    numfields = len(fl)
-    incsv.numfields = numfields
-    if numfields == 2:
-        glyphnpos = 0
-        psnamepos = 1    # Default for plain csv
-    elif numfields > 2:  # More than 2 columns, so must have standard headers
-        if gname in fl:
-            glyphnpos = fl.index(gname)
-        else:
-            logger.log("No " + gname + " field in csv headers", "S")
-        if "ps_name" in fl:
-            psnamepos = fl.index("ps_name")
-        else:
-            logger.log("No ps_name field in csv headers", "S")
-        next(incsv.reader, None)  # Skip first line with headers in
+    if len(fl) == 2:  # Default for plain csv
+        table = csvtable(incsv, gname, headers=[gname, "ps_name"], logger=logger)
+    elif len(fl) > 2:  # More than 2 columns, so must have standard headers
+        table = csvtable(incsv, gname, required=("ps_name",), logger=logger)
     else:
         logger.log("Invalid csv file", "S")
 
     # Now process the data
     dict = ET.Element("dict")
-    for line in incsv:
-        glyphn = line[glyphnpos]
-        psname = line[psnamepos]
+    for (glyphn, line) in table.readrows():
+        psname = table.value(glyphn, "ps_name")
         if len(psname) == 0 or glyphn == psname:
             continue	# No need to include cases where production name is blank or same as working name
         # Check if in font
-        infont = False
-        if glyphn in glyphlist:
+        infont = glyphn in glyphlist
+        if infont:
             glyphlist.remove(glyphn)
-            infont = True
         else:
             if not removemissing: logger.log("No glyph in font for " + glyphn + " on line " + str(incsv.line_num), "I")
         if not removemissing or infont:
@@ -82,5 +70,5 @@ def doit(args):
     return font
 
 
-def cmd(): execute("UFO", doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == "__main__": cmd()
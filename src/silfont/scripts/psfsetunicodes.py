@@ -9,6 +9,7 @@ __author__ = 'Victor Gaultney, based on UFOsetPSnames.py'
 from silfont.core import execute
 
 suffix = "_setunicodes"
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -23,11 +24,9 @@ def doit(args) :
     incsv.minfields = 2
     incsv.maxfields = 4
 
+    layer = font.deflayer
     # List of glyphnames actually in the font:
-    glyphlist = list(font.deflayer.keys())
-
-    # Create mapping to find glyph name from decimal usv:
-    dusv2gname = {int(unicode.hex, 16): gname for gname in glyphlist for unicode in font.deflayer[gname]['unicode']}
+    glyphlist = list(layer.keys())
 
     # Remember what glyphnames we've processed:
     processed = set()
@@ -49,24 +48,22 @@ def doit(args) :
             if glyphn in processed:
                 logger.log(f"Glyph {glyphn} in csv more than once; line {incsv.line_num} ignored.", "W")
 
-            glyph = font.deflayer[glyphn]
+            glyph = layer[glyphn]
             # Remove existing unicodes
             for unicode in list(glyph["unicode"]):
-                del dusv2gname[int(unicode.hex, 16)]
                 glyph.remove("unicode",index = 0)
 
             # Add the new unicode(s) in
             for dusv in dusvs:
-                # See if any glyph already encodes this unicode value:
-                if dusv in dusv2gname:
-                    # Remove this encoding from the other glyph:
-                    oglyph = font.deflayer[dusv2gname[dusv]]
+                # Remove this encoding from any glyph that already has it (the layer's unicode index is kept up to date
+                # by glyph.remove() and glyph.add())
+                for oglyphn in layer.usvGlyphs(dusv):
+                    oglyph = layer[oglyphn]
                     for unicode in oglyph["unicode"]:
                         if int(unicode.hex,16) == dusv:
                             oglyph.remove("unicode", object=unicode)
                             break
-                # Add this unicode value and update dusv2gname
-                dusv2gname[dusv] = glyphn
+                # Add this unicode value
                 glyph.add("unicode",{"hex": ("%04X" % dusv)})  # Standardize to 4 (or more) digits and caps
             # Record that we processed this glyphname,
             processed.add(glyphn)
@@ -75,5 +72,5 @@ def doit(args) :
 
     return font
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
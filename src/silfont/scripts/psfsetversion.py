@@ -9,6 +9,7 @@ from silfont.core import execute
 import silfont.ufo as UFO
 import re
 
+tool = "UFO"
 argspec = [
     ('font',{'help': 'From font file'}, {'type': 'infont'}),
     ('newversion',{'help': 'Version string or increment', 'nargs': '?'}, {}),
@@ -81,5 +82,5 @@ def parseotnv(string) : # Returns maj, min and extrainfo
     return (m.group(1), m.group(2), extrainfo)
 
 
-def cmd() : execute("UFO",doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
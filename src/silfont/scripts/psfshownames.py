@@ -6,10 +6,8 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Bobby de Vos'
 
 from silfont.core import execute, splitfn
-from fontTools.ttLib import TTFont
 import glob
 from operator import attrgetter, methodcaller
-import tabulate
 
 WINDOWS_ENGLISH_IDS = 3, 1, 0x409
 
@@ -43,6 +41,7 @@ class FontInfo:
         return self.name_table[4]
 
 
+tool = 'FT'
 argspec = [
     ('font', {'help': 'ttf font(s) to run report against; wildcards allowed', 'nargs': "+"}, {'type': 'filename'}),
     ('-b', '--bits', {'help': 'Show bits', 'action': 'store_true'}, {}),
@@ -51,6 +50,8 @@ argspec = [
 
 
 def doit(args):
+    from fontTools.ttLib import TTFont
+    import tabulate
     logger = args.logger
 
     font_infos = []
@@ -228,7 +229,7 @@ def table_records(font_info, bits):
     return record
 
 
-def cmd(): execute('FT', doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 
 
 if __name__ == '__main__':
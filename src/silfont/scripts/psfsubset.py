@@ -7,9 +7,9 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Bob Hallissy'
 
 from silfont.core import execute
-from xml.etree import ElementTree as ET
 import re
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('ofont',{'help': 'Output font file','nargs': '?' }, {'type': 'outfont'}),
@@ -24,9 +24,6 @@ def doit(args) :
     logger = args.logger
     deflayer = font.deflayer
 
-    # Create mappings to find glyph name from decimal usv:
-    dusv2gname = {int(ucode.hex, 16): gname for gname in deflayer for ucode in deflayer[gname]['unicode']}
-
     # check for headers in the csv
     fl = incsv.firstline
     if fl is None: logger.log("Empty input file", "S")
@@ -63,8 +60,9 @@ def doit(args) :
         if usvRE.match(gname):
             # data is USV, not glyph name
             dusv = int(gname,16)
-            if dusv in dusv2gname:
-                toProcess.add(dusv2gname[dusv])
+            gnames = deflayer.usvGlyphs(dusv)  # Find glyph name(s) from decimal usv
+            if gnames:
+                toProcess.update(gnames)
                 continue
             # The USV wasn't in the font... try it as a glyph name
         if gname not in deflayer:
@@ -72,19 +70,8 @@ def doit(args) :
             continue
         toProcess.add(gname)
 
-    # Generate a complete list of glyphs to keep:
-    toKeep = set()
-    while len(toProcess):
-        gname = toProcess.pop()   # retrieves a random item from the set
-        if gname in toKeep:
-            continue    # Already processed this one
-        toKeep.add(gname)
-        
-        # If it has any components we haven't already processed, add them to the toProcess list
-        for component in deflayer[gname].etree.findall('./outline/component[@base]'):
-            cname = component.get('base')
-            if cname not in toKeep:
-                toProcess.add(cname)
+    # Generate a complete list of glyphs to keep, including any components used (recursively)
+    toKeep = deflayer.componentClosure(toProcess)
 
     # Generate a complete list of glyphs to delete:
     toDelete = set(deflayer).difference(toKeep)
@@ -100,25 +87,16 @@ def doit(args) :
     libexists = True if "lib" in font.__dict__ else False
     for orderName in ('public.glyphOrder', 'com.schriftgestaltung.glyphOrder'):
         if libexists and orderName in font.lib:
-            glyphOrder = font.lib.getval(orderName)  # This is an array
-            array = ET.Element("array")
-            for gname in glyphOrder:
-                if gname in toKeep:
-                    ET.SubElement(array, "string").text = gname
-            font.lib.setelem(orderName, array)
+            glyphOrder = font.lib.getnative(orderName)  # This is an array
+            glyphOrder[:] = [gname for gname in glyphOrder if gname in toKeep]
 
     # Clean up and rebuild psnames
     if libexists and 'public.postscriptNames' in font.lib:
-        psnames = font.lib.getval('public.postscriptNames')  # This is a dict keyed by glyphnames
-        dict = ET.Element("dict")
-        for gname in psnames:
-            if gname in toKeep:
-                ET.SubElement(dict, "key").text = gname
-                ET.SubElement(dict, "string").text = psnames[gname]
-        font.lib.setelem("public.postscriptNames", dict)
+        psnames = font.lib.getnative('public.postscriptNames')  # This is a dict keyed by glyphnames
+        for gname in [gname for gname in psnames if gname not in toKeep]: del psnames[gname]
 
     return font
 
-def cmd() : execute("UFO",doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 
 if __name__ == "__main__": cmd()
@@ -9,9 +9,9 @@ from silfont.core import execute
 import silfont.ufo as UFO
 import silfont.etutil as ETU
 import os, datetime
-import fontTools.designspaceLib as DSD
 from xml.etree import ElementTree as ET
 
+tool = None
 argspec = [
     ('primaryds', {'help': 'Primary design space file'}, {'type': 'filename'}),
     ('secondds', {'help': 'Second design space file', 'nargs': '?', 'default': None}, {'type': 'filename', 'def': None}),
@@ -21,6 +21,7 @@ argspec = [
     ]
 
 def doit(args) :
+    import fontTools.designspaceLib as DSD
     ficopyreq = ("ascender", "copyright", "descender", "familyName", "openTypeHheaAscender",
                   "openTypeHheaDescender", "openTypeHheaLineGap", "openTypeNameDescription", "openTypeNameDesigner",
                   "openTypeNameDesignerURL", "openTypeNameLicense", "openTypeNameLicenseURL",
@@ -299,7 +300,7 @@ def logchange(logger, logmess, old, new):
     logger.log("Types: Old - " + str(type(old)) + ", New - " + str(type(new)), "V")
 
 
-def cmd() : execute(None,doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
 
 
@@ -11,6 +11,7 @@ import silfont.ufo as UFO
 import os
 from xml.etree import ElementTree as ET
 
+tool = "UFO"
 argspec = [
     ('ifont',{'help': 'Input font file'}, {'type': 'infont'}),
     ('-l','--log',{'help': 'Log file'}, {'type': 'outfile', 'def': '_sync.log'}),
@@ -299,5 +300,5 @@ def processnum(text, precision) : # Apply same processing to numbers that normal
     return text
 
 
-def cmd() : execute("UFO",doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
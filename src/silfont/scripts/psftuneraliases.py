@@ -7,10 +7,10 @@ __author__ = 'Bob Hallissy'
 
 from silfont.core import execute
 from xml.etree import ElementTree as ET
-from fontTools import ttLib
 import csv
 import struct
 
+tool = None
 argspec = [
     ('input', {'help': 'Input TypeTuner feature file'}, {'type': 'infile'}),
     ('output', {'help': 'Output TypeTuner feature file'}, {}),
@@ -20,6 +20,7 @@ argspec = [
     ]
 
 def doit(args) :
+    from fontTools import ttLib
     logger = args.logger
 
     if args.mapping is None and args.ttf is None:
@@ -117,5 +118,5 @@ def doit(args) :
     # Success. Write the result
     featdoc.write(args.output, encoding='UTF-8', xml_declaration=True)
 
-def cmd() : execute(None,doit,argspec)
+def cmd() : execute(tool,doit,argspec)
 if __name__ == "__main__": cmd()
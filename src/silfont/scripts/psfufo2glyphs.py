@@ -7,10 +7,9 @@ __author__ = 'David Raymond'
 
 from silfont.core import execute, splitfn
 
-from glyphsLib import to_glyphs
-from fontTools.designspaceLib import DesignSpaceDocument
 import os
 
+tool = None
 argspec = [
     ('designspace', {'help': 'Input designSpace file'}, {'type': 'filename'}),
     ('glyphsfile', {'help': 'Output glyphs file name', 'nargs': '?' }, {'type': 'filename', 'def': None}),
@@ -23,6 +22,8 @@ argspec = [
 # It is designed so that data could be massaged, if necessary, on the way.  No such need has been found so far
 
 def doit(args):
+    from glyphsLib import to_glyphs
+    from fontTools.designspaceLib import DesignSpaceDocument
     glyphsfile = args.glyphsfile
     logger = args.logger
     gformat = args.glyphsformat
@@ -65,5 +66,5 @@ def doit(args):
     logger.log("Writing glyphs file: " + glyphsfile, "I")
     glyphsfont.save(glyphsfile)
 
-def cmd(): execute(None, doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == "__main__": cmd()
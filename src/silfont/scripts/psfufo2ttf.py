@@ -9,7 +9,6 @@ __author__ = 'Alan Ward'
 # and curve conversion seems to happen in a different way.
 
 from silfont.core import execute
-import defcon, ufo2ft.outlineCompiler, ufo2ft.preProcessor, ufo2ft.filters
 import re
 
 # ufo2ft v2.32.0b3 uses standard logging and the InstructionCompiler emits errors 
@@ -24,6 +23,7 @@ class FlattenErrFilter(logging.Filter):
         return not record.getMessage().startswith("Number of components differ between UFO and TTF")
 logging.getLogger('ufo2ft.instructionCompiler').addFilter(FlattenErrFilter())
 
+tool = None
 argspec = [
     ('iufo', {'help': 'Input UFO folder'}, {}),
     ('ottf', {'help': 'Output ttf file name'}, {}),
@@ -35,6 +35,7 @@ argspec = [
 PUBLIC_PREFIX = 'public.'
 
 def doit(args):
+    import defcon, ufo2ft.outlineCompiler, ufo2ft.preProcessor, ufo2ft.filters
     # before we get too far, make sure regEx argument, if provided, is legit:
     try:
         compRegEx = re.compile(args.compregex) if args.compregex else None
@@ -184,5 +185,5 @@ def ftshake(f, componentNameRE, logger):
     subsetter.subset(f)
     logger.log(f'Subsetter: Of {len(gnames)} glyphs, found {len(allComponents)} matching components but can remove {len(toDelete)}, leaving {len(gnames)-len(toDelete)}.', 'P')
 
-def cmd(): execute(None, doit, argspec)
+def cmd(): execute(tool, doit, argspec)
 if __name__ == '__main__': cmd()
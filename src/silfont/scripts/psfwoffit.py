@@ -6,11 +6,9 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'Bob Hallissy'
 
 from silfont.core import execute
-from fontTools.ttLib import TTFont
-from fontTools.ttLib.sfnt import WOFFFlavorData
-from fontTools.ttLib.woff2 import WOFF2FlavorData
 import os.path
 
+tool = 'FT'
 argspec = [
     ('infont', {'help': 'Source font file (can be ttf, woff, or woff2)'}, {}),
     ('-m', '--metadata', {'help': 'file containing XML WOFF metadata', 'default': None}, {}),
@@ -22,6 +20,9 @@ argspec = [
     ('-l', '--log', {'help': 'Log file'}, {'type': 'outfile', 'def': '_woffit.log'})]
 
 def doit(args):
+    from fontTools.ttLib import TTFont
+    from fontTools.ttLib.sfnt import WOFFFlavorData
+    from fontTools.ttLib.woff2 import WOFF2FlavorData
     logger = args.logger
     infont = args.infont
     font = TTFont(args.infont)
@@ -92,7 +93,7 @@ def doit(args):
 
     font.close()
 
-def cmd() : execute('FT',doit, argspec)
+def cmd() : execute(tool,doit, argspec)
 if __name__ == "__main__": cmd()
 
 
@@ -10,6 +10,7 @@ from silfont.comp import CompGlyph
 from xml.etree import ElementTree as ET
 
 # specify two parameters: input file (XML format), output file (single line format).
+tool = None
 argspec = [
     ('input',{'help': 'Input file of CD in XML format'}, {'type': 'infile'}),
     ('output',{'help': 'Output file of CD in single line format'}, {'type': 'outfile'}),
@@ -29,5 +30,5 @@ def doit(args) :
             pass # error in glyph number glyphcount message
     return
     
-def cmd() : execute(None,doit,argspec) 
+def cmd() : execute(tool,doit,argspec) 
 if __name__ == "__main__": cmd()
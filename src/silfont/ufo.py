@@ -6,8 +6,8 @@ __license__ = 'Released under the MIT License (https://opensource.org/licenses/M
 __author__ = 'David Raymond'
 
 from xml.etree import ElementTree as ET
-import sys, os, shutil, filecmp, io, re
-import warnings
+import sys, os, shutil, filecmp, re, json, math, functools, csv, contextlib
+from array import array
 import collections
 import datetime
 import silfont.core
@@ -16,6 +16,9 @@ import silfont.etutil as ETU
 
 _glifElemMulti = ('unicode', 'guideline', 'anchor')  # glif elements that can occur multiple times
 _glifElemF1 = ('advance', 'unicode', 'outline', 'lib')  # glif elements valid in format 1 glifs (ie UFO2 glfis)
+# Values for point type and smooth attributes stored as codes in compact contours (see Ucontour.compact())
+_pointTypes = (None, "offcurve", "line", "curve", "qcurve", "move")
+_pointSmooth = (None, "yes", "no")
 
 # Define illegal characters and reserved names for makeFileName
 _illegalChars = r'"*+/:><?[\]|' + chr(0x7F)
@@ -56,7 +59,7 @@ class _Ucontainer(object):
         return iter(self._contents)
 
     def get(self, key, default=None):
-        return self._contents.get(key, default=default)
+        return self._contents.get(key, default)
 
     def keys(self):
         return self._contents.keys()
@@ -69,7 +72,7 @@ class _plist(object):
         if valuetype not in ("integer", "real", "string"):
             self.font.logger.log("addval() can only be used with simple elements", "X")
         if key in self._contents: self.font.logger.log("Attempt to add duplicate key " + key + " to plist", "X")
-        dict = self.etree[0]
+        dict = self._dictelem()
 
         keyelem = ET.Element("key")
         keyelem.text = key
@@ -80,12 +83,14 @@ class _plist(object):
         dict.append(valelem)
 
         self._contents[key] = [keyelem, valelem]
+        self._setchanged()
 
     def setval(self, key, valuetype, value):  # For simple single-value elements - use setelem for dicts or arrays
         if valuetype not in ("integer", "real", "string"):
             self.font.logger.log("setval() can only be used with simple elements", "X")
         if key in self._contents:
             self._contents[key][1].text = str(value)
+            self._setchanged()
         else:
             self.addval(key, valuetype, value)
 
@@ -114,13 +119,14 @@ class _plist(object):
 
     def remove(self, key):
         item = self._contents[key]
-        self.etree[0].remove(item[0])
-        self.etree[0].remove(item[1])
+        self._dictelem().remove(item[0])
+        self._dictelem().remove(item[1])
         del self._contents[key]
+        self._setchanged()
 
     def addelem(self, key, element):  # For non-simple elements (eg arrays) the calling script needs to build the etree element
         if key in self._contents: self.font.logger.log("Attempt to add duplicate key " + key + " to plist", "X")
-        dict = self.etree[0]
+        dict = self._dictelem()
 
         keyelem = ET.Element("key")
         keyelem.text = key
@@ -128,11 +134,18 @@ class _plist(object):
         dict.append(element)
 
         self._contents[key] = [keyelem, element]
+        self._setchanged()
 
     def setelem(self, key, element):
         if key in self._contents: self.remove(key)
         self.addelem(key, element)
 
+    def _setchanged(self):  # Overridden in Ulib to track changes to glifs
+        pass
+
+    def _dictelem(self):  # The plist's dict element.  Overridden in Uplist so values held natively are not converted
+        return self.etree[0]
+
 
 class Uelement(_Ucontainer):
     # Class for an etree element. Mainly used as a parent class
@@ -149,20 +162,28 @@ class Uelement(_Ucontainer):
     def remove(self, subelement):
         self._contents[subelement.tag].remove(subelement)
         self.element.remove(subelement)
+        self._setchanged()
 
     def append(self, subelement):
         self._contents[subelement.tag].append(subelement)
         self.element.append(subelement)
+        self._setchanged()
 
     def insert(self, index, subelement):
         self._contents[subelement.tag].insert(index, subelement)
         self.element.insert(index, subelement)
+        self._setchanged()
 
     def replace(self, index, subelement):
         oldsubelement = self.element[index]
         cindex = self._contents[subelement.tag].index(oldsubelement)
         self._contents[subelement.tag][cindex] = subelement
         self.element[index] = subelement
+        self._setchanged()
+
+    def _setchanged(self):  # Flag the glif (if any) containing the element as changed
+        glif = getattr(self, "glif", None)
+        if glif is not None: glif.changed = True
 
 
 class UtextFile(object):
@@ -195,6 +216,15 @@ class UtextFile(object):
                 print(e)
                 sys.exit(1)
         dtreeitem.written = True
+        return changed
+
+class UunreadGlif(UtextFile):
+    # Used in place of Uglif for glifs not read due to lazyGlifs or normCache, so the glif file is copied unchanged on output
+    def __init__(self, layer, filen):
+        self.type = "textfile"
+        self.font = layer.font
+        self.filen = filen
+        self.dirn = os.path.join(layer.font.ufodir, layer.layerdir)
 
 class Udirectory(object):
     # Generic object for handling directories - used for data and images
@@ -272,6 +302,15 @@ class Ufont(object):
         if self.paramset["UFOversion"] not in ("", "2", "3"): logger.log("UFO version must be 2 or 3", "S")
         if sorted(self.paramset["glifElemOrder"]) != sorted(self.params.sets["default"]["glifElemOrder"]):
             logger.log("Invalid values for glifElemOrder", "S")
+        if not str(self.paramset["parallel"]).isdigit(): logger.log("parallel must be a whole number", "S")
+        self.parallel = int(self.paramset["parallel"])
+        self.compactPoints = self.paramset["compactPoints"]
+        self.digestInput = self.paramset["digestInput"]
+        self.normcache = None  # Cache of digests of glifs known to be normalized - see normCacheKey()
+        self._kerning = None  # Ukerning object, if getKerning() has been used
+        if self.paramset["normCache"]:
+            if not str(self.paramset["cacheSize"]).isdigit(): logger.log("cacheSize must be a whole number", "S")
+            self.normcache = UT.fileCache.open(self.paramset["cacheDir"], "normcache", int(self.paramset["cacheSize"]))
 
         # Create outparams based on values in paramset, building attriborders from separate attriborders.<type> parameters.
         self.outparams = {"attribOrders": {}}
@@ -323,16 +362,23 @@ class Ufont(object):
         # Process the glyphs directories)
         self.layers = []
         self.deflayer = None
-        for i in sorted(self.layercontents.keys()):
-            layername = self.layercontents[i][0].text
-            layerdir = self.layercontents[i][1].text
-            logger.log("Processing Glyph Layer " + str(i) + ": " + layername + layerdir, "I")
-            layer = Ulayer(layername, layerdir, self)
-            if layer:
-                self.layers.append(layer)
-                if layername == "public.default": self.deflayer = layer
-            else:
-                logger.log("Glyph directory " + layerdir + " missing", "S")
+        if self.parallel > 1 and not self.paramset["lazyGlifs"]:
+            import concurrent.futures
+            poolcontext = concurrent.futures.ProcessPoolExecutor(self.parallel)
+        else:
+            poolcontext = contextlib.nullcontext()  # So pool is None
+        with poolcontext as pool:  # Shuts down the pool even if reading fails
+            for i in sorted(self.layercontents.keys()):
+                layername = self.layercontents[i][0].text
+                layerdir = self.layercontents[i][1].text
+                logger.log("Processing Glyph Layer " + str(i) + ": " + layername + layerdir, "I")
+                with params.profiler.phase("Read layer " + layername):
+                    layer = Ulayer(layername, layerdir, self, pool)
+                if layer:
+                    self.layers.append(layer)
+                    if layername == "public.default": self.deflayer = layer
+                else:
+                    logger.log("Glyph directory " + layerdir + " missing", "S")
         if self.deflayer is None: logger.log("No public.default layer", "S")
         # Process other directories
         if "images" in self.dtree:
@@ -342,268 +388,304 @@ class Ufont(object):
 
         # Run best practices check and fix routines
         if self.metacheck:
-            initwarnings = logger.warningcount
-            initerrors = logger.errorcount
-
-            fireq = ("ascender", "copyright", "descender", "familyName", "openTypeNameManufacturer",
-                        "styleName", "unitsPerEm", "versionMajor", "versionMinor")
-            fiwarnifmiss = ("capHeight", "copyright", "openTypeNameDescription", "openTypeNameDesigner",
-                        "openTypeNameDesignerURL", "openTypeNameLicense", "openTypeNameLicenseURL",
-                        "openTypeNameManufacturerURL", "openTypeOS2CodePageRanges",
-                        "openTypeOS2UnicodeRanges", "openTypeOS2VendorID",
-                        "openTypeOS2WeightClass", "openTypeOS2WinAscent", "openTypeOS2WinDescent")
-            fiwarnifnot = {"unitsPerEm": (1000, 2048),
-                           "styleMapStyleName": ("regular", "bold", "italic", "bold italic")},
-            fiwarnifpresent = ("note",)
-            fidel = ("macintoshFONDFamilyID", "macintoshFONDName", "openTypeNameCompatibleFullName",
-                     "openTypeHheaCaretOffset",
-                     "openTypeOS2FamilyClass", "postscriptForceBold", "postscriptIsFixedPitch",
-                     "postscriptBlueFuzz", "postscriptBlueScale", "postscriptBlueShift", "postscriptWeightName",
-                     "year")
-            fidelifempty = ("guidelines", "postscriptBlueValues", "postscriptFamilyBlues", "postscriptFamilyOtherBlues",
-                            "postscriptOtherBlues")
-            fiint = ("ascender", "capHeight", "descender", "postscriptUnderlinePosition",
-                     "postscriptUnderlineThickness", "unitsPerEm", "xHeight")
-            ficapitalize = ("styleMapFamilyName", "styleName")
-            fisetifmissing = {}
-            fisettoother = {"openTypeHheaAscender": "ascender", "openTypeHheaDescender": "descender",
-                            "openTypeNamePreferredFamilyName": "familyName",
-                            "openTypeNamePreferredSubfamilyName": "styleName", "openTypeOS2TypoAscender": "ascender",
-                            "openTypeOS2TypoDescender": "descender"}
-            fisetto = {"openTypeHheaLineGap": 0, "openTypeOS2TypoLineGap": 0,
-                       "openTypeOS2Selection": [7], "openTypeOS2Type": []} # Other values are added below
-
-            libdel = ("com.typemytype.robofont.italicSlantOffset", "com.schriftgestaltung.customParameter.GSFont.uniqueID")
-            libsetto = {"com.schriftgestaltung.customParameter.GSFont.disablesAutomaticAlignment": True,
-                            "com.schriftgestaltung.customParameter.GSFont.disablesLastChange": True}
-            libwarnifnot = {"com.schriftgestaltung.customParameter.GSFont.useNiceNames": False}
-            libwarnifmissing = ("public.glyphOrder",)
-
-            # fontinfo.plist checks
-            logger.log("Checking fontinfo.plist metadata", "P")
-
-            # Check required fields, some of which are needed for remaining checks
-            missing = []
-            for key in fireq:
-                if key not in self.fontinfo or self.fontinfo.getval(key) is None: missing.append(key)
-            # Collect values for constructing other fields, setting dummy values when missing and in check-only mode
-            dummies = False
-            storedvals = {}
-            for key in ("ascender", "copyright", "descender", "familyName", "styleName", "openTypeNameManufacturer", "versionMajor", "versionMinor"):
-                if key in self.fontinfo and self.fontinfo.getval(key) is not None:
-                    storedvals[key] = self.fontinfo.getval(key)
-                    if key == "styleName":
-                        sn = storedvals[key]
-                        sn = re.sub(r"(\w)(Italic)", r"\1 \2", sn)  # Add a space before Italic if missing
-                        # Capitalise first letter of words
-                        sep = b' ' if type(sn) is bytes else ' '
-                        sn = sep.join(s[:1].upper() + s[1:] for s in sn.split(sep))
-                        if sn != storedvals[key]:
-                            if self.metafix:
-                                self.fontinfo.setval(key, "string", sn)
-                                logmess = " updated "
-                            else:
-                                logmess = " would be updated "
-                            self.logchange(logmess, key, storedvals[key], sn)
-                            storedvals[key] = sn
-                    if key in ("ascender", "descender"):
-                        storedvals[key] = int(storedvals[key])
-                else:
-                    dummies = True
-                    if key in ("ascender", "descender", "versionMajor", "versionMinor"):
-                        storedvals[key] = 999
-                    else:
-                        storedvals[key] = "Dummy"
-            if missing:
-                logtype = "S" if self.metafix else "W"
-                logger.log("Required fields missing from fontinfo.plist: " + str(missing), logtype)
-            if dummies:
-                logger.log("Checking will continue with values of 'Dummy' or 999 for missing fields", "W")
-            # Construct values for certain fields
-            value = storedvals["openTypeNameManufacturer"] + ": " + storedvals["familyName"] + " "
-            value = value + storedvals["styleName"] + ": " + datetime.datetime.now().strftime("%Y")
-            fisetto["openTypeNameUniqueID"] = value
-#            fisetto["openTypeOS2WinDescent"] = -storedvals["descender"]
-            if "openTypeNameVersion" not in self.fontinfo:
-                fisetto["openTypeNameVersion"] = "Version " + str(storedvals["versionMajor"]) + "."\
-                                                 + str(storedvals["versionMinor"])
-            if "openTypeOS2WeightClass" not in self.fontinfo:
-                sn = storedvals["styleName"]
-                sn2wc = {"Regular": 400, "Italic": 400, "Bold": 700, "BoldItalic": 700}
-                if sn in sn2wc: fisetto["openTypeOS2WeightClass"] = sn2wc[sn]
-            if "xHeight" not in self.fontinfo:
-                fisetto["xHeight"] = int(storedvals["ascender"] * 0.6)
-            if "openTypeOS2Selection" in self.fontinfo: # If already present, need to ensure bit 7 is set
-                fisetto["openTypeOS2Selection"] = sorted(list(set(self.fontinfo.getval("openTypeOS2Selection") + [7])))
-
-            for key in fisetifmissing:
-                if key not in self.fontinfo:
-                    fisetto[key] = fisetifmissing[key]
-
-            changes = 0
-            # Warn about missing fields
-            for key in fiwarnifmiss:
-                if key not in self.fontinfo:
-                    logmess = key + " is missing from fontinfo.plist"
-                    logger.log(logmess, "W")
-            # Warn about bad values
-            for key in fiwarnifnot:
-                if key in self.fontinfo:
-                    value = self.fontinfo.getval(key)
-                    if value not in fiwarnifnot[key]:
-                        logger.log(key + " should be one of " + str(fiwarnifnot[key]), "W")
-            # Warn about keys where use of discouraged
-            for key in fiwarnifpresent:
-                if key in self.fontinfo:
-                    logger.log(key + " is present - it's use is discouraged")
-
-            # Now do all remaining checks - which will lead to values being changed
-            for key in fidel + fidelifempty:
-                if key in self.fontinfo:
-                    old = self.fontinfo.getval(key)
-                    if not(key in fidelifempty and old != []): # Delete except for non-empty fidelifempty
-                        if self.metafix:
-                            self.fontinfo.remove(key)
-                            logmess = " removed from fontinfo. "
-                        else:
-                            logmess = " would be removed from fontinfo "
-                        self.logchange(logmess, key, old, None)
-                        changes += 1
-
-            # Set to integer values
-            for key in fiint:
-                if key in self.fontinfo:
-                    old = self.fontinfo.getval(key)
-                    if old != int(old):
-                        new = int(old)
-                        if self.metafix:
-                            self.fontinfo.setval(key, "integer", new)
+            with params.profiler.phase("Check & fix"):
+                self.checkfix(self.metafix)
+
+    def checkfix(self, fix=False):
+        # Run the best practices checks on fontinfo.plist and lib.plist, fixing what can be fixed if fix is True.
+        # Results are cached keyed on the contents of the plists, so if they are unchanged since a previous run the checks
+        # are skipped and the messages from that run are logged again.  In fix mode, only runs that made no changes are
+        # cached, since otherwise the fixes need applying.
+        cache = messages = None
+        if self.paramset["checkfixCache"]:
+            if not str(self.paramset["cacheSize"]).isdigit(): self.logger.log("cacheSize must be a whole number", "S")
+            cache = UT.fileCache.open(self.paramset["cacheDir"], "checkfixcache", int(self.paramset["cacheSize"]))
+            key = self.checkfixCacheKey(fix)
+            messages = cache.get(key)
+            if messages is not None:
+                self.logger.log("Check & fix results unchanged since last run - reporting cached results", "V")
+                for (message, level) in messages: self.logger.log(message, level)
+        if messages is None:
+            logger = _recordingLogger(self.logger)
+            changes = self._checkfix(logger, fix)
+            messages = logger.messages
+            if cache is not None and (changes == 0 or not fix): cache.set(key, messages)
+        if cache is not None:
+            error = cache.save()
+            if error: self.logger.log(error, "I")
+        if self.logger.scrlevel not in "WIV" and messages[-1][0] != "Check & Fix ran cleanly":
+            self.logger.log("See log file for details", "P")
+
+    def checkfixCacheKey(self, fix):
+        # The checks depend on the current year (for openTypeNameUniqueID) and the pysilfont version, as well as the plists
+        plists = [self.fontinfo.inxmlstr if "fontinfo" in self.__dict__ else "",
+                  self.lib.inxmlstr if "lib" in self.__dict__ else "<No lib.plist>"]
+        settings = [silfont.__version__, "fix" if fix else "check", datetime.datetime.now().strftime("%Y")]
+        return UT.textdigest("\n".join(settings + [UT.textdigest(plist) for plist in plists]))
+
+    def _checkfix(self, logger, metafix):  # Returns the number of changes made (or that would be made)
+        initwarnings = logger.warningcount
+        initerrors = logger.errorcount
+
+        fireq = ("ascender", "copyright", "descender", "familyName", "openTypeNameManufacturer",
+                    "styleName", "unitsPerEm", "versionMajor", "versionMinor")
+        fiwarnifmiss = ("capHeight", "copyright", "openTypeNameDescription", "openTypeNameDesigner",
+                    "openTypeNameDesignerURL", "openTypeNameLicense", "openTypeNameLicenseURL",
+                    "openTypeNameManufacturerURL", "openTypeOS2CodePageRanges",
+                    "openTypeOS2UnicodeRanges", "openTypeOS2VendorID",
+                    "openTypeOS2WeightClass", "openTypeOS2WinAscent", "openTypeOS2WinDescent")
+        fiwarnifnot = {"unitsPerEm": (1000, 2048),
+                       "styleMapStyleName": ("regular", "bold", "italic", "bold italic")},
+        fiwarnifpresent = ("note",)
+        fidel = ("macintoshFONDFamilyID", "macintoshFONDName", "openTypeNameCompatibleFullName",
+                 "openTypeHheaCaretOffset",
+                 "openTypeOS2FamilyClass", "postscriptForceBold", "postscriptIsFixedPitch",
+                 "postscriptBlueFuzz", "postscriptBlueScale", "postscriptBlueShift", "postscriptWeightName",
+                 "year")
+        fidelifempty = ("guidelines", "postscriptBlueValues", "postscriptFamilyBlues", "postscriptFamilyOtherBlues",
+                        "postscriptOtherBlues")
+        fiint = ("ascender", "capHeight", "descender", "postscriptUnderlinePosition",
+                 "postscriptUnderlineThickness", "unitsPerEm", "xHeight")
+        ficapitalize = ("styleMapFamilyName", "styleName")
+        fisetifmissing = {}
+        fisettoother = {"openTypeHheaAscender": "ascender", "openTypeHheaDescender": "descender",
+                        "openTypeNamePreferredFamilyName": "familyName",
+                        "openTypeNamePreferredSubfamilyName": "styleName", "openTypeOS2TypoAscender": "ascender",
+                        "openTypeOS2TypoDescender": "descender"}
+        fisetto = {"openTypeHheaLineGap": 0, "openTypeOS2TypoLineGap": 0,
+                   "openTypeOS2Selection": [7], "openTypeOS2Type": []} # Other values are added below
+
+        libdel = ("com.typemytype.robofont.italicSlantOffset", "com.schriftgestaltung.customParameter.GSFont.uniqueID")
+        libsetto = {"com.schriftgestaltung.customParameter.GSFont.disablesAutomaticAlignment": True,
+                        "com.schriftgestaltung.customParameter.GSFont.disablesLastChange": True}
+        libwarnifnot = {"com.schriftgestaltung.customParameter.GSFont.useNiceNames": False}
+        libwarnifmissing = ("public.glyphOrder",)
+
+        # fontinfo.plist checks
+        logger.log("Checking fontinfo.plist metadata", "P")
+
+        # Check required fields, some of which are needed for remaining checks
+        missing = []
+        for key in fireq:
+            if key not in self.fontinfo or self.fontinfo.getval(key) is None: missing.append(key)
+        # Collect values for constructing other fields, setting dummy values when missing and in check-only mode
+        dummies = False
+        storedvals = {}
+        for key in ("ascender", "copyright", "descender", "familyName", "styleName", "openTypeNameManufacturer", "versionMajor", "versionMinor"):
+            if key in self.fontinfo and self.fontinfo.getval(key) is not None:
+                storedvals[key] = self.fontinfo.getval(key)
+                if key == "styleName":
+                    sn = storedvals[key]
+                    sn = re.sub(r"(\w)(Italic)", r"\1 \2", sn)  # Add a space before Italic if missing
+                    # Capitalise first letter of words
+                    sep = b' ' if type(sn) is bytes else ' '
+                    sn = sep.join(s[:1].upper() + s[1:] for s in sn.split(sep))
+                    if sn != storedvals[key]:
+                        if metafix:
+                            self.fontinfo.setval(key, "string", sn)
                             logmess = " updated "
                         else:
                             logmess = " would be updated "
-                        self.logchange(logmess, key, old, new)
-                        changes += 1
-            # Capitalize words
-            for key in ficapitalize:
-                if key in self.fontinfo:
-                    old = self.fontinfo.getval(key)
-                    sep = b' ' if type(old) is bytes else ' '
-                    new = sep.join(s[:1].upper() + s[1:] for s in old.split(sep))  # Capitalise words
-                    if new != old:
-                        if self.metafix:
-                            self.fontinfo.setval(key, "string", new)
-                            logmess = " uppdated "
-                        else:
-                            logmess = " would be uppdated "
-                        self.logchange(logmess, key, old, new)
-                        changes += 1
-            # Set to specific values
-            for key in list(fisetto.keys()) + list(fisettoother.keys()):
-                if key in self.fontinfo:
-                    old = self.fontinfo.getval(key)
+                        self.logchange(logmess, key, storedvals[key], sn, logger)
+                        storedvals[key] = sn
+                if key in ("ascender", "descender"):
+                    storedvals[key] = int(storedvals[key])
+            else:
+                dummies = True
+                if key in ("ascender", "descender", "versionMajor", "versionMinor"):
+                    storedvals[key] = 999
+                else:
+                    storedvals[key] = "Dummy"
+        if missing:
+            logtype = "S" if metafix else "W"
+            logger.log("Required fields missing from fontinfo.plist: " + str(missing), logtype)
+        if dummies:
+            logger.log("Checking will continue with values of 'Dummy' or 999 for missing fields", "W")
+        # Construct values for certain fields
+        value = storedvals["openTypeNameManufacturer"] + ": " + storedvals["familyName"] + " "
+        value = value + storedvals["styleName"] + ": " + datetime.datetime.now().strftime("%Y")
+        fisetto["openTypeNameUniqueID"] = value
+#            fisetto["openTypeOS2WinDescent"] = -storedvals["descender"]
+        if "openTypeNameVersion" not in self.fontinfo:
+            fisetto["openTypeNameVersion"] = "Version " + str(storedvals["versionMajor"]) + "."\
+                                             + str(storedvals["versionMinor"])
+        if "openTypeOS2WeightClass" not in self.fontinfo:
+            sn = storedvals["styleName"]
+            sn2wc = {"Regular": 400, "Italic": 400, "Bold": 700, "BoldItalic": 700}
+            if sn in sn2wc: fisetto["openTypeOS2WeightClass"] = sn2wc[sn]
+        if "xHeight" not in self.fontinfo:
+            fisetto["xHeight"] = int(storedvals["ascender"] * 0.6)
+        if "openTypeOS2Selection" in self.fontinfo: # If already present, need to ensure bit 7 is set
+            fisetto["openTypeOS2Selection"] = sorted(list(set(self.fontinfo.getval("openTypeOS2Selection") + [7])))
+
+        for key in fisetifmissing:
+            if key not in self.fontinfo:
+                fisetto[key] = fisetifmissing[key]
+
+        changes = 0
+        # Warn about missing fields
+        for key in fiwarnifmiss:
+            if key not in self.fontinfo:
+                logmess = key + " is missing from fontinfo.plist"
+                logger.log(logmess, "W")
+        # Warn about bad values
+        for key in fiwarnifnot:
+            if key in self.fontinfo:
+                value = self.fontinfo.getval(key)
+                if value not in fiwarnifnot[key]:
+                    logger.log(key + " should be one of " + str(fiwarnifnot[key]), "W")
+        # Warn about keys where use of discouraged
+        for key in fiwarnifpresent:
+            if key in self.fontinfo:
+                logger.log(key + " is present - it's use is discouraged")
+
+        # Now do all remaining checks - which will lead to values being changed
+        for key in fidel + fidelifempty:
+            if key in self.fontinfo:
+                old = self.fontinfo.getval(key)
+                if not(key in fidelifempty and old != []): # Delete except for non-empty fidelifempty
+                    if metafix:
+                        self.fontinfo.remove(key)
+                        logmess = " removed from fontinfo. "
+                    else:
+                        logmess = " would be removed from fontinfo "
+                    self.logchange(logmess, key, old, None, logger)
+                    changes += 1
+
+        # Set to integer values
+        for key in fiint:
+            if key in self.fontinfo:
+                old = self.fontinfo.getval(key)
+                if old != int(old):
+                    new = int(old)
+                    if metafix:
+                        self.fontinfo.setval(key, "integer", new)
+                        logmess = " updated "
+                    else:
+                        logmess = " would be updated "
+                    self.logchange(logmess, key, old, new, logger)
+                    changes += 1
+        # Capitalize words
+        for key in ficapitalize:
+            if key in self.fontinfo:
+                old = self.fontinfo.getval(key)
+                sep = b' ' if type(old) is bytes else ' '
+                new = sep.join(s[:1].upper() + s[1:] for s in old.split(sep))  # Capitalise words
+                if new != old:
+                    if metafix:
+                        self.fontinfo.setval(key, "string", new)
+                        logmess = " uppdated "
+                    else:
+                        logmess = " would be uppdated "
+                    self.logchange(logmess, key, old, new, logger)
+                    changes += 1
+        # Set to specific values
+        for key in list(fisetto.keys()) + list(fisettoother.keys()):
+            if key in self.fontinfo:
+                old = self.fontinfo.getval(key)
+                logmess = " updated "
+            else:
+                old = None
+                logmess = " added "
+            if key in fisetto:
+                new = fisetto[key]
+            else:
+                new = storedvals[fisettoother[key]]
+            if new != old:
+                if metafix:
+                    if isinstance(new, list): # Currently only integer arrays
+                        array = ET.Element("array")
+                        for val in new: # Only covers integer at present for openTypeOS2Selection
+                            ET.SubElement(array, "integer").text = val
+                        self.fontinfo.setelem(key, array)
+                    else: # Does not cover real at present
+                        valtype = "integer" if isinstance(new, int) else "string"
+                        self.fontinfo.setval(key, valtype, new)
+                else:
+                    logmess = " would be" + logmess
+                self.logchange(logmess, key, old, new, logger)
+                changes += 1
+        # Specific checks
+        if "italicAngle" in self.fontinfo:
+            old = self.fontinfo.getval("italicAngle")
+            if old == 0: # Should be deleted if 0
+                logmess = " removed since it is 0 "
+                if metafix:
+                    self.fontinfo.remove("italicAngle")
+                else:
+                    logmess = " would be" + logmess
+                self.logchange(logmess, "italicAngle", old, None, logger)
+                changes += 1
+        if "versionMajor" in self.fontinfo: # If missing, an error will already have been reported...
+            vm = self.fontinfo.getval("versionMajor")
+            if vm == 0: logger.log("versionMajor is 0", "W")
+
+        # lib.plist checks
+        if "lib" not in self.__dict__:
+            logger.log("lib.plist missing so not checked by check & fix routines", "E")
+        else:
+            logger.log("Checking lib.plist metadata", "P")
+
+            for key in libdel:
+                if key in self.lib:
+                    old = self.lib.getval(key)
+                    if metafix:
+                        self.lib.remove(key)
+                        logmess = " removed from lib.plist. "
+                    else:
+                        logmess = " would be removed from lib.plist "
+                    self.logchange(logmess, key, old, None, logger)
+                    changes += 1
+
+            for key in libsetto:
+                if key in self.lib:
+                    old = self.lib.getval(key)
                     logmess = " updated "
                 else:
                     old = None
                     logmess = " added "
-                if key in fisetto:
-                    new = fisetto[key]
-                else:
-                    new = storedvals[fisettoother[key]]
+                new = libsetto[key]
                 if new != old:
-                    if self.metafix:
-                        if isinstance(new, list): # Currently only integer arrays
-                            array = ET.Element("array")
-                            for val in new: # Only covers integer at present for openTypeOS2Selection
-                                ET.SubElement(array, "integer").text = val
-                            self.fontinfo.setelem(key, array)
-                        else: # Does not cover real at present
-                            valtype = "integer" if isinstance(new, int) else "string"
-                            self.fontinfo.setval(key, valtype, new)
+                    if metafix:
+                        # Currently just supports True.  See fisetto for adding other types
+                        if new == True:
+                            self.lib.setelem(key, ET.fromstring("<true/>"))
+                        else:  # Does not cover real at present
+                            logger.log("Invalid value type for libsetto", "X")
                     else:
                         logmess = " would be" + logmess
-                    self.logchange(logmess, key, old, new)
+                    self.logchange(logmess, key, old, new, logger)
                     changes += 1
-            # Specific checks
-            if "italicAngle" in self.fontinfo:
-                old = self.fontinfo.getval("italicAngle")
-                if old == 0: # Should be deleted if 0
-                    logmess = " removed since it is 0 "
-                    if self.metafix:
-                        self.fontinfo.remove("italicAngle")
-                    else:
-                        logmess = " would be" + logmess
-                    self.logchange(logmess, "italicAngle", old, None)
+            for key in libwarnifnot:
+                value = self.lib.getval(key) if key in self.lib else None
+                if value != libwarnifnot[key]:
+                    addmess = "; currently missing" if value is None else "; currently set to " + str(value)
+                    logger.log(key + " should normally be " + str(libwarnifnot[key]) + addmess, "W")
+
+            for key in libwarnifmissing:
+                if key not in self.lib:
+                    logger.log(key + " is missing from lib.plist", "W")
+
+            logmess = " deleted - obsolete key" if metafix else " would be deleted - obsolete key"
+            for key in obsoleteLibKeys: # For obsolete keys that have been added historically by some tools
+                if key in self.lib:
+                    old = self.lib.getval(key)
+                    if metafix: self.lib.remove(key)
+                    self.logchange(logmess,key,old,None, logger)
                     changes += 1
-            if "versionMajor" in self.fontinfo: # If missing, an error will already have been reported...
-                vm = self.fontinfo.getval("versionMajor")
-                if vm == 0: logger.log("versionMajor is 0", "W")
 
-            # lib.plist checks
-            if "lib" not in self.__dict__:
-                logger.log("lib.plist missing so not checked by check & fix routines", "E")
-            else:
-                logger.log("Checking lib.plist metadata", "P")
-
-                for key in libdel:
-                    if key in self.lib:
-                        old = self.lib.getval(key)
-                        if self.metafix:
-                            self.lib.remove(key)
-                            logmess = " removed from lib.plist. "
-                        else:
-                            logmess = " would be removed from lib.plist "
-                        self.logchange(logmess, key, old, None)
-                        changes += 1
-
-                for key in libsetto:
-                    if key in self.lib:
-                        old = self.lib.getval(key)
-                        logmess = " updated "
-                    else:
-                        old = None
-                        logmess = " added "
-                    new = libsetto[key]
-                    if new != old:
-                        if self.metafix:
-                            # Currently just supports True.  See fisetto for adding other types
-                            if new == True:
-                                self.lib.setelem(key, ET.fromstring("<true/>"))
-                            else:  # Does not cover real at present
-                                logger.log("Invalid value type for libsetto", "X")
-                        else:
-                            logmess = " would be" + logmess
-                        self.logchange(logmess, key, old, new)
-                        changes += 1
-                for key in libwarnifnot:
-                    value = self.lib.getval(key) if key in self.lib else None
-                    if value != libwarnifnot[key]:
-                        addmess = "; currently missing" if value is None else "; currently set to " + str(value)
-                        logger.log(key + " should normally be " + str(libwarnifnot[key]) + addmess, "W")
-
-                for key in libwarnifmissing:
-                    if key not in self.lib:
-                        logger.log(key + " is missing from lib.plist", "W")
-
-                logmess = " deleted - obsolete key" if self.metafix else " would be deleted - obsolete key"
-                for key in obsoleteLibKeys: # For obsolete keys that have been added historically by some tools
-                    if key in self.lib:
-                        old = self.lib.getval(key)
-                        if self.metafix: self.lib.remove(key)
-                        self.logchange(logmess,key,old,None)
-                        changes += 1
-
-            # Show check&fix summary
-            warnings = logger.warningcount - initwarnings - changes
-            errors = logger.errorcount - initerrors
-            if errors or warnings or changes:
-                changemess = ", Changes made: " if self.metafix else ", Changes to make: "
-                logger.log("Check & fix results:- Errors: " + str(errors) + changemess + str(changes) +
-                           ", Other warnings: " + str(warnings), "P")
-                if logger.scrlevel not in "WIV": logger.log("See log file for details", "P")
-                if missing and not self.metafix:
-                    logger.log("**** Since some required fields were missing, checkfix=fix would fail", "P")
-            else:
-                logger.log("Check & Fix ran cleanly", "P")
+        # Show check&fix summary
+        warnings = logger.warningcount - initwarnings - changes
+        errors = logger.errorcount - initerrors
+        if errors or warnings or changes:
+            changemess = ", Changes made: " if metafix else ", Changes to make: "
+            logger.log("Check & fix results:- Errors: " + str(errors) + changemess + str(changes) +
+                       ", Other warnings: " + str(warnings), "P")
+            if missing and not metafix:
+                logger.log("**** Since some required fields were missing, checkfix=fix would fail", "P")
+        else:
+            logger.log("Check & Fix ran cleanly", "P")
+        return changes
 
     def _readPlist(self, filen):
         if filen in self.dtree:
@@ -655,12 +737,11 @@ class Ufont(object):
         if "fontinfo" in self.__dict__: setFileForOutput(dtree, "fontinfo.plist", self.fontinfo, "xml")
         if "groups" in self.__dict__: # With groups, sort by glyph name
             for gname in list(self.groups):
-                group = self.groups.getval(gname)
-                elem = ET.Element("array")
-                for glyph in sorted(group):
-                    ET.SubElement(elem, "string").text = glyph
-                self.groups.setelem(gname, elem)
+                self.groups.getnative(gname).sort()
             setFileForOutput(dtree, "groups.plist", self.groups, "xml")
+        if self._kerning is not None:  # Kerning has been handled using getKerning(), so update kerning.plist from that
+            if "kerning" not in self.__dict__: self.addfile("kerning")
+            self._kerning.toPlist(self.kerning)
         if "kerning" in self.__dict__: setFileForOutput(dtree, "kerning.plist", self.kerning, "xml")
         if "lib" in self.__dict__: setFileForOutput(dtree, "lib.plist", self.lib, "xml")
         if UFOversion == "3":
@@ -672,19 +753,73 @@ class Ufont(object):
             setFileForOutput(dtree, "layercontents.plist", self.layercontents, "xml")
         if "features" in self.__dict__: setFileForOutput(dtree, "features.fea", self.features, "text")
         # Set glyph layers for output
-        for layer in self.layers: layer.setForOutput()
+        profiler = self.params.profiler
+        with profiler.phase("Prepare glyph layers for output"):
+            for layer in self.layers: layer.setForOutput()
 
         # Write files to disk
 
         self.logger.log("Writing font to " + outdir, "P")
 
-        changes = writeToDisk(dtree, outdir, self, odtree)
+        if self.parallel > 1:
+            with profiler.phase("Serialize glifs in parallel"):
+                serialized = serializeGlifs(self, self.parallel)
+        else:
+            serialized = None
+        self.outmanifest = None  # Digests of files output, so unchanged files in an existing output UFO need not be read
+        if self.paramset["outputManifest"] and outdir != self.ufodir:  # Not needed if writing back to the input UFO
+            if not str(self.paramset["cacheSize"]).isdigit(): self.logger.log("cacheSize must be a whole number", "S")
+            self.outmanifest = UT.fileCache.open(self.paramset["cacheDir"], "outputmanifest", int(self.paramset["cacheSize"]))
+        with profiler.phase("Write files to disk"):
+            changes = writeToDisk(dtree, outdir, self, odtree, serialized=serialized)
+        if self.normcache is not None: self.updateNormCache()
         if changes and self.outparams["updateTimestamps"]: # Need to update openTypeHeadCreated if there have been any changes to the font
             if "fontinfo" in self.__dict__:
                 self.fontinfo.setval("openTypeHeadCreated", "string",
                                      datetime.datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
                 self.fontinfo.outxmlstr="" # Need to reset since writeXMLobject has already run once
-                writeXMLobject(self.fontinfo, self.outparams, outdir, "fontinfo.plist", True, fobject=True)
+                writeXMLobject(self.fontinfo, self.outparams, outdir, "fontinfo.plist", True, fobject=True,
+                               manifest=self.outmanifest)
+        if self.outmanifest is not None:
+            error = self.outmanifest.save()
+            if error: self.logger.log(error, "I")
+
+    def normCachePrefix(self):
+        # Prefix for normCacheKey() based on the current outparams, so cache entries are only used with the same settings.
+        # Outparams that don't affect the content of glifs are ignored
+        outparams = {parn: self.outparams[parn] for parn in self.outparams
+                     if parn not in ("updateTimestamps", "renameGlifs", "plistIndentFirst")}
+        settings = json.dumps(outparams, sort_keys=True, default=str) + silfont.__version__
+        return UT.textdigest(settings)[0:16]
+
+    def normCacheKey(self, prefix, glyphn, xmlstr):
+        # Key for a glif in the normalization cache.  An entry means that xmlstr is the normalized output for glyphn
+        return prefix + UT.textdigest(glyphn + "\n" + xmlstr)
+
+    def updateNormCache(self):
+        # Record glifs just output as normalized, so future runs can skip reading and normalizing them
+        prefix = self.normCachePrefix()
+        cache = self.normcache
+        for layer in self.layers:
+            dtree = self.dtree.subTree(layer.layerdir)
+            for glyphn in layer:
+                glif = layer._contents[glyphn]
+                if glif is None:
+                    if glyphn in layer.cachedglifs: cache.get(layer.cachedglifs[glyphn])  # Mark as recently used
+                elif dtree[glif.filen].towrite and glif.outparams is None and glif.outxmlstr and not glif.changed:
+                    # Messages from reading the glif are stored so they can be reported again when it is next skipped.
+                    # Glifs changed by the script are not cached, since the messages may not apply to the new contents
+                    cache.set(self.normCacheKey(prefix, glyphn, glif.outxmlstr), getattr(glif, "readmessages", []))
+        error = cache.save()
+        if error: self.logger.log(error, "I")
+
+    def getKerning(self):
+        # Return a Ukerning object holding the font's kerning.  Once this has been used, kerning.plist is updated from it
+        # when the font is written, so any changes to kerning should be made using it rather than self.kerning
+        if self._kerning is None:
+            self._kerning = Ukerning(self)
+            if "kerning" in self.__dict__: self._kerning.fromPlist(self.kerning)
+        return self._kerning
 
     def addfile(self, filetype):  # Add empty plist file for optional files
         if filetype not in ("fontinfo", "groups", "kerning", "lib"): self.logger.log("Invalid file type to add", "X")
@@ -694,7 +829,8 @@ class Ufont(object):
         self.dtree[filetype + '.plist'] = UT.dirTreeItem(read=True, added=True, fileObject=obj, fileType="xml")
         obj.etree = ET.fromstring("<plist>\n<dict/>\n</plist>")
 
-    def logchange(self, logmess, key, old, new):
+    def logchange(self, logmess, key, old, new, logger=None):
+        if logger is None: logger = self.logger
         oldstr = str(old) if len(str(old)) < 22 else str(old)[0:20] + "..."
         newstr = str(new) if len(str(new)) < 22 else str(new)[0:20] + "..."
         logmess = key + logmess
@@ -705,18 +841,37 @@ class Ufont(object):
                 logmess = logmess + " Old value: " + oldstr
             else:
                 logmess = logmess + " Old value: " + oldstr + ", new value: " + newstr
-        self.logger.log(logmess, "W")
+        logger.log(logmess, "W")
         # Extra verbose logging
         if len(str(old)) > 21:
-            self.logger.log("Full old value: " + str(old), "I")
+            logger.log("Full old value: " + str(old), "I")
         if len(str(new)) > 21:
-            self.logger.log("Full new value: " + str(new), "I")
+            logger.log("Full new value: " + str(new), "I")
         otype = "string" if isinstance(old, (bytes, str)) else type(old).__name__ # To produce consistent reporting
         ntype = "string" if isinstance(new, (bytes, str)) else type(new).__name__ # with Python 2 & 3
-        self.logger.log("Types: Old - " + otype + ", New - " + ntype, "I")
+        logger.log("Types: Old - " + otype + ", New - " + ntype, "I")
+
+class _recordingLogger(object):
+    # Passes messages on to a logger, recording them so they can be logged again later, eg by Ufont.checkfix()
+    def __init__(self, logger, passon=True):
+        self.logger = logger
+        self.passon = passon  # If False, messages are only recorded
+        self.messages = []
+
+    def log(self, logmessage, msglevel="W", *args):  # Lazy messages as for loggerobj.log(), but always formatted to be recorded
+        if callable(logmessage):
+            logmessage = logmessage()
+        elif args:
+            logmessage = logmessage % args
+        self.messages.append((str(logmessage), msglevel))
+        if self.passon or msglevel in ("S", "X"): self.logger.log(logmessage, msglevel)
+
+    def __getattr__(self, name):  # For warningcount, scrlevel etc
+        return getattr(self.logger, name)
 
 class Ulayer(_Ucontainer):
-    def __init__(self, layername, layerdir, font):
+    def __init__(self, layername, layerdir, font, pool=None):
+        # If pool (a concurrent.futures executor) is supplied, it is used to read and parse the glifs in parallel
         self._contents = collections.OrderedDict()
         self.dtree = font.dtree.subTree(layerdir)
         font.dtree[layerdir].read = True
@@ -732,18 +887,84 @@ class Ulayer(_Ucontainer):
                 self.layerinfo = Uplist(font=font, dirn=fulldir, filen="layerinfo.plist")
                 self.dtree["layerinfo.plist"].setinfo(read=True, fileObject=self.layerinfo, fileType="xml")
 
-        for glyphn in sorted(self.contents.keys()):
+        self.lazy = font.paramset["lazyGlifs"]  # If set, glifs are only read when first accessed
+        self._usvindex = None  # Index of glyph names by unicode value - built on first use by usvGlyphs()
+        self._compgraph = None  # Component bases used by each glyph - built on first use of the component methods
+        self._compusers = None  # Glyphs using each base as a component
+        self.cachedglifs = {}  # Cache keys for glifs not read since they were found in font.normcache
+        self._replayed = set()  # Glifs whose messages from a previous run have been logged from font.normcache
+        glyphns = sorted(self.contents.keys())
+        rawdata = {}  # Glif files already read to look them up in font.normcache, so they are not read again
+        cachedmessages = {}
+        if font.normcache is not None and not self.lazy:
+            prefix = font.normCachePrefix()
+            for glyphn in glyphns:
+                glifn = self.contents[glyphn][1].text
+                if glifn not in self.dtree: continue
+                data = ETU.readxmlbytes(os.path.join(fulldir, glifn))
+                key = font.normCacheKey(prefix, glyphn, data.decode("utf-8"))
+                entry = font.normcache.get(key)
+                if entry is None:
+                    rawdata[glifn] = data
+                else:
+                    self.cachedglifs[glyphn] = key
+                    cachedmessages[glyphn] = entry if isinstance(entry, list) else []
+        xmldata = {}
+        if pool and not self.lazy:  # Read and parse glif files in parallel, then process them in order below
+            glifns = [self.contents[glyphn][1].text for glyphn in glyphns if glyphn not in self.cachedglifs]
+            glifns = [glifn for glifn in glifns if glifn in self.dtree]
+            chunksize = max(1, len(glifns) // (font.parallel * 4))
+            if rawdata:  # Files have already been read, so just parse them
+                parser = functools.partial(ETU.parsexmldata, keepstr=not font.digestInput)
+                results = pool.map(parser, [rawdata[glifn] for glifn in glifns], chunksize=chunksize)
+            else:
+                reader = functools.partial(ETU.readxmlfile, keepstr=not font.digestInput)
+                results = pool.map(reader, [os.path.join(fulldir, glifn) for glifn in glifns], chunksize=chunksize)
+            xmldata = dict(zip(glifns, results))
+        elif rawdata:
+            xmldata = {glifn: ETU.parsexmldata(data, keepstr=not font.digestInput) for (glifn, data) in rawdata.items()}
+        for glyphn in glyphns:
             glifn = self.contents[glyphn][1].text
             if glifn in self.dtree:
-                glyph = Uglif(layer=self, filen=glifn)
-                self._contents[glyphn] = glyph
-                self.dtree[glifn].setinfo(read=True, fileObject=glyph, fileType="xml")
-                if glyph.name != glyphn:
-                    super(Uglif, glyph).__setattr__("name", glyphn)  # Need to use super to bypass normal glyph renaming logic
-                    self.font.logger.log("Glyph names in glif and contents.plist did not match for " + glyphn + "; corrected", "W")
+                if self.lazy or glyphn in self.cachedglifs:
+                    self._contents[glyphn] = None  # Placeholder until the glif is read by __getitem__
+                    self.dtree[glifn].setinfo(read=True)
+                    if glyphn in cachedmessages:  # Report what reading the glif reported when it was cached
+                        for (logmessage, msglevel) in cachedmessages[glyphn]: font.logger.log(logmessage, msglevel)
+                        self._replayed.add(glyphn)
+                else:
+                    self._readGlif(glyphn, glifn, xmldata.pop(glifn, None))
             else:
                 self.font.logger.log("Missing glif " + glifn + " in " + fulldir, "S")
 
+    def __getitem__(self, key):
+        glyph = self._contents[key]
+        if glyph is None: glyph = self._readGlif(key, self.contents[key][1].text)
+        return glyph
+
+    def get(self, key, default=None):
+        return self[key] if key in self._contents else default
+
+    def _readGlif(self, glyphn, glifn, xmldata=None):
+        self.cachedglifs.pop(glyphn, None)
+        logger = self.font.logger
+        if self.font.normcache is not None:  # Record messages from reading the glif, to store in the cache with it
+            self.font.logger = _recordingLogger(logger, passon=glyphn not in self._replayed)  # Replayed already
+        try:
+            glyph = Uglif(layer=self, filen=glifn, xmldata=xmldata)
+        finally:
+            self.font.logger = logger
+        if self.font.normcache is not None:
+            glyph.readmessages = glyph.logger.messages
+            glyph.logger = logger
+        self._contents[glyphn] = glyph
+        self.dtree[glifn].setinfo(read=True, fileObject=glyph, fileType="xml")
+        if glyph.name != glyphn:
+            super(Uglif, glyph).__setattr__("name", glyphn)  # Need to use super to bypass normal glyph renaming logic
+            glyph.changed = True
+            self.font.logger.log("Glyph names in glif and contents.plist did not match for " + glyphn + "; corrected", "W")
+        return glyph
+
     def setForOutput(self):
 
         UFOversion = self.font.outparams["UFOversion"]
@@ -755,8 +976,21 @@ class Ulayer(_Ucontainer):
         if "layerinfo" in self.__dict__ and UFOversion == "3":
             setFileForOutput(dtree, "layerinfo.plist", self.layerinfo, "xml")
 
+        readall = convertg2f1 or UFOversion != self.font.UFOversion  # Glifs need converting, so all must be read
+        prefix = self.font.normCachePrefix() if self.cachedglifs else None
         for glyphn in self:
             glyph = self._contents[glyphn]
+            if glyph is None:  # Glif not read due to lazyGlifs or normCache
+                if glyphn in self.cachedglifs:  # Only valid if outparams have not been changed since the font was read
+                    unchanged = self.cachedglifs[glyphn].startswith(prefix)
+                else:
+                    unchanged = not readall
+                if not unchanged:
+                    glyph = self[glyphn]
+                else:  # Leave the glif file as it is
+                    glifn = self.contents[glyphn][1].text
+                    setFileForOutput(dtree, glifn, UunreadGlif(self, glifn), "text")
+                    continue
             if convertg2f1: glyph.convertToFormat1()
             if glyph["advance"] is not None:
                 if glyph["advance"].width is None and glyph["advance"].height is None: glyph.remove("advance")
@@ -772,15 +1006,158 @@ class Ulayer(_Ucontainer):
 
             setFileForOutput(dtree, glyph.filen, glyph, "xml")
 
+    def usvGlyphs(self, usv):
+        # Return a list of names of glyphs encoded with usv (an integer).  The index used is built on first use then
+        # kept up to date as glyphs are added, deleted or renamed and unicode values are added, removed or changed
+        if self._usvindex is None:
+            self._usvindex = {}
+            for glyphn in self: self._indexUSVs(self[glyphn], glyphn)
+        return list(self._usvindex.get(usv, []))
+
+    def glyphUSVs(self, glyphn):  # Return a list of the unicode values (as integers) for a glyph
+        return [usv for usv in (_hex2usv(unicode.hex) for unicode in self[glyphn]["unicode"]) if usv is not None]
+
+    def _indexUSVs(self, glyph, glyphn, remove=False):  # Add or remove a glyph's unicode values in the index
+        if self._usvindex is None: return
+        for unicode in glyph["unicode"]: self._indexUSV(unicode.hex, glyphn, remove)
+
+    def _indexUSV(self, hex, glyphn, remove=False):
+        usv = _hex2usv(hex)
+        if self._usvindex is None or usv is None: return
+        glyphns = self._usvindex.setdefault(usv, [])
+        if remove:
+            if glyphn in glyphns: glyphns.remove(glyphn)
+            if not glyphns: del self._usvindex[usv]
+        else:
+            glyphns.append(glyphn)
+
+    # Component graph methods.  The graph is built on first use then kept up to date as glyphs are added, deleted or
+    # renamed and components are added, removed or have their bases changed using Uoutline and Ucomponent methods.
+    # If a script changes component elements directly, it should call updateComponents() for the glyph.
+
+    def componentGlyphs(self, glyphn):  # Return a list of the glyphs used as components by a glyph
+        return list(self._getCompGraph().get(glyphn, []))
+
+    def componentUsers(self, glyphn, recursive=False):
+        # Return the set of glyphs using glyphn as a component; if recursive, include glyphs using those, etc
+        self._getCompGraph()
+        users = set(self._compusers.get(glyphn, ()))
+        if recursive:
+            toprocess = list(users)
+            while toprocess:
+                for user in self._compusers.get(toprocess.pop(), ()):
+                    if user not in users:
+                        users.add(user)
+                        toprocess.append(user)
+        return users
+
+    def componentClosure(self, glyphns):
+        # Return the set of glyphns plus all glyphs they use as components, recursively.  Only glyphs in the layer are
+        # included, so missing components are ignored
+        graph = self._getCompGraph()
+        closure = set()
+        toprocess = [glyphn for glyphn in glyphns if glyphn in self._contents]
+        while toprocess:
+            glyphn = toprocess.pop()
+            if glyphn in closure: continue
+            closure.add(glyphn)
+            toprocess.extend(base for base in graph.get(glyphn, []) if base in self._contents and base not in closure)
+        return closure
+
+    def componentOrder(self, glyphns=None):
+        # Return glyphns (default all glyphs in the layer) ordered so that glyphs come after all the glyphs they use as
+        # components.  Components not in glyphns are not included.  With cycles (see componentCycles()) the order
+        # within a cycle is arbitrary
+        graph = self._getCompGraph()
+        if glyphns is None: glyphns = list(self._contents)
+        wanted = set(glyphns)
+        order = []
+        done = set()
+        for glyphn in glyphns:
+            if glyphn in done: continue
+            done.add(glyphn)
+            stack = [(glyphn, iter(graph.get(glyphn, [])))]
+            while stack:  # Depth-first, adding glyphs once all their components have been added
+                gname, bases = stack[-1]
+                for base in bases:
+                    if base in wanted and base not in done:
+                        done.add(base)
+                        stack.append((base, iter(graph.get(base, []))))
+                        break
+                else:
+                    stack.pop()
+                    order.append(gname)
+        return order
+
+    def componentCycles(self):
+        # Return a list of component cycles, each being a list of glyph names where each uses the next as a component
+        # and the last uses the first
+        graph = self._getCompGraph()
+        cycles = []
+        state = {}  # 1 = on current path, 2 = finished
+        for glyphn in self._contents:
+            if glyphn in state: continue
+            state[glyphn] = 1
+            path = [glyphn]
+            stack = [iter(graph.get(glyphn, []))]
+            while stack:
+                for base in stack[-1]:
+                    if state.get(base) == 1:
+                        cycles.append(path[path.index(base):])
+                    elif base not in state and base in self._contents:
+                        state[base] = 1
+                        path.append(base)
+                        stack.append(iter(graph.get(base, [])))
+                        break
+                else:
+                    state[path.pop()] = 2
+                    stack.pop()
+        return cycles
+
+    def updateComponents(self, glyphn):  # Update the component graph for a glyph after direct changes to its components
+        if self._compgraph is None: return
+        self._indexComponents(glyphn, remove=True)
+        self._indexComponents(glyphn, self[glyphn])
+
+    def _getCompGraph(self):
+        if self._compgraph is None:
+            self._compgraph = {}
+            self._compusers = {}
+            for glyphn in self: self._indexComponents(glyphn, self[glyphn])
+        return self._compgraph
+
+    def _indexComponents(self, glyphn, glyph=None, remove=False):  # Add or remove a glyph's components in the graph
+        if self._compgraph is None: return
+        if remove:
+            for base in self._compgraph.pop(glyphn, []):
+                users = self._compusers.get(base)
+                if users is not None:
+                    users.discard(glyphn)
+                    if not users: del self._compusers[base]
+            return
+        outline = glyph["outline"]
+        bases = []
+        if outline is not None:
+            for component in outline.components:
+                base = component.element.get("base")
+                if base is not None and base not in bases: bases.append(base)
+        if bases: self._compgraph[glyphn] = bases
+        for base in bases: self._compusers.setdefault(base, set()).add(glyphn)
+
+    def _renameComponents(self, oname, nname):  # Update the component graph when a glyph is renamed
+        if self._compgraph is None or oname not in self._compgraph: return
+        glyph = self._contents[oname]
+        self._indexComponents(oname, remove=True)
+        self._indexComponents(nname, glyph)
+
     def renameGlifs(self):
         namelist = []
         for glyphn in sorted(self.keys()):
-            glyph = self._contents[glyphn]
             filename = makeFileName(glyphn, namelist)
             namelist.append(filename.lower())
             filename += ".glif"
-            if filename != glyph.filen:
-                self.renameGlif(glyphn, glyph, filename)
+            if filename != self.contents[glyphn][1].text:
+                self.renameGlif(glyphn, self[glyphn], filename)
 
     def renameGlif(self, glyphn, glyph, newname):
         self.font.logger.log("Renaming glif for " + glyphn + " from " + glyph.filen + " to " + newname, "I")
@@ -803,15 +1180,26 @@ class Ulayer(_Ucontainer):
         # Add to contents.plist and dtree
         self.contents.addval(glyphn, "string", glifn)
         self.dtree[glifn] = UT.dirTreeItem(read=False, added=True, fileObject=glyph, fileType="xml")
+        self._indexUSVs(glyph, glyphn)
+        self._indexComponents(glyphn, glyph)
 
     def delGlyph(self, glyphn):
-        self.dtree.removedfiles[self[glyphn].filen] = "deleted"  # Track so original glif does not get reported as invalid
+        self.dtree.removedfiles[self.contents[glyphn][1].text] = "deleted"  # Track so original glif does not get reported as invalid
+        if self._usvindex is not None: self._indexUSVs(self[glyphn], glyphn, remove=True)
+        self._indexComponents(glyphn, remove=True)
         del self._contents[glyphn]
         self.contents.remove(glyphn)
 
 
+# Numbers held natively by Uplist whose text as read is not how python formats them (eg "05" or "1.50").  The text is kept
+# in .text so that values left unchanged are written back as they were read
+class _plistint(int): pass
+class _plistreal(float): pass
+
 class Uplist(ETU.xmlitem, _plist):
+    # Values can also be held as python objects - see getnative().  The etree is only updated with these when next needed
     def __init__(self, font=None, dirn=None, filen=None, parse=True):
+        self._native = {}
         if dirn is None and font: dirn = font.ufodir
         logger = font.logger if font else silfont.core.loggerobj()
         ETU.xmlitem.__init__(self, dirn, filen, parse, logger)
@@ -820,6 +1208,16 @@ class Uplist(ETU.xmlitem, _plist):
         self.outparams = None
         if filen and dirn: self.populate_dict()
 
+    @property
+    def etree(self):  # Using the etree directly means any values held natively need converting first
+        if self._native: self._materialize()
+        return self._etree
+
+    @etree.setter
+    def etree(self, etree):
+        self._native = {}
+        self._etree = etree
+
     def populate_dict(self):
         self._contents.clear()  # Clear existing contents, if any
         pl = self.etree[0]
@@ -831,13 +1229,312 @@ class Uplist(ETU.xmlitem, _plist):
             for i in range(len(pl)):
                 self._contents[i] = pl[i]
 
+    def __getitem__(self, key):
+        if key in self._native: self._materialize(key)
+        return self._contents[key]
+
+    def get(self, key, default=None):
+        return self[key] if key in self._contents else default
+
+    def getnative(self, key, default=None):
+        # Return the value for key as python objects (dict, list, str, int, float or bool) that are kept in place of the
+        # etree elements, so changes made to them are written out.  Elements of other types (eg date) are returned as is.
+        # Use for large values (eg public.glyphOrder) to avoid converting between elements and python objects repeatedly
+        if key in self._native: return self._native[key]
+        if key not in self._contents: return default
+        value = self._elemnative(self._contents[key][1])
+        self._native[key] = value
+        return value
+
+    def setnative(self, key, value):  # Set the value for key to python objects as described in getnative()
+        if key not in self._contents: _plist.addelem(self, key, ET.Element("string"))  # Placeholder until converted
+        self._native[key] = value
+
+    def getval(self, key, default=None):
+        if key in self._native: return self._nativeval(self._native[key])
+        return _plist.getval(self, key, default)
+
+    def setval(self, key, valuetype, value):
+        self._native.pop(key, None)
+        _plist.setval(self, key, valuetype, value)
+
+    def addval(self, key, valuetype, value):
+        self._native.pop(key, None)
+        _plist.addval(self, key, valuetype, value)
+
+    def remove(self, key):
+        self._native.pop(key, None)
+        _plist.remove(self, key)
+
+    def addelem(self, key, element):
+        self._native.pop(key, None)
+        _plist.addelem(self, key, element)
+
+    def _dictelem(self):
+        return self._etree[0]
+
+    def _materialize(self, key=None):  # Replace the elements for values held natively (all, or just key) with new ones
+        keys = [key] if key is not None else list(self._native)
+        pl = self._etree[0]
+        index = {id(elem): i for (i, elem) in enumerate(pl)}
+        for key in keys:
+            item = self._contents[key]
+            item[1] = self._nativeelem(self._native.pop(key))
+            pl[index[id(item[0])] + 1] = item[1]  # Value elements follow their key elements
+
+    def _elemnative(self, elem):  # Like _valelem() but keeps all the information needed to recreate the element
+        tag = elem.tag
+        if tag == "string": return elem.text if elem.text is not None else ""
+        elif tag == "array": return [self._elemnative(subelem) for subelem in elem]
+        elif tag == "dict": return {elem[i].text: self._elemnative(elem[i + 1]) for i in range(0, len(elem), 2)}
+        elif tag in ("integer", "real"):
+            value = self._valelem(elem)
+            if elem.text != "{}".format(value):
+                value = (_plistint if tag == "integer" else _plistreal)(value)
+                value.text = elem.text
+            return value
+        elif tag in ("true", "false"): return self._valelem(elem)
+        else: return elem
+
+    def _nativeelem(self, value):  # Create an element from a python value
+        if isinstance(value, ET.Element): return value
+        if isinstance(value, bool): return ET.Element("true" if value else "false")
+        if isinstance(value, (int, float)):
+            elem = ET.Element("integer" if isinstance(value, int) else "real")
+            elem.text = value.text if isinstance(value, (_plistint, _plistreal)) else "{}".format(value)
+        elif isinstance(value, str):
+            elem = ET.Element("string")
+            elem.text = value
+        elif isinstance(value, (list, tuple)):
+            elem = ET.Element("array")
+            for subvalue in value: elem.append(self._nativeelem(subvalue))
+        elif isinstance(value, dict):
+            elem = ET.Element("dict")
+            for subkey in value:
+                ET.SubElement(elem, "key").text = subkey
+                elem.append(self._nativeelem(value[subkey]))
+        else:
+            self.logger.log("Invalid value type for plist: " + type(value).__name__, "X")
+        return elem
+
+    def _nativeval(self, value):  # Return a copy of a native value in the form getval() would return it
+        if isinstance(value, ET.Element): return None
+        if isinstance(value, list): return [self._nativeval(subvalue) for subvalue in value]
+        if isinstance(value, dict): return {subkey: self._nativeval(value[subkey]) for subkey in value}
+        if isinstance(value, _plistint): return int(value)
+        if isinstance(value, _plistreal): return float(value)
+        return None if value == "" else value
+
+
+class Ukerning(object):
+    # Compact store for kerning pairs.  Names (of glyphs or kern groups) are held once in self.names and pairs are held in
+    # arrays of name indexes and values, so large amounts of kerning can be loaded, changed and output without building
+    # etree elements for each pair.  Pairs are kept in the order added.  See Ufont.getKerning()
+    def __init__(self, font=None):
+        self.font = font
+        self.names = []  # Names, indexed by the values in self.firsts and self.seconds
+        self.nameids = {}  # Index into self.names for each name
+        self.firsts = array("i")
+        self.seconds = array("i")
+        self.values = array("d")
+        self._pairs = {}  # Position in the arrays for each pair, keyed on _pairkey()
+        self._removed = 0  # Count of positions in the arrays no longer used
+        self._byfirst = None  # Indexes of positions by name index, created when needed - see firstPairs()
+        self._bysecond = None
+        self._kerngroups = None  # Kern groups for each glyph - see lookup()
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def __iter__(self):  # Yields (first, second, value) for each pair
+        names = self.names
+        for (first, second, value) in zip(self.firsts, self.seconds, self.values):
+            if value == value: yield (names[first], names[second], _kernvalue(value))  # Removed pairs have a value of NaN
+
+    def __contains__(self, pair):
+        (first, second) = pair
+        return self._pairkey(first, second) in self._pairs
+
+    def _nameid(self, name, add=False):
+        nameid = self.nameids.get(name)
+        if nameid is None and add:
+            nameid = len(self.names)
+            self.names.append(name)
+            self.nameids[name] = nameid
+        return nameid
+
+    def _pairkey(self, first, second):  # Single integer key for a pair, or None if either name is unknown
+        (firstid, secondid) = (self.nameids.get(first), self.nameids.get(second))
+        if firstid is None or secondid is None: return None
+        return (firstid << 32) | secondid
+
+    def _indexchanged(self):
+        self._byfirst = self._bysecond = None
+
+    def get(self, first, second, default=None):
+        pos = self._pairs.get(self._pairkey(first, second))
+        return default if pos is None else _kernvalue(self.values[pos])
+
+    def set(self, first, second, value):
+        (firstid, secondid) = (self._nameid(first, add=True), self._nameid(second, add=True))
+        key = (firstid << 32) | secondid
+        pos = self._pairs.get(key)
+        if pos is None:
+            self._pairs[key] = len(self.values)
+            self.firsts.append(firstid)
+            self.seconds.append(secondid)
+            self.values.append(value)
+            self._indexchanged()
+        else:
+            self.values[pos] = value
+
+    def remove(self, first, second):
+        pos = self._pairs.pop(self._pairkey(first, second))
+        self.values[pos] = math.nan
+        self._removed += 1
+        self._indexchanged()
+
+    def clear(self):
+        self.__init__(self.font)
+
+    def compact(self):
+        # Remove unused positions from the arrays and names no longer in any pair.  Done automatically by methods that
+        # process all pairs
+        if not self._removed: return
+        keep = [pos for (pos, value) in enumerate(self.values) if value == value]
+        (firsts, seconds) = ([self.firsts[pos] for pos in keep], [self.seconds[pos] for pos in keep])
+        live = sorted(set(firsts) | set(seconds))
+        if len(live) < len(self.names):
+            newids = {oldid: newid for (newid, oldid) in enumerate(live)}
+            self.names = [self.names[oldid] for oldid in live]
+            self.nameids = {name: nameid for (nameid, name) in enumerate(self.names)}
+            (firsts, seconds) = ([newids[i] for i in firsts], [newids[i] for i in seconds])
+        self.firsts = array("i", firsts)
+        self.seconds = array("i", seconds)
+        self.values = array("d", [self.values[pos] for pos in keep])
+        self._pairs = {(first << 32) | second: pos for (pos, (first, second)) in enumerate(zip(self.firsts, self.seconds))}
+        self._removed = 0
+        self._indexchanged()
+
+    def firstPairs(self, name):  # Return a dict of values keyed on second names for pairs with name first
+        if self._byfirst is None: self._byfirst = self._makeindex("firsts")
+        return {self.names[self.seconds[pos]]: _kernvalue(self.values[pos])
+                for pos in self._byfirst.get(self.nameids.get(name), [])}
+
+    def secondPairs(self, name):  # Return a dict of values keyed on first names for pairs with name second
+        if self._bysecond is None: self._bysecond = self._makeindex("seconds")
+        return {self.names[self.firsts[pos]]: _kernvalue(self.values[pos])
+                for pos in self._bysecond.get(self.nameids.get(name), [])}
+
+    def _makeindex(self, attrib):  # attrib is "firsts" or "seconds", read after compacting since that replaces the arrays
+        self.compact()
+        index = collections.defaultdict(list)
+        for (pos, nameid) in enumerate(getattr(self, attrib)): index[nameid].append(pos)
+        return index
+
+    def lookup(self, first, second, default=0):
+        # Return the kerning value between two glyphs, using kern groups from the font's groups.plist as described in the
+        # UFO spec: glyph-glyph pairs, then glyph-group, group-glyph and group-group
+        if self._kerngroups is None: self.updateGroups()
+        (group1, group2) = (self._kerngroups[0].get(first), self._kerngroups[1].get(second))
+        for pair in ((first, second), (first, group2), (group1, second), (group1, group2)):
+            if pair[0] is None or pair[1] is None: continue
+            pos = self._pairs.get(self._pairkey(*pair))
+            if pos is not None: return _kernvalue(self.values[pos])
+        return default
+
+    def updateGroups(self):  # Re-read kern groups from the font's groups.plist, eg after changes to groups
+        self._kerngroups = ({}, {})
+        groups = self.font.groups if self.font is not None and "groups" in self.font.__dict__ else {}
+        for gname in groups:
+            for (i, prefix) in enumerate(("public.kern1.", "public.kern2.")):
+                if gname.startswith(prefix):
+                    for glyph in groups.getnative(gname): self._kerngroups[i][glyph] = gname
+
+    def rename(self, namemap):
+        # Rename glyphs or kern groups in all pairs, using a dict of new names keyed on old names.  Only the list of names
+        # is changed, not the pairs.  Returns a list of old names not renamed since the new name is already in a pair
+        self.compact()  # So names only in removed pairs don't count as used
+        failed = []
+        olds = [(old, namemap[old], self.nameids[old]) for old in namemap if old in self.nameids]
+        for (old, new, nameid) in olds: del self.nameids[old]  # Removed first so names can be swapped
+        for (old, new, nameid) in olds:
+            if new in self.nameids:
+                failed.append(old)
+                self.nameids[old] = nameid
+            else:
+                self.names[nameid] = new
+                self.nameids[new] = nameid
+        return failed
+
+    def filter(self, function):
+        # Remove all pairs where function(name) is False for either name.  function is called once per name, so this is
+        # much faster than checking each pair.  Returns the number of pairs removed
+        keep = [function(name) for name in self.names]
+        values = self.values
+        removed = 0
+        for (pos, (first, second)) in enumerate(zip(self.firsts, self.seconds)):
+            if not (keep[first] and keep[second]) and values[pos] == values[pos]:
+                values[pos] = math.nan
+                removed += 1
+        self._removed += removed
+        self.compact()
+        return removed
+
+    def scale(self, factor, roundvalues=True):  # Multiply all values by factor, rounding to whole numbers by default
+        if roundvalues:
+            self.values = array("d", [round(value * factor) if value == value else value for value in self.values])
+        else:
+            self.values = array("d", [value * factor for value in self.values])
+
+    def merge(self, other, replace=True):
+        # Add pairs from other (another Ukerning or any iterable of (first, second, value)).  If replace is False, values
+        # for pairs already present are kept
+        for (first, second, value) in other:
+            if replace or (first, second) not in self: self.set(first, second, value)
+
+    def readcsv(self, csvfile):  # Add pairs from an open csv file with rows of first, second, value
+        for row in csv.reader(csvfile):
+            if not row: continue
+            (first, second, value) = row
+            self.set(first, second, float(value))
+
+    def writecsv(self, csvfile):  # Write all pairs to an open csv file as rows of first, second, value
+        csv.writer(csvfile).writerows(self)
+
+    def fromPlist(self, plist):  # Add pairs from a kerning.plist Uplist
+        for first in plist.keys():
+            elem = plist[first][1]
+            for i in range(0, len(elem), 2): self.set(first, elem[i].text, float(elem[i + 1].text))
+
+    def toPlist(self, plist):  # Replace the contents of a kerning.plist Uplist with the pairs
+        self.compact()
+        root = plist.etree
+        pl = root[0]
+        pl.clear()
+        firstelems = {}
+        names = self.names
+        for (first, second, value) in zip(self.firsts, self.seconds, self.values):
+            elem = firstelems.get(first)
+            if elem is None:
+                ET.SubElement(pl, "key").text = names[first]
+                elem = firstelems[first] = ET.SubElement(pl, "dict")
+            ET.SubElement(elem, "key").text = names[second]
+            value = _kernvalue(value)
+            ET.SubElement(elem, "integer" if isinstance(value, int) else "real").text = str(value)
+        plist.etree = root
+        plist.populate_dict()
+
+def _kernvalue(value): return int(value) if value == int(value) else value  # Kerning values are floats in Ukerning arrays
+
 
 class Uglif(ETU.xmlitem):
     # Unlike plists, glifs can have multiples of some sub-elements (eg anchors) so create lists for those
 
-    def __init__(self, layer, filen=None, parse=True, name=None, format=None):
+    def __init__(self, layer, filen=None, parse=True, name=None, format=None, xmldata=None):
         dirn = os.path.join(layer.font.ufodir, layer.layerdir)
-        ETU.xmlitem.__init__(self, dirn, filen, parse, layer.font.logger)  # Will read item from file if dirn and filen both present
+        # Will read item from file if dirn and filen both present, unless xmldata has already been read
+        ETU.xmlitem.__init__(self, dirn, filen, parse, layer.font.logger, xmldata, keepstr=not layer.font.digestInput)
         self.type = "glif"
         self.layer = layer
         self.format = format if format else '2'
@@ -851,11 +1548,16 @@ class Uglif(ETU.xmlitem):
             else:
                 self._contents[elem] = None
         if self.etree is not None: self.process_etree()
+        self.changed = False  # Set to True by any changes made using methods of Uglif or its sub-element objects
 
     def __setattr__(self, name, value):
+        if name in ("name", "format"): super(Uglif, self).__setattr__("changed", True)
         if name == "name" and getattr(self, "name", None):  # Existing glyph name is being changed
             oname = self.name
             if value in self.layer._contents: self.layer.font.logger.log(name + " already in font", "X")
+            self.layer._indexUSVs(self, oname, remove=True)
+            self.layer._indexUSVs(self, value)
+            self.layer._renameComponents(oname, value)
             # Update the _contents dictionary
             del self.layer._contents[oname]
             self.layer._contents[value] = self
@@ -924,6 +1626,7 @@ class Uglif(ETU.xmlitem):
 
     def add(self, ename, attrib=None):
         # Add an element and corresponding object to a glif
+        self.changed = True
         element = ET.Element(ename)
         if attrib: element.attrib = attrib
         if ename == "lib": ET.SubElement(element, "dict")
@@ -941,17 +1644,25 @@ class Uglif(ETU.xmlitem):
             self._contents[ename].append(self.makeObject(ename, element))
         else:
             self._contents[ename] = self.makeObject(ename, element)
+        if ename == "unicode" and self.inLayer(): self.layer._indexUSV(self._contents[ename][-1].hex, self.name)
+        if ename == "outline" and self.inLayer(): self.layer.updateComponents(self.name)
 
     def remove(self, ename, index=None, object=None):
         # Remove object from a glif
         # For multi objects, an index or object must be supplied to identify which
         # to delete
+        self.changed = True
         if ename in _glifElemMulti:
             item = self._contents[ename]
             if index is None: index = item.index(object)
+            if ename == "unicode" and self.inLayer(): self.layer._indexUSV(item[index].hex, self.name, remove=True)
             del item[index]
         else:
             self._contents[ename] = None
+            if ename == "outline" and self.inLayer(): self.layer.updateComponents(self.name)
+
+    def inLayer(self):  # True if the glif has been added to its layer, rather than just created for it
+        return self.layer._contents.get(self.name) is self
 
     def convertToFormat1(self):
         # Convert to a glif format of 1 (for UFO2) prior to writing out
@@ -1000,6 +1711,7 @@ class Uadvance(Uelement):
             else:
                 value = str(value)
                 self.element.attrib[name] = value
+            self._setchanged()
         super(Uadvance, self).__setattr__(name, value)
 
 class Uunicode(Uelement):
@@ -1013,7 +1725,12 @@ class Uunicode(Uelement):
             self.glif.logger.log("No unicode hex attribute for " + glif.name, "E")
 
     def __setattr__(self, name, value):
-        if name == "hex": self.element.attrib['hex'] = value
+        if name == "hex":
+            if "hex" in self.__dict__ and self.glif.inLayer():  # Update the layer's unicode index
+                self.glif.layer._indexUSV(self.hex, self.glif.name, remove=True)
+                self.glif.layer._indexUSV(value, self.glif.name)
+            self.element.attrib['hex'] = value
+            self._setchanged()
         super(Uunicode, self).__setattr__(name, value)
 
 
@@ -1057,7 +1774,9 @@ class Uoutline(Uelement):
 
     def removeobject(self, obj, typ):
         super(Uoutline, self).remove(obj.element)
-        if typ == "component": self.components.remove(obj)
+        if typ == "component":
+            self.components.remove(obj)
+            self._updatecomponents()
         if typ == "contour": self.contours.remove(obj)
 
     def replaceobject(self, oldobj, newobj, typ):
@@ -1066,6 +1785,7 @@ class Uoutline(Uelement):
         if typ == "component":
             cindex = self.components.index(oldobj)
             self.components[cindex]= newobj
+            self._updatecomponents()
         if typ == "contour":
             cindex = self.contours.index(oldobj)
             self.contours[cindex]= newobj
@@ -1086,9 +1806,15 @@ class Uoutline(Uelement):
             else:
                 obj = Ucontour(self,elem)
         super(Uoutline, self).append(obj.element)
-        if typ == "component": self.components.append(obj)
+        if typ == "component":
+            self.components.append(obj)
+            self._updatecomponents()
         if typ == "contour": self.contours.append(obj)
 
+    def _updatecomponents(self):  # Keep the layer's component graph up to date
+        glif = self.glif
+        if glif.inLayer() and glif["outline"] is self: glif.layer.updateComponents(glif.name)
+
     def insertobject(self, index, item, typ): # Needs updating to match appendobject
         self.glif.logger.log("insertobject currently buggy so don't use!", "X")
         # Bug is that index for super... should be different than components/contours.
@@ -1104,12 +1830,20 @@ class Ucomponent(Uelement):
     def __init__(self, outline, element):
         super(Ucomponent, self).__init__(element)
         self.outline = outline
+        self.glif = outline.glif
+
+    def setBase(self, base):  # Change the component base, keeping the layer's component graph up to date
+        self.element.set("base", base)
+        self._setchanged()
+        if self in self.outline.components: self.outline._updatecomponents()
 
 
 class Ucontour(Uelement):
     def __init__(self, outline, element):
+        self.xs = None  # Set if point data is held in compact form - see compact()
         super(Ucontour, self).__init__(element)
         self.outline = outline
+        self.glif = outline.glif
         self.UFO2anchor = None
         points = self._contents['point']
         # Identify UFO2-style anchor points
@@ -1120,6 +1854,106 @@ class Ucontour(Uelement):
                 else:
                     self.outline.glif.layer.font.logger.log(
                         "Glyph " + self.outline.glif.name + " contains a single-point contour with no anchor name", "E")
+        if self.UFO2anchor is None and self.glif.layer.font.compactPoints: self.compact()
+
+    # With compactPoints set, accessing the contour's element or contents (eg via len(), self['point'] or get()) restores
+    # the point elements
+    @property
+    def element(self):
+        if self.xs is not None: self.expand()
+        return self._element
+
+    @element.setter
+    def element(self, element):
+        self._element = element
+
+    @property
+    def _contents(self):
+        if self.xs is not None: self.expand()
+        return self._pointcontents
+
+    @_contents.setter
+    def _contents(self, contents):
+        self._pointcontents = contents
+
+    def compact(self):
+        # Replace the point elements with arrays to save memory:
+        #   self.xs & self.ys - coordinates as floats
+        #   self.types & self.smooth - codes for type and smooth attributes based on _pointTypes and _pointSmooth
+        #   self.extras - dict of any other attributes (eg name), keyed on point index.  This also holds the original text
+        #                 of any x or y value not in the form _numstr() gives (eg 10.0), which is output if the value is unchanged
+        # If a script changes values in these, it should set glif.changed = True
+        element = self._element
+        if self.xs is not None or element.text and element.text.strip(): return
+        xs = array("d")
+        ys = array("d")
+        types = bytearray()
+        smooth = bytearray()
+        extras = {}
+        for (i, point) in enumerate(element):
+            attrib = dict(point.attrib)
+            if point.tag != "point" or len(point) or (point.text and point.text.strip()) or (point.tail and point.tail.strip()):
+                return  # Contour can't be stored in compact form, so leave as elements
+            try:
+                x = float(attrib["x"])
+                y = float(attrib["y"])
+            except (KeyError, ValueError):
+                return
+            if not (math.isfinite(x) and math.isfinite(y)): return
+            if attrib["x"] == _numstr(x): del attrib["x"]
+            if attrib["y"] == _numstr(y): del attrib["y"]
+            xs.append(x)
+            ys.append(y)
+            value = attrib.pop("type", None)
+            if value in _pointTypes:
+                types.append(_pointTypes.index(value))
+            else:
+                types.append(0)
+                attrib["type"] = value
+            value = attrib.pop("smooth", None)
+            if value in _pointSmooth:
+                smooth.append(_pointSmooth.index(value))
+            else:
+                smooth.append(0)
+                attrib["smooth"] = value
+            if attrib: extras[i] = attrib
+        del element[:]
+        self._contents['point'] = []
+        (self.xs, self.ys, self.types, self.smooth, self.extras) = (xs, ys, types, smooth, extras)
+
+    def expand(self):
+        # Convert points from compact form back to point elements
+        if self.xs is None: return
+        element = self._element
+        for point in self.pointElements(): element.append(point)
+        self.xs = None
+        self.ys = self.types = self.smooth = self.extras = None
+        self.reindex()
+
+    def pointElements(self):
+        # Return a list of point elements for the contour, creating them if the contour is in compact form
+        if self.xs is None: return list(self._element)
+        points = []
+        for i in range(len(self.xs)):
+            attrib = {"x": _numstr(self.xs[i]), "y": _numstr(self.ys[i])}
+            if self.types[i]: attrib["type"] = _pointTypes[self.types[i]]
+            if self.smooth[i]: attrib["smooth"] = _pointSmooth[self.smooth[i]]
+            if i in self.extras:
+                for (key, value) in self.extras[i].items():
+                    if key == "x" and float(value) != self.xs[i] or key == "y" and float(value) != self.ys[i]: continue
+                    attrib[key] = value
+            points.append(ET.Element("point", attrib))
+        return points
+
+    def outputElement(self):
+        # Return the contour element for output, without expanding the contour if it is in compact form
+        if self.xs is None: return self._element
+        element = ET.Element("contour", self._element.attrib)
+        element.extend(self.pointElements())
+        return element
+
+
+def _numstr(num): return str(int(num)) if num == int(num) else repr(num)  # String for a coordinate in a compact contour
 
 
 class Ulib(_Ucontainer, _plist):
@@ -1139,54 +1973,121 @@ class Ulib(_Ucontainer, _plist):
                 key = pl[i].text
                 self._contents[key] = [pl[i], pl[i + 1]]  # The two elements for the item
 
+    def _setchanged(self):
+        self.glif.changed = True
+
 
 class UfeatureFile(UtextFile):
     def __init__(self, font, dirn, filen):
         super(UfeatureFile, self).__init__(font, dirn, filen)
 
 
-def writeXMLobject(dtreeitem, params, dirn, filen, exists, fobject=False):
+def writeXMLobject(dtreeitem, params, dirn, filen, exists, fobject=False, outxmlstr=None, manifest=None):
+    # outxmlstr can be supplied if the object has already been normalized and serialized, eg by serializeGlifs()
+    # manifest is a UT.fileCache of digests of files previously output - see UT.filematches()
     object = dtreeitem if fobject else dtreeitem.fileObject  # Set fobject to True if a file object is passed ratehr than dtreeitem
     if object.outparams: params = object.outparams  # override default params with object-specific ones
-    indentFirst = params["indentFirst"]
-    attribOrder = {}
-    if object.type in params['attribOrders']: attribOrder = params['attribOrders'][object.type]
-    if object.type == "plist":
-        indentFirst = params["plistIndentFirst"]
-        object.etree.attrib[".doctype"] = 'plist PUBLIC "-//Apple Computer//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd"'
-
-    # Format ET data if any data parameters are set
-    if params["sortDicts"] or params["precision"] is not None: normETdata(object.etree, params, type=object.type)
-
-    etw = ETU.ETWriter(object.etree, attributeOrder=attribOrder, indentIncr=params["indentIncr"],
-                       indentFirst=indentFirst, indentML=params["indentML"], precision=params["precision"],
-                       floatAttribs=params["floatAttribs"], intAttribs=params["intAttribs"])
-    object.outxmlstr=etw.serialize_xml()
+    if outxmlstr is None:
+        normXMLobject(object, params)
+        outxmlstr = serializeET(object.etree, object.type, params)
+    object.outxmlstr = outxmlstr
     # Now we have the output xml, need to compare with existing item's xml, if present
     changed = True
+    outpath = os.path.join(dirn, filen)
 
-    if exists:  # File already on disk
-        if exists == "same":  # Output and input locations the same
-            oxmlstr = object.inxmlstr
-        else:  # Read existing XML from disk
-            oxmlstr = ""
-            try:
-                oxml = io.open(os.path.join(dirn, filen), "r", encoding="utf-8")
-            except Exception as e:
-                print(e)
-                sys.exit(1)
-            for line in oxml.readlines():
-                oxmlstr += line
-            oxml.close()
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", UnicodeWarning)
-            if oxmlstr == object.outxmlstr: changed = False
+    if exists == "Same" and getattr(object, "inpath", None) and os.path.normpath(object.inpath) == os.path.normpath(outpath):
+        # Output and input locations the same, so compare with the input as read
+        if object.indigest is not None:  # Only a digest of the input was kept (see digestInput)
+            changed = UT.textdigest(outxmlstr) != object.indigest
+        else:
+            changed = object.inxmlstr != outxmlstr
+    elif exists:  # File already on disk
+        changed = not UT.filematches(outpath, outxmlstr, manifest)
 
     if changed: object.write_to_file(dirn, filen)
+    if manifest is not None: UT.recordfile(manifest, outpath, outxmlstr)
     if not fobject: dtreeitem.written = True  # Mark as True, even if not changed - the file should still be there!
     return changed # Boolean to indicate file updated on disk
 
 
+def normXMLobject(object, params):  # Prepare an object's etree for serializing
+    if object.type == "plist":
+        object.etree.attrib[".doctype"] = 'plist PUBLIC "-//Apple Computer//DTD PLIST 1.0//EN" "http://www.apple.com/DTDs/PropertyList-1.0.dtd"'
+    # Format ET data if any data parameters are set
+    if params["sortDicts"] or params["precision"] is not None: normETdata(object.etree, params, type=object.type)
+
+
+def serializeET(etree, type, params, subelements=None):  # Kept separate from normXMLobject() so it can be run in other processes
+    # If subelements is supplied, it is output in place of the sub-elements of etree - see ETWriter.serialize_xml()
+    indentFirst = params["plistIndentFirst"] if type == "plist" else params["indentFirst"]
+    attribOrder = params['attribOrders'][type] if type in params['attribOrders'] else {}
+    etw = ETU.ETWriter(etree, attributeOrder=attribOrder, indentIncr=params["indentIncr"],
+                       indentFirst=indentFirst, indentML=params["indentML"], precision=params["precision"],
+                       floatAttribs=params["floatAttribs"], intAttribs=params["intAttribs"])
+    return etw.serialize_xml(subelements=subelements)
+
+
+def _serializeETargs(args): return serializeET(*args)  # For use with pool.map()
+
+
+def prepGlifForOutput(glif, params):  # Final tidying and normalizing of a glif before it is serialized
+    if glif["lib"] is not None: # Delete lib if no items in it
+        if glif["lib"].__len__() == 0:
+            glif.remove("lib")
+    # Sort UFO3 anchors by name (UFO2 anchors will have been sorted on conversion)
+    glif["anchor"].sort(key=lambda anchor: anchor.element.get("name"))
+    # Rather than rebuilding glif.etree (see rebuildET), return an empty glyph element and a list of the sub-elements
+    # to output within it, taken directly from the Uglif objects, for serializeET() to output
+    root = ET.Element("glyph")
+    root.attrib["name"] = glif.name
+    root.attrib["format"] = glif.format
+    elements = []
+    for elem in glif.glifElemOrder:
+        if elem in _glifElemF1 or glif.format == "2":  # Check element is valid for glif format
+            item = glif._contents[elem]
+            if item is not None:
+                if elem in _glifElemMulti:
+                    for object in item: elements.append(object.element)
+                elif elem == "outline":
+                    elements.append(outlineForOutput(item))
+                else:
+                    elements.append(item.element)
+    if params["sortDicts"] or params["precision"] is not None:
+        for element in elements: normETdata(element, params, type="glif")
+    return (root, elements)
+
+
+def outlineForOutput(outline):
+    # If any contours are in compact form (see compactPoints) return a copy of the outline element with the points
+    # restored, leaving the contours themselves in compact form
+    compact = {id(contour._element): contour for contour in outline.contours if contour.xs is not None}
+    if not compact: return outline.element
+    element = ET.Element("outline", outline.element.attrib)
+    for subelement in outline.element:
+        element.append(compact[id(subelement)].outputElement() if id(subelement) in compact else subelement)
+    return element
+
+
+def serializeGlifs(font, parallel):
+    # Prepare and normalize all glifs due to be written then serialize them using a pool of parallel processes.
+    # Returns a dict of xml strings keyed on glif object for use by writeToDisk()
+    glifs = []
+    for layer in font.layers:
+        dtree = font.dtree.subTree(layer.layerdir)
+        for glyphn in layer:
+            glif = layer._contents[glyphn]
+            if glif is None or not dtree[glif.filen].towrite: continue  # Skip unread glifs (see lazyGlifs)
+            params = glif.outparams if glif.outparams else font.outparams
+            (root, elements) = prepGlifForOutput(glif, params)
+            glifs.append((glif, (root, "glif", params, elements)))
+    if not glifs: return {}
+    chunksize = max(1, len(glifs) // (parallel * 4))
+    import concurrent.futures
+    with concurrent.futures.ProcessPoolExecutor(parallel) as pool:
+        results = pool.map(_serializeETargs, [args for (glif, args) in glifs], chunksize=chunksize)
+        return {glif: xmlstr for ((glif, args), xmlstr) in zip(glifs, results)}
+
+
 def setFileForOutput(dtree, filen, fileObject, fileType):  # Put details in dtree, creating item if needed
     if filen not in dtree:
         dtree[filen] = UT.dirTreeItem()
@@ -1194,8 +2095,10 @@ def setFileForOutput(dtree, filen, fileObject, fileType):  # Put details in dtre
     dtree[filen].setinfo(fileObject=fileObject, fileType=fileType, towrite=True)
 
 
-def writeToDisk(dtree, outdir, font, odtree=None, logindent="", changes = False):
+def writeToDisk(dtree, outdir, font, odtree=None, logindent="", changes = False, serialized=None):
+    # serialized is a dict of pre-serialized glifs, as returned by serializeGlifs()
     if odtree is None: odtree = {}
+    if serialized is None: serialized = {}
     # Make lists of items in dtree and odtree with type prepended for sorting and comparison purposes
     dtreelist = []
     for filen in dtree: dtreelist.append(dtree[filen].type + filen)
@@ -1240,15 +2143,14 @@ def writeToDisk(dtree, outdir, font, odtree=None, logindent="", changes = False)
                 font.logger.log(logindent + filen, "V")
                 if dtreeitem.fileType == "xml":
                     if dtreeitem.fileObject:  # Only write if object has items
-                        if dtreeitem.fileObject.type == "glif":
-                            glif = dtreeitem.fileObject
-                            if glif["lib"] is not None: # Delete lib if no items in it
-                                if glif["lib"].__len__() == 0:
-                                    glif.remove("lib")
-                            # Sort UFO3 anchors by name (UFO2 anchors will have been sorted on conversion)
-                            glif["anchor"].sort(key=lambda anchor: anchor.element.get("name"))
-                            glif.rebuildET()
-                        result = writeXMLobject(dtreeitem, font.outparams, outdir, filen, exists)
+                        outxmlstr = serialized.pop(dtreeitem.fileObject, None)
+                        glif = dtreeitem.fileObject
+                        if glif.type == "glif" and outxmlstr is None:  # Serialize directly from the glif's objects
+                            params = glif.outparams if glif.outparams else font.outparams
+                            (root, elements) = prepGlifForOutput(glif, params)
+                            outxmlstr = serializeET(root, "glif", params, elements)
+                        result = writeXMLobject(dtreeitem, font.outparams, outdir, filen, exists, outxmlstr=outxmlstr,
+                                                manifest=font.outmanifest)
                         if result: changes = True
                     else:  # Delete existing item if the current object is empty
                         if exists:
@@ -1256,7 +2158,8 @@ def writeToDisk(dtree, outdir, font, odtree=None, logindent="", changes = False)
                             os.remove(os.path.join(outdir, filen))
                             changes = True
                 elif dtreeitem.fileType == "text":
-                    dtreeitem.fileObject.write(dtreeitem, outdir, filen, exists)
+                    result = dtreeitem.fileObject.write(dtreeitem, outdir, filen, exists)
+                    if result and isinstance(dtreeitem.fileObject, UunreadGlif): changes = True  # Copied glif differed from output UFO
                     ## Need to add code for other file types
             else:
                 if filen in dtree.removedfiles:
@@ -1304,7 +2207,7 @@ def writeToDisk(dtree, outdir, font, odtree=None, logindent="", changes = False)
                 else:
                     subodtree = {}
                 subindent = logindent + "  "
-                changes = writeToDisk(dtreeitem.dirtree, subdir, font, subodtree, subindent, changes)
+                changes = writeToDisk(dtreeitem.dirtree, subdir, font, subodtree, subindent, changes, serialized)
                 if os.listdir(subdir) == []:
                     os.rmdir(subdir)  # Delete directory if empty
                     changes = True
@@ -1357,6 +2260,13 @@ def normETdata(element, params, type):
 def getattrib(element, attrib): return element.attrib[attrib] if attrib in element.attrib else None
 
 
+def _hex2usv(hex):  # Convert a unicode hex attribute value to an integer, returning None if it is not valid
+    try:
+        return int(hex, 16)
+    except (TypeError, ValueError):
+        return None
+
+
 def makeFileName(name, namelist=None):
     if namelist is None: namelist = []
     # Replace illegal characters and add _ after UC letters
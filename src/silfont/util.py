@@ -5,31 +5,27 @@ __copyright__ = 'Copyright (c) 2014-2025, SIL Global (https://www.sil.org)'
 __license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
 __author__ = 'David Raymond'
 
-import os, subprocess, difflib, sys, io, json
+import os, subprocess, difflib, sys, io, json, hashlib
+from collections import OrderedDict
 from silfont.core import execute
-from importlib.resources import files
 from csv import reader as csvreader
 
-try:
-    from fontTools.ttLib import TTFont
-except Exception as e:
-    TTFont = None
-
 class dirTree(dict) :
     """ An object to hold list of all files and directories in a directory
         with option to read sub-directory contents into dirTree objects.
-        Iterates through readSub levels of subfolders
+        Iterates through readSub levels of subfolders.  Sub-directories are only read when their dirtree is first used
         Flags to keep track of changes to files etc"""
     def __init__(self,dirn,readSub = 9999) :
         self.removedfiles = {} # List of files that have been renamed or deleted since reading from disk
-        for name in os.listdir(dirn) :
-            if name[-1:] == "~" : continue
-            item=dirTreeItem()
-            if os.path.isdir(os.path.join(dirn, name)) :
-                item.type = "d"
-                if readSub :
-                    item.dirtree = dirTree(os.path.join(dirn,name),readSub-1)
-            self[name] = item
+        with os.scandir(dirn) as entries : # scandir gives file types without needing to stat each entry on most systems
+            for entry in entries :
+                name = entry.name
+                if name[-1:] == "~" : continue
+                item=dirTreeItem()
+                if entry.is_dir() :
+                    item.type = "d"
+                    if readSub : item._subdir = (entry.path, readSub-1)
+                self[name] = item
 
     def subTree(self,path) : # Returns dirTree object for a subtree based on subfolder name(s)
         # 'path' can be supplied as either a relative path (eg "subf/subsubf") or array (eg ['subf','subsubf']
@@ -67,6 +63,19 @@ class dirTreeItem(object) :
         self.fileType = fileType        # The type of the file object
         self.flags = {}                 # Any other flags a script might need
 
+    @property
+    def dirtree(self) : # Sub-directories are read when first needed. _subdir holds (path, readSub) until then
+        if self._subdir :
+            (path, readSub) = self._subdir
+            self._subdir = None
+            self._dirtree = dirTree(path, readSub)
+        return self._dirtree
+
+    @dirtree.setter
+    def dirtree(self, value) :
+        self._subdir = None
+        self._dirtree = value
+
     def setinfo(self, read = None, added = None, changed = None, towrite = None, written = None, fileObject = None, fileType = None, flags = None) :
         pass
         if read : self.read = read
@@ -78,6 +87,104 @@ class dirTreeItem(object) :
         if fileType : self.fileType = fileType
         if flags : self.flags = flags
 
+class fileCache(object):
+    """ A persistent cache, held as a json file in cachedir, of values keyed on strings (typically digests from textdigest()).
+        Entries are kept in order of last use and the oldest are dropped on saving if there are more than maxentries.
+        Use fileCache.open() rather than creating directly, so all users within a process share the same object.
+        save(merge=True) first adds entries saved by other processes since this one read the file, and records the keys
+        dropped by that save in self.evicted, for users that hold other data keyed on the entries."""
+    _caches = {}
+
+    @classmethod
+    def open(cls, cachedir, name, maxentries=100000):
+        if cachedir == "": cachedir = defaultcachedir()
+        filen = os.path.join(cachedir, name + ".json")
+        if filen not in cls._caches: cls._caches[filen] = cls(filen, maxentries)
+        cache = cls._caches[filen]
+        cache.maxentries = maxentries
+        return cache
+
+    def __init__(self, filen, maxentries):
+        self.filen = filen
+        self.maxentries = maxentries
+        self.updated = False
+        self.evicted = []
+        self.entries = self._read()
+
+    def _read(self):
+        try:
+            with open(self.filen, "r", encoding="utf-8") as f: return OrderedDict(json.load(f))
+        except (OSError, ValueError):  # No cache yet, or cache corrupted, so start with an empty one
+            return OrderedDict()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, default=None):
+        if key not in self.entries: return default
+        self.entries.move_to_end(key)  # Record as most recently used
+        self.updated = True
+        return self.entries[key]
+
+    def set(self, key, value=True):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        self.updated = True
+
+    def save(self, merge=False):  # Returns an error message if the cache can't be written
+        if not self.updated: return None
+        if merge:  # Entries only on disk are treated as older than any used here
+            entries = OrderedDict((key, value) for (key, value) in self._read().items() if key not in self.entries)
+            entries.update(self.entries)
+            self.entries = entries
+        self.evicted = []
+        while len(self.entries) > self.maxentries: self.evicted.append(self.entries.popitem(last=False)[0])
+        try:
+            os.makedirs(os.path.dirname(self.filen), exist_ok=True)
+            tempn = self.filen + "." + str(os.getpid()) + ".tmp"  # Write then rename so other processes never see a partial file
+            with open(tempn, "w", encoding="utf-8") as f: json.dump(list(self.entries.items()), f)
+            os.replace(tempn, self.filen)
+        except OSError as e:
+            return "Unable to write cache " + self.filen + ": " + str(e)
+        self.updated = False
+        return None
+
+def filematches(filen, text, manifest=None):
+    # True if filen contains text, as written by xmlitem.write_to_file().  Files with a different size are known to differ
+    # without reading them.  If manifest (a fileCache) has a digest recorded by recordfile() for the file and its size and
+    # modification time are unchanged since, the digests are compared.  Otherwise the file is read in one go and compared.
+    try:
+        stat = os.stat(filen)
+    except OSError:
+        return False
+    data = _filebytes(text)
+    if stat.st_size != len(data): return False
+    if manifest is not None:
+        entry = manifest.get(_manifestkey(filen))
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns: return entry[2] == textdigest(data)
+    with open(filen, "rb") as f: return f.read() == data
+
+def recordfile(manifest, filen, text):  # Record the digest of a file just written (or found unchanged) for filematches()
+    try:
+        stat = os.stat(filen)
+    except OSError:
+        return
+    manifest.set(_manifestkey(filen), [stat.st_size, stat.st_mtime_ns, textdigest(_filebytes(text))])
+
+def _filebytes(text):  # The bytes for text as written to a file in text mode
+    if os.linesep != "\n": text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+def _manifestkey(filen): return "file:" + textdigest(os.path.abspath(filen))
+
+def defaultcachedir():  # Follows the XDG convention used on Linux on all platforms, for simplicity
+    cachehome = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cachehome, "pysilfont")
+
+def textdigest(text):  # Short digest of a string, for use as a cache key
+    if isinstance(text, str): text = text.encode("utf-8")
+    return hashlib.blake2b(text, digest_size=16).hexdigest()
+
 class ufo_diff(object): # For diffing 2 ufos as part of testing
     # returncodes:
     #   0 - ufos are the same
@@ -162,6 +269,10 @@ class ttf_diff(object): # For diffing 2 ttf files.  Differences are not listed
 
     def __init__(self, file1, file2):
         errors=[]
+        try:
+            from fontTools.ttLib import TTFont
+        except Exception as e:
+            TTFont = None
         if TTFont is None:
             self.diff=""
             self.errors="Testing failed - class ttf_diff requires fontTools to be installed"
@@ -355,6 +466,7 @@ def parsecolors(colors, single = False, allowspecial = False): # Process a list
 def required_chars(sets="basic"):
     if type(sets) == str: sets = (sets,) # Convert single string to a tuple
     # Use importlib.resources to get the path to required_chars.csv
+    from importlib.resources import files
     rcfile_path = files('silfont').joinpath('data/required_chars.csv')
     with open(rcfile_path, encoding="utf-8") as rcfile:
         rcreader = csvreader(rcfile)
@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+''' Import-time regression tests for the command-line scripts
+
+Each script is imported in a fresh python process, which is checked for not having imported heavy font libraries
+that are only needed once the script is running.  Running with -h should also not import font libraries.
+Import times depend too much on the machine to check by default.  To also check each script against a time budget,
+set the PSFIMPORT_SCALE environment variable to the factor to scale the budgets by for the machine, eg
+PSFIMPORT_SCALE=1 pytest tests/benchmarks/test_importtime.py
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import os, sys, json, subprocess, pytest
+import silfont.scripts
+
+scriptsdir = os.path.dirname(silfont.scripts.__file__)
+scripts = sorted(f[:-3] for f in os.listdir(scriptsdir) if f.startswith("psf") and f.endswith(".py"))
+
+# Modules that are slow to import, so should only be imported when needed
+heavymodules = ("glyphsLib", "defcon", "ufo2ft", "mutatorMath", "fontMath", "fontParts", "palaso", "fontTools.ttLib",
+                "fontTools.designspaceLib", "fontTools.feaLib", "odf", "tabulate")
+allowedheavy = {  # Heavy modules that scripts need at module level
+    "psfbuildfea": ("fontTools.ttLib", "fontTools.designspaceLib", "fontTools.feaLib"),  # Subclasses feaLib classes
+    "psfcompressgr": ("fontTools.ttLib",),  # Needs fontTools to open the font anyway
+    "psfftml2odt": ("odf",)}  # odf classes are used throughout the script
+
+defaultbudget = 150  # Milliseconds
+budgets = {"psfbuildfea": 400}
+scale = os.environ.get("PSFIMPORT_SCALE")  # Time budgets are only checked if set
+
+importcode = '''
+import sys, time, json
+start = time.perf_counter()
+try:
+    import silfont.scripts.%s
+except ImportError as e:  # Missing optional dependency
+    print(json.dumps({"missing": str(e)}))
+    sys.exit(0)
+secs = time.perf_counter() - start
+print(json.dumps({"ms": secs * 1000, "heavy": [m for m in %r if m in sys.modules]}))
+'''
+
+def runimport(script):
+    result = subprocess.run([sys.executable, "-c", importcode % (script, heavymodules)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+@pytest.mark.parametrize("script", scripts)
+def test_importtime(script):
+    result = runimport(script)
+    if "missing" in result: pytest.skip(result["missing"])
+    unexpected = set(result["heavy"]) - set(allowedheavy.get(script, ()))
+    assert not unexpected, "%s imports %s at start-up" % (script, ", ".join(sorted(unexpected)))
+    if not scale: return
+    budget = budgets.get(script, defaultbudget) * float(scale)
+    for i in range(2):  # Retry in case the machine was busy
+        if result["ms"] <= budget: break
+        result = runimport(script)
+    assert result["ms"] <= budget, "Importing %s took %.0f ms - budget is %.0f ms" % (script, result["ms"], budget)
+
+helpcode = '''
+import sys, json
+sys.argv = ["%s", "-h"]
+import silfont.scripts.%s as script
+try:
+    script.cmd()
+except SystemExit:
+    pass
+print(json.dumps([m for m in ("silfont.ufo",) + %r if m in sys.modules]))
+'''
+
+@pytest.mark.parametrize("script", ["psfnormalize", "psfsetkeys", "psfsetdummydsig", "psfcheckinterpolatable"])
+def test_help(script):  # -h should not need any font libraries
+    result = subprocess.run([sys.executable, "-c", helpcode % (script, script, heavymodules)], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    assert not loaded, "%s -h imports %s" % (script, ", ".join(loaded))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+''' Benchmarks for reading, normalizing and writing UFOs with pysilfont's own UFO code
+
+Synthesizes a UFO of configurable size then times each phase and records peak memory (using tracemalloc).
+When run directly, results are written as json to local/benchmarks so they can be compared across commits.
+
+Under pytest, a small UFO is used so the benchmarks run quickly as part of the normal tests, and all files are
+written to a temporary directory.  Sizes can be set with environment variables (see benchsettings below), eg
+    PSFBENCH_GLYPHS=5000 PSFBENCH_LAYERS=2 pytest tests/benchmarks
+Alternatively, run directly, eg
+    python tests/benchmarks/test_ufobenchmarks.py -g 5000 -l 2
+    python tests/benchmarks/test_ufobenchmarks.py --compare local/benchmarks/old.json local/benchmarks/new.json
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import silfont
+import silfont.core
+import silfont.ufo as UFO
+import silfont.scripts.psfnormalize as psfnormalize
+import os, sys, shutil, io, json, time, datetime, tracemalloc, subprocess, argparse, platform
+
+resultsdir = "local/benchmarks"  # Defaults for when run directly
+workdir = os.path.join(resultsdir, "work")
+
+# Settings with defaults for use under pytest and the environment variables to override them
+benchsettings = {
+    "glyphs":   (200, "PSFBENCH_GLYPHS"),    # Number of glyphs in each layer
+    "layers":   (1, "PSFBENCH_LAYERS"),      # Number of layers
+    "contours": (3, "PSFBENCH_CONTOURS"),    # Contours per glyph
+    "kerning":  (500, "PSFBENCH_KERNING"),   # Number of kerning pairs
+    "repeat":   (1, "PSFBENCH_REPEAT")}      # Number of times to time each phase - the fastest is reported
+
+def getsettings():
+    return {name: int(os.environ.get(envvar, default)) for (name, (default, envvar)) in benchsettings.items()}
+
+def makeufo(ufodir, glyphs, layers, contours, kerning):
+    # Create a UFO 3 font with the given number of glyphs etc.  Files are written un-normalized (eg attributes in
+    # non-standard order and unsorted dicts) so normalization has real work to do
+    if os.path.exists(ufodir): shutil.rmtree(ufodir)
+    os.makedirs(ufodir)
+    plisthead = '<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0">\n'
+
+    def writefile(filen, text):
+        with io.open(os.path.join(ufodir, filen), "w", encoding="utf-8") as f: f.write(text)
+
+    def plistdict(items):  # items is a list of (key, xml for value)
+        return plisthead + "<dict>\n" + "".join(["<key>%s</key>%s\n" % (k, v) for (k, v) in items]) + "</dict>\n</plist>\n"
+
+    writefile("metainfo.plist", plistdict([("formatVersion", "<integer>3</integer>"), ("creator", "<string>benchmark</string>")]))
+    writefile("fontinfo.plist", plistdict([("unitsPerEm", "<integer>1000</integer>"), ("familyName", "<string>Bench</string>"),
+        ("styleName", "<string>Regular</string>"), ("ascender", "<integer>800</integer>"), ("descender", "<integer>-200</integer>")]))
+    names = ["g%05d" % i for i in range(glyphs)]
+    writefile("lib.plist", plistdict([("public.glyphOrder", "<array>" + "".join(["<string>%s</string>" % n for n in names]) + "</array>")]))
+    kernpairs = {}
+    for i in range(kerning):
+        (left, right) = (names[i % glyphs], names[(i * 7 + 1) % glyphs])
+        kernpairs.setdefault(left, []).append(right)
+    writefile("kerning.plist", plistdict([(left, "<dict>" + "".join(["<key>%s</key><integer>%d</integer>" % (r, -10 - j)
+        for (j, r) in enumerate(sorted(set(rights), reverse=True))]) + "</dict>") for (left, rights) in reversed(list(kernpairs.items()))]))
+    writefile("groups.plist", plistdict([("public.kern1.bench", "<array>" + "".join(["<string>%s</string>" % n for n in reversed(names[0:20])]) + "</array>")]))
+    layerlist = []
+    for l in range(layers):
+        (layername, layerdir) = ("public.default", "glyphs") if l == 0 else ("layer%d" % l, "glyphs.layer%d" % l)
+        layerlist.append((layername, layerdir))
+        os.makedirs(os.path.join(ufodir, layerdir))
+        contents = []
+        for (i, name) in enumerate(names):
+            glifn = name + ".glif"
+            contents.append((name, "<string>%s</string>" % glifn))
+            outline = ""
+            for c in range(contours):
+                (x, y) = (i % 50 * 10 + c * 100, c * 50)
+                outline += '<contour><point y="%d" x="%d" type="line"/><point y="%d" x="%d.0" type="line"/>' \
+                           '<point y="%d.25" x="%d"/><point y="%d" x="%d"/><point y="%d" x="%d" type="curve" smooth="yes"/></contour>' \
+                           % (y, x, y, x + 300, y + 200, x + 300, y + 300, x + 150, y + 300, x)
+            if i % 3 == 0: outline += '<component yOffset="10" base="%s" xOffset="5"/>' % names[(i + 1) % glyphs]
+            glif = '<?xml version="1.0" encoding="UTF-8"?>\n<glyph format="2" name="%s"><advance width="%d"/>' \
+                   '<unicode hex="%04X"/><anchor y="700" x="250" name="top"/><outline>%s</outline>' \
+                   '<lib><dict><key>z.key</key><string>z</string><key>a.key</key><real>1.50</real></dict></lib></glyph>\n' \
+                   % (name, 500 + i % 100, 0xE000 + i, outline)
+            with io.open(os.path.join(ufodir, layerdir, glifn), "w", encoding="utf-8") as f: f.write(glif)
+        with io.open(os.path.join(ufodir, layerdir, "contents.plist"), "w", encoding="utf-8") as f: f.write(plistdict(contents))
+    writefile("layercontents.plist", plisthead + "<array>\n" + "".join(["<array><string>%s</string><string>%s</string></array>\n" % x
+                                                                      for x in layerlist]) + "</array>\n</plist>\n")
+
+def makeparams(**extra):  # extra can be used to set other parameters, eg digestInput=True
+    params = silfont.core.parameters()
+    params.addset("main", copyset="default")
+    params.sets["main"]["checkfix"] = "none"
+    params.sets["main"]["normCache"] = False  # Caching would hide the cost of normalizing on repeat runs
+    for parn in extra: params.sets["main"][parn] = extra[parn]
+    params.logger.scrlevel = "S"
+    return params
+
+def runphase(name, fn, repeat, results):
+    # Time fn() (best of repeat runs) then run again with tracemalloc to get peak memory
+    times = []
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    results[name] = {"seconds": round(min(times), 4), "peakKB": peak // 1024}
+
+def runbenchmarks(settings, workdir):
+    srcufo = os.path.join(workdir, "bench-src.ufo")
+    normufo = os.path.join(workdir, "bench-norm.ufo")
+    makeufo(srcufo, settings["glyphs"], settings["layers"], settings["contours"], settings["kerning"])
+    repeat = settings["repeat"]
+    phases = {}
+
+    runphase("open", lambda: UFO.Ufont(srcufo, params=makeparams()), repeat, phases)
+    runphase("open-digest", lambda: UFO.Ufont(srcufo, params=makeparams(digestInput=True)), repeat, phases)
+
+    def normalize():  # Write the un-normalized font to a new location
+        if os.path.exists(normufo): shutil.rmtree(normufo)
+        UFO.Ufont(srcufo, params=makeparams()).write(normufo)
+    runphase("normalize", normalize, repeat, phases)
+
+    def writeunchanged():  # Write an already-normalized font in place with no changes
+        UFO.Ufont(normufo, params=makeparams()).write(normufo)
+    runphase("write-unchanged", writeunchanged, repeat, phases)
+
+    changecount = [0]
+    def writechanged():  # Change every tenth glyph in each layer then write in place
+        font = UFO.Ufont(normufo, params=makeparams())
+        changecount[0] += 1
+        for layer in font.layers:
+            for glyphn in list(layer)[::10]: layer[glyphn]["advance"].width = str(1000 + changecount[0])
+        font.write(normufo)
+    runphase("write-changed", writechanged, repeat, phases)
+
+    font = UFO.Ufont(normufo, params=makeparams())
+    glifs = [layer[glyphn] for layer in font.layers for glyphn in layer]
+    for glif in glifs: glif.rebuildET()
+    outparams = font.outparams
+    def serialize():  # Just the ETWriter serialization of all glifs
+        for glif in glifs: UFO.serializeET(glif.etree, "glif", outparams)
+    runphase("serialize", serialize, repeat, phases)
+
+    def executenormalize():  # Full psfnormalize run via execute(), including backup
+        argv = ["psfnormalize", normufo, "-l", os.path.join(workdir, "psfnormalize.log"), "-q", "-p", "checkfix=none",
+                "-p", "normCache=false"]
+        (args, font) = silfont.core.execute("UFO", psfnormalize.doit, psfnormalize.argspec, argv=argv)
+        args.logger.logfile.close()
+    runphase("execute", executenormalize, repeat, phases)
+
+    return {
+        "version": silfont.__version__,
+        "commit": gitcommit(),
+        "date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "settings": settings,
+        "phases": phases}
+
+def gitcommit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def writeresults(results, resultsdir):
+    # Write to a file named after the commit (so results from different commits can be compared) and to latest.json
+    os.makedirs(resultsdir, exist_ok=True)
+    filens = ["latest.json"]
+    if results["commit"]: filens.append("bench-" + results["commit"] + ".json")
+    for filen in filens:
+        with io.open(os.path.join(resultsdir, filen), "w", encoding="utf-8") as f: json.dump(results, f, indent=2)
+    return os.path.join(resultsdir, filens[-1])
+
+def compare(oldfile, newfile):
+    # Print a comparison of two results files
+    with io.open(oldfile, encoding="utf-8") as f: old = json.load(f)
+    with io.open(newfile, encoding="utf-8") as f: new = json.load(f)
+    if old["settings"] != new["settings"]: print("Warning: results are for different settings")
+    print("%-16s %10s %10s %7s %10s %10s" % ("Phase", "Old secs", "New secs", "Ratio", "Old KB", "New KB"))
+    for phase in new["phases"]:
+        n = new["phases"][phase]
+        o = old["phases"].get(phase)
+        if o is None:
+            print("%-16s %10s %10.4f %7s %10s %10d" % (phase, "-", n["seconds"], "-", "-", n["peakKB"]))
+        else:
+            ratio = n["seconds"] / o["seconds"] if o["seconds"] else 0
+            print("%-16s %10.4f %10.4f %7.2f %10d %10d" % (phase, o["seconds"], n["seconds"], ratio, o["peakKB"], n["peakKB"]))
+
+def test_benchmarks(tmp_path):
+    argv = list(sys.argv)
+    results = runbenchmarks(getsettings(), str(tmp_path / "work"))
+    assert sys.argv == argv
+    writeresults(results, str(tmp_path))
+    assert set(results["phases"]) == {"open", "open-digest", "normalize", "write-unchanged", "write-changed", "serialize", "execute"}
+    # Check the normalized font is complete
+    font = UFO.Ufont(str(tmp_path / "work" / "bench-norm.ufo"), params=makeparams())
+    assert len(font.layers) == getsettings()["layers"]
+    assert len(font.deflayer) == getsettings()["glyphs"]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark pysilfont's UFO code")
+    settings = getsettings()
+    parser.add_argument("-g", "--glyphs", type=int, default=settings["glyphs"], help="Number of glyphs per layer")
+    parser.add_argument("-l", "--layers", type=int, default=settings["layers"], help="Number of layers")
+    parser.add_argument("-c", "--contours", type=int, default=settings["contours"], help="Contours per glyph")
+    parser.add_argument("-k", "--kerning", type=int, default=settings["kerning"], help="Number of kerning pairs")
+    parser.add_argument("-r", "--repeat", type=int, default=settings["repeat"], help="Times to run each phase")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two results files then exit")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        results = runbenchmarks({"glyphs": args.glyphs, "layers": args.layers, "contours": args.contours,
+                                 "kerning": args.kerning, "repeat": args.repeat}, workdir)
+        filen = writeresults(results, resultsdir)
+        for (phase, r) in results["phases"].items(): print("%-16s %8.4f secs %8d KB" % (phase, r["seconds"], r["peakKB"]))
+        print("Results written to " + filen)
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+''' Tests for batch mode, where UFO scripts are run on all the fonts in a designspace or matching a wildcard pattern
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+import pytest
+from silfont.core import execute, batchfontlist, loggerobj
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+argspec = [
+    ('ifont', {'help': 'Input font file'}, {'type': 'infont'}),
+    ('ofont', {'help': 'Output font file', 'nargs': '?'}, {'type': 'outfont'}),
+    ('-l', '--log', {'help': 'Log file'}, {'type': 'outfile', 'def': '_batchtest.log'})]
+
+processed = []
+
+def doit(args):
+    ufodir = args.ifont.ufodir
+    processed.append(os.path.basename(ufodir))
+    args.logger.log("Test warning", "W")
+    if "Broken" in ufodir: raise ValueError("Unable to process " + os.path.basename(ufodir))
+    return args.ifont
+
+def makefonts(dirn, names):
+    for name in names: shutil.copytree(testufo, os.path.join(dirn, name))
+
+def runscript(*args):
+    del processed[:]
+    (args, font) = execute("UFO", doit, argspec, argv=["batchtest"] + list(args) + ["-p", "checkfix=none", "-q"])
+    if args.logger.logfile: args.logger.logfile.close()
+    return font
+
+def batchlog(dirn, name="batch"):
+    with open(os.path.join(dirn, "logs", name + "_batchtest.log"), encoding="utf-8") as f: return f.read()
+
+def test_batchfontlist(tmp_path):
+    makefonts(tmp_path, ["B.ufo", "A.ufo", "Foo[wght].ufo"])
+    logger = loggerobj(logfile=io.StringIO(), scrlevel="S")
+    pattern = os.path.join(tmp_path, "[AB].ufo")
+    assert batchfontlist(pattern, logger) == [os.path.join(tmp_path, name) for name in ("A.ufo", "B.ufo")]
+    assert batchfontlist(os.path.join(tmp_path, "Foo[wght].ufo"), logger) is None  # An existing font, not a pattern
+    assert batchfontlist(os.path.join(tmp_path, "A.ufo"), logger) is None
+    with pytest.raises(SystemExit):
+        batchfontlist(os.path.join(tmp_path, "*.designspace"), logger)  # No fonts found
+
+def test_batch(tmp_path):
+    makefonts(tmp_path, ["A.ufo", "B.ufo"])
+    assert runscript(os.path.join(tmp_path, "*.ufo")) is None
+    assert processed == ["A.ufo", "B.ufo"]
+    assert "Command completed with 0 errors and 2 warnings" in batchlog(tmp_path)
+    for name in ("A", "B"): assert os.path.exists(os.path.join(tmp_path, "logs", name + "_batchtest.log"))
+
+    # A font whose name looks like a pattern is processed on its own
+    makefonts(tmp_path, ["Foo[wght].ufo"])
+    assert runscript(os.path.join(tmp_path, "Foo[wght].ufo")) is not None
+    assert processed == ["Foo[wght].ufo"]
+
+def test_batch_failure(tmp_path):
+    # An unexpected error processing one font is reported against that font and the rest are still processed
+    makefonts(tmp_path, ["A.ufo", "Broken.ufo", "C.ufo"])
+    runscript(os.path.join(tmp_path, "*.ufo"))
+    assert processed == ["A.ufo", "Broken.ufo", "C.ufo"]
+    log = batchlog(tmp_path)
+    assert "Command completed with 1 errors and 2 warnings" in log
+    assert "Broken.ufo: failed with an unexpected error: ValueError: Unable to process Broken.ufo" in log
+    log = batchlog(tmp_path, "Broken")  # The failed font's log should be complete
+    assert "Test warning" in log and "Unexpected error: ValueError: Unable to process Broken.ufo" in log
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+''' Tests for the check & fix cache (checkfixCache parameter) in silfont.ufo
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+def openfont(settings):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="W", scrlevel="S")
+    params.sets["default"].update(settings)
+    font = silfont.ufo.Ufont(testufo, params=params)
+    messages = [line[20:] for line in font.logger.logfile.getvalue().splitlines()]  # Without the timestamps
+    return (messages, font.logger.warningcount, font.logger.errorcount)
+
+def test_cache_replayed(tmp_path, monkeypatch):
+    settings = {"checkfixCache": True, "cacheDir": str(tmp_path)}
+    first = openfont(settings)
+    assert os.path.exists(os.path.join(tmp_path, "checkfixcache.json"))
+    def nocheck(*args): raise AssertionError("Checks run despite cached results")
+    monkeypatch.setattr(silfont.ufo.Ufont, "_checkfix", nocheck)
+    second = openfont(settings)
+    assert second == first  # Same messages and counts as a full run
+    assert first[1] > 0 and "Progress: Checking fontinfo.plist metadata" in first[0]
+
+def test_off_by_default(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setenv("HOME", str(tmp_path))
+    openfont({})
+    assert os.listdir(tmp_path) == []
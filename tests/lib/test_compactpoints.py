@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+''' Tests for holding contour points in compact form (compactPoints parameter) in silfont.ufo
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+points = '''<contour>
+      <point x="10.0" y="20.50" type="line"/>
+      <point x="-0" y="1e1" name="p2"/>
+      <point x="30" y="40" type="qcurve" smooth="yes"/>
+    </contour>
+  </outline>'''
+
+def openfont(ufodir, **params):
+    pobj = silfont.core.parameters()
+    pobj.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    pobj.sets["default"].update(params)
+    return silfont.ufo.Ufont(ufodir, params=pobj)
+
+def makefont(dirn):
+    # Copy the test font, adding a contour with numbers in unusual forms to a glyph
+    ufodir = os.path.join(dirn, "source.ufo")
+    shutil.copytree(testufo, ufodir)
+    glifn = os.path.join(ufodir, "glyphs", "A_mpersand.glif")
+    with open(glifn, encoding="utf-8") as f: text = f.read()
+    with open(glifn, "w", encoding="utf-8") as f: f.write(text.replace("</outline>", points, 1))
+    return ufodir
+
+def test_contents(tmp_path):
+    contour = openfont(makefont(tmp_path), compactPoints=True).deflayer["Ampersand"]["outline"].contours[-1]
+    assert contour.xs is not None
+    assert len(contour) == 1 and contour.xs is None  # Accessing the contents restores the point elements
+    assert [point.attrib for point in contour.get("point")] == [
+        {"x": "10.0", "y": "20.50", "type": "line"}, {"x": "-0", "y": "1e1", "name": "p2"},
+        {"x": "30", "y": "40", "type": "qcurve", "smooth": "yes"}]
+
+    contour = openfont(makefont(tmp_path / "2"), compactPoints=True).deflayer["Ampersand"]["outline"].contours[-1]
+    assert list(contour) == ["point"] and list(contour.keys()) == ["point"]
+    assert len(contour["point"]) == 3
+
+def writefont(dirn, **params):
+    ufodir = makefont(dirn)
+    font = openfont(ufodir, **params)
+    if params.get("compactPoints"): assert font.deflayer["Ampersand"]["outline"].contours[-1].xs is not None
+    font.write(ufodir)
+    with open(os.path.join(ufodir, "glyphs", "A_mpersand.glif"), encoding="utf-8") as f: return f.read()
+
+def test_roundtrip(tmp_path):
+    # Output should be the same as when points are held as elements
+    for (n, params) in enumerate(({}, {"intAttribs": ["pos", "width"]}, {"intAttribs": ["pos", "width"], "precision": 1})):
+        expanded = writefont(tmp_path / ("e%d" % n), **params)
+        assert writefont(tmp_path / ("c%d" % n), compactPoints=True, **params) == expanded
+        if n == 0: assert '<point x="10" y="20" type="line"/>' in expanded
+        if n == 1: assert '<point x="10.0" y="20.50" type="line"/>' in expanded
+
+def test_changed_values(tmp_path):
+    ufodir = makefont(tmp_path)
+    font = openfont(ufodir, compactPoints=True, intAttribs=["pos", "width"])
+    glif = font.deflayer["Ampersand"]
+    contour = glif["outline"].contours[-1]
+    contour.xs[0] = 11
+    contour.ys[1] = 2.5
+    glif.changed = True
+    font.write(ufodir)
+    with open(os.path.join(ufodir, "glyphs", "A_mpersand.glif"), encoding="utf-8") as f: text = f.read()
+    assert '<point x="11" y="20.50" type="line"/>' in text
+    assert '<point x="-0" y="2.5" name="p2"/>' in text
@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+''' Tests for the component graph of a layer (componentGlyphs(), componentUsers(), componentClosure(), componentOrder(),
+componentCycles() and updateComponents())
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, shutil
+import pytest
+from xml.etree import ElementTree as ET
+import silfont.core, silfont.ufo
+import silfont.scripts.psfrenameglyphs as psfrenameglyphs
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+def openfont(ufodir):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+@pytest.fixture
+def layer():
+    return openfont(testufo).deflayer
+
+def addcomponent(layer, glyphn, base):
+    layer[glyphn]["outline"].appendobject({"base": base}, "component")
+
+def checkgraph(layer):  # The graph should always match one built from scratch
+    graph = layer._getCompGraph()
+    (layer._compgraph, layer._compusers) = (None, None)
+    assert graph == layer._getCompGraph()
+
+def normcycle(cycle):  # Rotate a cycle to start with its first name alphabetically, so cycles can be compared
+    i = cycle.index(min(cycle))
+    return cycle[i:] + cycle[:i]
+
+def test_graph(layer):
+    assert layer.componentGlyphs("LtnSmAAcute") == ["LtnSmA", "CombAcute"]
+    assert layer.componentGlyphs("LtnSmA") == []
+    assert {"LtnSmAAcute", "LtnSmAGrave"} <= layer.componentUsers("LtnSmA")
+    assert layer.componentUsers("LtnSmAAcute") == set()
+    addcomponent(layer, "AtSgn", "LtnSmAAcute")
+    assert layer.componentUsers("LtnSmAAcute") == {"AtSgn"}
+    assert "AtSgn" in layer.componentUsers("CombAcute", recursive=True)
+    assert "AtSgn" not in layer.componentUsers("CombAcute")
+    checkgraph(layer)
+
+def test_closure(layer):
+    assert layer.componentClosure(["LtnSmAAcute"]) == {"LtnSmAAcute", "LtnSmA", "CombAcute"}
+    assert layer.componentClosure(["LtnSmA", "Missing"]) == {"LtnSmA"}
+    addcomponent(layer, "LtnSmA", "Missing")  # Components not in the layer are ignored
+    addcomponent(layer, "CombAcute", "FullStop")
+    assert layer.componentClosure(["LtnSmAAcute"]) == {"LtnSmAAcute", "LtnSmA", "CombAcute", "FullStop"}
+
+def test_order(layer):
+    addcomponent(layer, "LtnSmA", "FullStop")
+    glyphns = ["LtnSmAAcute", "LtnCapADiaer", "FullStop", "LtnSmA", "CombAcute", "LtnCapA"]
+    order = layer.componentOrder(glyphns)
+    assert sorted(order) == sorted(glyphns)
+    for glyphn in glyphns:
+        for base in layer.componentGlyphs(glyphn):
+            if base in glyphns: assert order.index(base) < order.index(glyphn)
+    order = layer.componentOrder()
+    assert sorted(order) == sorted(layer.keys())
+    assert order.index("FullStop") < order.index("LtnSmA") < order.index("LtnSmAAcute")
+
+def test_cycles(layer):
+    assert layer.componentCycles() == []
+    addcomponent(layer, "LtnSmA", "LtnSmAAcute")
+    addcomponent(layer, "FullStop", "FullStop")
+    assert sorted(normcycle(cycle) for cycle in layer.componentCycles()) == [["FullStop"], ["LtnSmA", "LtnSmAAcute"]]
+    order = layer.componentOrder(["LtnSmAAcute", "LtnSmA", "CombAcute"])  # Cycles don't stop glyphs being ordered
+    assert sorted(order) == ["CombAcute", "LtnSmA", "LtnSmAAcute"]
+    assert layer.componentClosure(["LtnSmA"]) == {"LtnSmAAcute", "LtnSmA", "CombAcute"}
+    layer["FullStop"]["outline"].removeobject(layer["FullStop"]["outline"].components[-1], "component")
+    assert [normcycle(cycle) for cycle in layer.componentCycles()] == [["LtnSmA", "LtnSmAAcute"]]
+    checkgraph(layer)
+
+def test_updates(layer):
+    outline = layer["LtnSmAAcute"]["outline"]
+    outline.components[1].setBase("CombGrave")
+    assert layer.componentGlyphs("LtnSmAAcute") == ["LtnSmA", "CombGrave"]
+    assert "LtnSmAAcute" not in layer.componentUsers("CombAcute")
+    checkgraph(layer)
+
+    # Direct changes to component elements need updateComponents()
+    outline.components[0].element.set("base", "LtnCapA")
+    assert layer.componentGlyphs("LtnSmAAcute") == ["LtnSmA", "CombGrave"]
+    layer.updateComponents("LtnSmAAcute")
+    assert layer.componentGlyphs("LtnSmAAcute") == ["LtnCapA", "CombGrave"]
+    assert "LtnSmAAcute" in layer.componentUsers("LtnCapA")
+    checkgraph(layer)
+
+    layer["LtnSmAAcute"].remove("outline")
+    assert layer.componentGlyphs("LtnSmAAcute") == []
+    checkgraph(layer)
+
+def test_add_delete(layer):
+    glyph = silfont.ufo.Uglif(layer=layer, name="NewGlyph")
+    glyph.add("outline")
+    glyph["outline"].appendobject({"base": "LtnSmAAcute"}, "component")
+    layer.componentGlyphs("LtnSmA")  # Make sure the graph has been built
+    layer.addGlyph(glyph)
+    assert layer.componentUsers("LtnSmAAcute") == {"NewGlyph"}
+    layer.delGlyph("NewGlyph")
+    assert layer.componentUsers("LtnSmAAcute") == set()
+    checkgraph(layer)
+
+def test_rename(layer):
+    layer.componentGlyphs("LtnSmA")  # Make sure the graph has been built
+    layer["LtnSmAAcute"].name = "aacute"  # Renaming a glyph with components (see _renameComponents())
+    assert layer.componentGlyphs("aacute") == ["LtnSmA", "CombAcute"]
+    assert layer.componentGlyphs("LtnSmAAcute") == []
+    assert "aacute" in layer.componentUsers("CombAcute") and "LtnSmAAcute" not in layer.componentUsers("CombAcute")
+    checkgraph(layer)
+
+    # Renaming a glyph used as a component does not change the components using it
+    layer["CombAcute"].name = "acutecomb"
+    assert layer.componentGlyphs("aacute") == ["LtnSmA", "CombAcute"]
+    assert layer.componentUsers("acutecomb") == set()
+    assert layer.componentClosure(["aacute"]) == {"aacute", "LtnSmA"}
+    checkgraph(layer)
+
+def test_renameglyphs_componentinfo(tmp_path):
+    # psfrenameglyphs should update Glyphs component info in glyph libs even if the outline doesn't use the renamed glyph
+    ufodir = str(tmp_path / "test.ufo")
+    shutil.copytree(testufo, ufodir)
+    font = openfont(ufodir)
+    glyph = font.deflayer["AtSgn"]
+    glyph.add("lib")
+    glyph["lib"].addelem("com.schriftgestaltung.Glyphs.ComponentInfo",
+                         ET.fromstring("<array><dict><key>index</key><integer>0</integer><key>name</key><string>LtnSmA</string></dict></array>"))
+    font.write(ufodir)
+    (tmp_path / "namemap.csv").write_text("LtnSmA,a\n")
+    silfont.core.execute("UFO", psfrenameglyphs.doit, psfrenameglyphs.argspec, argv=[
+        "psfrenameglyphs", ufodir, "-i", str(tmp_path / "namemap.csv"), "-l", str(tmp_path / "rename.log"), "-p", "backup=n", "-q"])
+    font = openfont(ufodir)
+    assert font.deflayer["AtSgn"]["lib"].getval("com.schriftgestaltung.Glyphs.ComponentInfo") == [{"index": 0, "name": "a"}]
+    assert font.deflayer.componentGlyphs("LtnSmAAcute") == ["a", "CombAcute"]
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+''' Tests for csvtable in silfont.core, used for glyph_data.csv and similar files
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os
+import pytest
+from silfont.core import csvtable, loggerobj
+
+glyphdata = '''# Comment before the headers
+glyph_name,ps_name,USV,sort_final
+a,a,0061,3
+
+b,b,0062,10
+# Comment
+,empty,,1
+a,a.dup,0061,2
+c,c,0063,1.5
+  d  ,d,0064,4
+'''
+
+def makecsv(dirn, text=glyphdata, filen="glyph_data.csv"):
+    filen = os.path.join(dirn, filen)
+    with open(filen, "w", encoding="utf-8") as f: f.write(text)
+    return filen
+
+def makelogger():
+    return loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+
+def test_read(tmp_path):
+    logger = makelogger()
+    table = csvtable(makecsv(tmp_path), required=("USV",), types={"sort_final": float}, logger=logger).read()
+    assert list(table) == ["a", "b", "c", "d"]  # Keys are stripped
+    assert len(table) == 4 and "c" in table and "e" not in table
+    assert table["b"] == ["b", "b", "0062", "10"]
+    assert table.value("c", "sort_final") == 1.5 and table.value("c", "USV") == "0063"
+    assert table.value("c", "missing", "x") == "x"
+    assert dict(table.column("ps_name")) == {"a": "a", "b": "b", "c": "c", "d": "d"}
+    assert table.linenums == {"a": 3, "b": 5, "c": 9, "d": 10}  # Line numbers in the file
+    assert logger.warningcount == 2  # Empty and duplicate glyph names
+    messages = logger.logfile.getvalue()
+    assert "glyph_data line 7: empty glyph name" in messages
+    assert "glyph_data line 8: glyph name a previously seen" in messages
+
+def test_readrows(tmp_path):
+    table = csvtable(makecsv(tmp_path), logger=makelogger())
+    keys = []
+    for (key, row) in table.readrows(include=lambda key, row: key != "b"):
+        keys.append(key)
+        assert len(table) == len(keys)  # Rows are added as they are read
+    assert keys == ["a", "c", "d"]
+    with pytest.raises(AssertionError):  # Can only be read once
+        table.read()
+
+def test_headers(tmp_path):
+    filen = makecsv(tmp_path, "a,A\nb,B\n", "psnames.csv")
+    table = csvtable(filen, headers=["glyph_name", "ps_name"], logger=makelogger()).read()
+    assert list(table.items()) == [("a", ["a", "A"]), ("b", ["b", "B"])]
+    table = csvtable(filen, keyheader="ps_name", headers=["glyph_name", "ps_name"], logger=makelogger()).read()
+    assert list(table) == ["A", "B"]
+    with pytest.raises(SystemExit):
+        csvtable(makecsv(tmp_path), required=("bmp",), logger=makelogger())
+
+def test_add_delete(tmp_path):
+    table = csvtable(makecsv(tmp_path), logger=makelogger()).read()
+    assert table.add(["e", "e", "0065", "5"])
+    assert not table.add(["a", "a2", "0061", "1"])
+    assert table["a"][1] == "a"
+    assert table.add(["a", "a2", "0061", "1"], replace=True)
+    assert list(table) == ["b", "c", "d", "e", "a"]  # Replaced rows go to the end
+    assert "a" not in table.linenums
+    assert table.add(["f.alt", "F"], headers=["glyph_name", "sort_final"])  # Rearranged to match the table
+    assert table["f.alt"] == ["f.alt", "", "", "F"]
+    table.delete("b")
+    assert list(table) == ["c", "d", "e", "a", "f.alt"]
+
+def test_sort(tmp_path):
+    table = csvtable(makecsv(tmp_path), logger=makelogger()).read()
+    table.sort("sort_final")  # As strings
+    assert list(table) == ["c", "b", "a", "d"]
+    table.types["sort_final"] = float
+    table.sort("sort_final")
+    assert list(table) == ["c", "a", "d", "b"]
+    table.sort("sort_final", reverse=True)
+    assert list(table) == ["b", "d", "a", "c"]
+
+def test_write(tmp_path):
+    table = csvtable(makecsv(tmp_path), logger=makelogger()).read()
+    table.delete("c")
+    table.add(["e", "e", "0065", "5"])
+    outfile = os.path.join(tmp_path, "out.csv")
+    table.write(outfile)
+    with open(outfile, encoding="utf-8") as f:
+        assert f.read() == "glyph_name,ps_name,USV,sort_final\na,a,0061,3\nb,b,0062,10\n  d  ,d,0064,4\ne,e,0065,5\n"
+
+    # Without a headers line in the input, none is output
+    table = csvtable(makecsv(tmp_path, "a,A\n", "psnames.csv"), headers=["glyph_name", "ps_name"], logger=makelogger()).read()
+    table.write(outfile)
+    with open(outfile, encoding="utf-8") as f: assert f.read() == "a,A\n"
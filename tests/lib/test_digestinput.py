@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+''' Tests for keeping only a digest of glifs as read (digestInput parameter) in silfont.ufo
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+import silfont.core, silfont.ufo, silfont.util
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+oldtime = 1000000000 * 10**9  # A modification time files written by the tests won't have
+
+def openfont(ufodir, digestInput):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    params.sets["default"].update({"digestInput": digestInput, "updateTimestamps": False})
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+def makefont(dirn):
+    # Normalized copy of the test font, with all glif modification times set to oldtime
+    ufodir = str(dirn / "test.ufo")
+    shutil.copytree(testufo, ufodir)
+    openfont(ufodir, False).write(ufodir)
+    glyphsdir = os.path.join(ufodir, "glyphs")
+    for filen in os.listdir(glyphsdir): os.utime(os.path.join(glyphsdir, filen), ns=(oldtime, oldtime))
+    return ufodir
+
+def glifs(ufodir):  # Modification times and contents of glifs
+    glyphsdir = os.path.join(ufodir, "glyphs")
+    result = {}
+    for filen in os.listdir(glyphsdir):
+        if filen.endswith(".glif"):
+            with open(os.path.join(glyphsdir, filen), encoding="utf-8") as f:
+                result[filen] = (os.stat(os.path.join(glyphsdir, filen)).st_mtime_ns, f.read())
+    return result
+
+def test_digest_kept(tmp_path):
+    ufodir = makefont(tmp_path)
+    glif = openfont(ufodir, True).deflayer["Ampersand"]
+    assert glif._inxmlstr is None
+    with open(os.path.join(ufodir, "glyphs", "A_mpersand.glif"), encoding="utf-8") as f: text = f.read()
+    assert glif.indigest == silfont.util.textdigest(text)
+    assert glif.inxmlstr == text  # Re-read from disk when needed
+
+def test_write_same(tmp_path):
+    results = []
+    for digestInput in (False, True):
+        ufodir = makefont(tmp_path / str(digestInput))
+        before = glifs(ufodir)
+        font = openfont(ufodir, digestInput)
+        font.deflayer["LtnCapA"]["advance"].width = 999
+        font.write(ufodir)
+        after = glifs(ufodir)
+        # Digests match for unchanged glifs, so they are not rewritten
+        assert {filen for filen in after if after[filen] != before[filen]} == {"L_tnC_apA_.glif"}
+        assert after["L_tnC_apA_.glif"][0] != oldtime and '<advance width="999"/>' in after["L_tnC_apA_.glif"][1]
+        results.append(after)
+    assert {filen: text for (filen, (mtime, text)) in results[1].items()} == \
+           {filen: text for (filen, (mtime, text)) in results[0].items()}
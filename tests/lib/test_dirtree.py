@@ -0,0 +1,44 @@
+#!/usr/bin/env python
+''' Tests for dirTree in silfont.util
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import os
+from silfont.util import dirTree
+
+def makedirs(base):
+    for path in ("a/b/c", "d"): os.makedirs(os.path.join(base, path))
+    for path in ("f.txt", "f.txt~", "a/g.txt", "a/b/h.txt", "a/b/c/i.txt"):
+        with open(os.path.join(base, path), "w") as f: f.write(path)
+    return str(base)
+
+def test_contents(tmp_path):
+    dtree = dirTree(makedirs(tmp_path))
+    assert sorted(dtree) == ["a", "d", "f.txt"]  # Backup files ending in ~ are ignored
+    assert (dtree["a"].type, dtree["d"].type, dtree["f.txt"].type) == ("d", "d", "f")
+    assert dtree["f.txt"].dirtree is None
+    assert sorted(dtree["a"].dirtree) == ["b", "g.txt"]
+    assert sorted(dtree.subTree("a/b/c")) == ["i.txt"]
+    assert dtree.subTree(["a", "b"]) is dtree["a"].dirtree["b"].dirtree
+    assert dtree.subTree("x") is None and dtree["d"].dirtree == {}
+
+def test_readsub(tmp_path):
+    dtree = dirTree(makedirs(tmp_path), readSub=1)
+    assert sorted(dtree["a"].dirtree) == ["b", "g.txt"]
+    assert dtree["a"].dirtree["b"].type == "d" and dtree["a"].dirtree["b"].dirtree is None
+    assert dirTree(str(tmp_path), readSub=0)["a"].dirtree is None
+
+def test_lazy(tmp_path):
+    # Sub-directories are only read when first used
+    dtree = dirTree(makedirs(tmp_path))
+    with open(os.path.join(tmp_path, "a", "new.txt"), "w") as f: f.write("new")
+    assert "new.txt" in dtree["a"].dirtree
+    os.remove(os.path.join(tmp_path, "a", "g.txt"))
+    assert "g.txt" in dtree["a"].dirtree  # Not read again once read
+
+    replacement = dirTree(os.path.join(tmp_path, "a", "b"))
+    dtree["d"].dirtree = replacement  # Setting dirtree replaces the one that would be read
+    assert dtree["d"].dirtree is replacement
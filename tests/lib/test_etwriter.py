@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+''' Tests that ETWriter output is byte-identical to that of the original, simpler, implementation of serialize_xml()
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import glob, os, re
+import pytest
+from xml.etree import ElementTree as ET
+import silfont.core
+import silfont.etutil as ETU
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+class referenceWriter(ETU.ETWriter):
+    # serialize_xml() and _protect() as they were before ETWriter was optimised, to check output has not changed
+
+    def _protect(self, txt, base=ETU._attribprotect) :
+        return re.sub(r'['+r"".join(base.keys())+r"]", lambda m: base[m.group(0)], txt)
+
+    def serialize_xml(self, base = None, indent = '') :
+        outstrings = []
+        outstr=""
+        if base is None :
+            base = self.root
+            outstr += '<?xml version="1.0" encoding="UTF-8"?>\n'
+            if '.pi' in base.attrib :
+                for pi in base.attrib['.pi'].split(",") : outstr += '<?{}?>\n'.format(pi)
+            if '.doctype' in base.attrib : outstr += '<!DOCTYPE {}>\n'.format(base.attrib['.doctype'])
+        tag = base.tag
+        attribs = base.attrib
+        if '.comments' in attribs :
+            for c in attribs['.comments'].split(",") : outstr += '{}<!--{}-->\n'.format(indent, c)
+        i = indent if tag not in self.inlineelem else ""
+        outstr += '{}<{}'.format(i, tag)
+        for k in sorted(list(attribs.keys()), key=lambda x: self.attributeOrder.get(x, x)):
+            if k[0] != '.' :
+                att = attribs[k]
+                if self.precision is not None and k in self.floatAttribs :
+                    if "." in att:
+                        num = round(float(att), self.precision)
+                        att = int(num) if num == int(num) else num
+                elif k in self.intAttribs :
+                        att = int(round(float(att)))
+                else:
+                    att = self._protect(att)
+                outstr += ' {}="{}"'.format(k, att)
+        if len(base) or (base.text and base.text.strip()) :
+            outstr += '>'
+            if base.text and base.text.strip() :
+                if tag not in self.takesCData :
+                    t = base.text
+                    if self.indentML : t = t.replace('\n', '\n' + indent)
+                    t = self._protect(t, base=ETU._elementprotect)
+                else :
+                    t = "<![CDATA[\n\t" + indent + base.text.replace('\n', '\n\t' + indent) + "\n" + indent + "]]>"
+                outstr += t
+            if len(base) :
+                if base[0].tag not in self.inlineelem : outstr += '\n'
+                incr = self.indentFirst if base == self.root else self.indentIncr
+                outstrings.append(outstr); outstr=""
+                for b in base : outstrings.append(self.serialize_xml(base=b, indent=indent + incr))
+                if base[-1].tag not in self.inlineelem : outstr += indent
+            outstr += '</{}>'.format(tag)
+        else :
+            outstr += '/>'
+        if base.tail and base.tail.strip() :
+            outstr += self._protect(base.tail, base=ETU._elementprotect)
+        if tag not in self.inlineelem : outstr += "\n"
+        if '.commentsafter' in base.attrib :
+            for c in base.attrib['.commentsafter'].split(",") : outstr += '{}<!--{}-->\n'.format(indent, c)
+        outstrings.append(outstr)
+        return "".join(outstrings)
+
+def writers(etree, **kwargs):
+    return (ETU.ETWriter(etree, **kwargs).serialize_xml(), referenceWriter(etree, **kwargs).serialize_xml())
+
+ufofiles = sorted(glob.glob(os.path.join(testufo, "**", "*.*"), recursive=True))
+
+@pytest.mark.parametrize("precision", [None, 0, 2])
+def test_ufo_files(precision):
+    outparams = silfont.core.parameters().sets["default"]
+    for filen in ufofiles:
+        if os.path.splitext(filen)[1] not in (".glif", ".plist"): continue
+        etree = ET.parse(filen).getroot()
+        ftype = "glif" if filen.endswith(".glif") else "plist"
+        attribOrder = ETU.makeAttribOrder(outparams["attribOrders.glif"]) if ftype == "glif" else {}
+        (new, old) = writers(etree, attributeOrder=attribOrder, precision=precision,
+                             floatAttribs=outparams["floatAttribs"], intAttribs=outparams["intAttribs"])
+        assert new == old, filen
+
+def test_special_cases():
+    root = ET.fromstring('''<root b="2" a="&lt;&amp;&quot;&gt;" x="1.23456" w="7.6">
+      <p>Text with <i>inline</i> markup &amp; a tail</p>
+      <code>line one
+line two &lt;</code>
+      <ml>multi
+line</ml>
+      <empty/>
+    </root>''')
+    root.attrib.update({".pi": "xml-stylesheet href='a.xsl'", ".doctype": "root", ".comments": "first,second",
+                        ".commentsafter": "after"})
+    root[0][0].attrib[".comments"] = "inline"
+    kwargs = dict(attributeOrder={"b": "0", "x": "1"}, takesCData={"code"}, indentIncr="    ", indentFirst="\t",
+                  indentML=True, inlineelem=["i"], precision=2, floatAttribs=["x"], intAttribs=["w"])
+    (new, old) = writers(root, **kwargs)
+    assert new == old
+    # Output should also be the same for a second writer, which uses the cached attribute orderings
+    assert ETU.ETWriter(root, **kwargs).serialize_xml() == old
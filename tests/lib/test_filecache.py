@@ -0,0 +1,38 @@
+#!/usr/bin/env python
+''' Tests for fileCache in silfont.util
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import os
+from silfont.util import fileCache
+
+def test_save_evicts_oldest(tmp_path):
+    filen = os.path.join(tmp_path, "test.json")
+    cache = fileCache(filen, 2)
+    for key in "abc": cache.set(key, key.upper())
+    cache.get("a")
+    assert cache.save() is None
+    assert cache.evicted == ["b"]
+    assert list(fileCache(filen, 2).entries.items()) == [("c", "C"), ("a", "A")]
+
+def test_save_merge(tmp_path):
+    # Two processes using the same cache file at once
+    filen = os.path.join(tmp_path, "test.json")
+    (cache1, cache2) = (fileCache(filen, 3), fileCache(filen, 3))
+    cache1.set("a")
+    cache1.set("b")
+    cache2.set("c")
+    cache2.set("d")
+    assert cache1.save() is None
+    assert cache2.save() is None  # Without merging, the entries from cache1 are lost
+    assert list(fileCache(filen, 3).entries) == ["c", "d"]
+
+    cache1.set("e")
+    cache1.maxentries = 4
+    assert cache1.save(merge=True) is None
+    assert list(cache1.entries) == ["d", "a", "b", "e"]  # Entries only saved by cache2 go first, as older
+    assert cache1.evicted == ["c"]
+    assert list(fileCache(filen, 4).entries) == ["d", "a", "b", "e"]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+''' Tests for Shaper in silfont.harfbuzz.  These are skipped if HarfBuzz is not available through gi (PyGObject)
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import pytest
+from fontTools.ttLib import TTFont
+
+gi = pytest.importorskip("gi")
+try:
+    gi.require_version('HarfBuzz', '0.0')
+except ValueError:
+    pytest.skip("HarfBuzz gi bindings not available", allow_module_level=True)
+harfbuzz = pytest.importorskip("silfont.harfbuzz")
+
+testttf = "tests/input/PsfTest-R.ttf"
+
+def expected(font, text):  # Glyph ids and advances from the font's cmap and hmtx, for text needing no shaping
+    cmap = font.getBestCmap()
+    names = [cmap[ord(c)] for c in text]
+    return ([font.getGlyphID(n) for n in names], [font['hmtx'][n][0] for n in names])
+
+def test_shape():
+    font = TTFont(testttf)
+    result = harfbuzz.Shaper(testttf).shape("AB&.")
+    assert len(result) == 4
+    assert (list(result.gids), list(result.x_advances)) == expected(font, "AB&.")
+    assert list(result.clusters) == [0, 1, 2, 3]
+    assert list(result.y_advances) == [0] * 4
+    glyph = result[1]
+    assert (glyph.gid, glyph.cluster, glyph.offset, glyph.advance) == \
+           (result.gids[1], 1, (0, 0), (result.x_advances[1], 0))
+
+    # A TTFont gives the same results as the file name, and strings can be shaped right to left
+    rtl = harfbuzz.Shaper(font).shape("AB&.", dir="rtl")
+    assert list(rtl.gids) == list(reversed(result.gids))
+
+def test_shape_many():
+    shaper = harfbuzz.Shaper(testttf)
+    texts = ["A", "AB", "", "&.A"]
+    results = shaper.shape_many(texts, features=["kern"])
+    assert [repr(r) for r in results] == [repr(shaper.shape(t, features=["kern"])) for t in texts]
+    assert len(results[2]) == 0
+
+def test_config_cache():
+    shaper = harfbuzz.Shaper(testttf, cachesize=2)
+    for features in (["kern"], ["liga"], ["kern"], ["smcp"]): shaper.shape("AB", features=features)
+    assert list(shaper._configs) == [(("kern",), None, "", ""), (("smcp",), None, "", "")]  # Least recently used dropped
+
+def test_shape_text():
+    font = TTFont(testttf)
+    glyphs = harfbuzz.shape_text(font, "AB")
+    assert [g.gid for g in glyphs] == expected(font, "AB")[0]
+    shaper = harfbuzz._shapers[font][""]
+    harfbuzz.shape_text(font, "&")
+    assert harfbuzz._shapers[font] == {"": shaper}  # The font is only loaded once
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+''' Tests for Ukerning, the compact kerning store in silfont.ufo
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, shutil
+import silfont.core, silfont.ufo
+from silfont.ufo import Ukerning
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+def openfont(ufodir):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    params.sets["default"].update({"checkfixCache": False})
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+def makekerning(*pairs):
+    kerning = Ukerning()
+    for pair in pairs: kerning.set(*pair)
+    return kerning
+
+def test_set_get_remove():
+    kerning = makekerning(("a", "b", 10), ("a", "c", -5.5), ("b", "a", 0))
+    assert len(kerning) == 3
+    assert kerning.get("a", "c") == -5.5 and kerning.get("b", "a") == 0 and kerning.get("c", "a") is None
+    kerning.set("a", "b", 20)
+    kerning.remove("a", "c")
+    assert ("a", "c") not in kerning and ("a", "b") in kerning
+    assert list(kerning) == [("a", "b", 20), ("b", "a", 0)]
+    assert kerning.firstPairs("a") == {"b": 20} and kerning.secondPairs("a") == {"b": 0}
+
+def test_rename():
+    kerning = makekerning(("a", "b", 10), ("b", "c", 5))
+    assert kerning.rename({"a": "b", "b": "a", "x": "y"}) == []  # Swapping names is allowed
+    assert list(kerning) == [("b", "a", 10), ("a", "c", 5)]
+    assert kerning.rename({"b": "c"}) == ["b"]  # c is already used
+    assert list(kerning) == [("b", "a", 10), ("a", "c", 5)]
+
+def test_rename_unused_name():
+    # Names only in removed pairs are no longer in use, so can be renamed to
+    kerning = makekerning(("a", "b", 10), ("c", "d", 5))
+    kerning.filter(lambda name: name != "c")
+    assert kerning.rename({"a": "c"}) == []
+    assert list(kerning) == [("c", "b", 10)]
+    kerning = makekerning(("a", "b", 10), ("c", "d", 5))
+    kerning.remove("c", "d")
+    assert kerning.rename({"a": "d"}) == []
+    assert list(kerning) == [("d", "b", 10)] and kerning.get("d", "b") == 10
+
+def test_filter():
+    kerning = makekerning(("a", "b", 10), ("b", "c", 5), ("c", "a", 1), ("a", "a", 2))
+    kerning.remove("a", "a")
+    assert kerning.filter(lambda name: name != "c") == 2
+    assert list(kerning) == [("a", "b", 10)]
+    assert kerning.names == ["a", "b"] and ("b", "c") not in kerning
+    kerning.set("c", "a", 3)
+    assert list(kerning) == [("a", "b", 10), ("c", "a", 3)]
+
+def test_merge_scale():
+    kerning = makekerning(("a", "b", 10), ("b", "c", 5))
+    kerning.merge([("a", "b", 20), ("c", "d", 1)], replace=False)
+    assert list(kerning) == [("a", "b", 10), ("b", "c", 5), ("c", "d", 1)]
+    kerning.merge(makekerning(("a", "b", 30)))
+    assert kerning.get("a", "b") == 30
+    kerning.scale(0.5)
+    assert list(kerning) == [("a", "b", 15), ("b", "c", 2), ("c", "d", 0)]
+
+def test_lookup(tmp_path):
+    ufodir = str(tmp_path / "test.ufo")
+    shutil.copytree(testufo, ufodir)
+    font = openfont(ufodir)
+    font.addfile("groups")
+    font.groups.setnative("public.kern1.A", ["A", "Aacute"])
+    font.groups.setnative("public.kern2.V", ["V", "W"])
+    kerning = font.getKerning()
+    kerning.merge([("public.kern1.A", "public.kern2.V", -10), ("public.kern1.A", "W", -20), ("A", "public.kern2.V", -30),
+                   ("A", "V", -40)])
+    assert kerning.lookup("A", "V") == -40  # Glyph-glyph first
+    assert kerning.lookup("A", "W") == -30  # Then glyph-group
+    assert kerning.lookup("Aacute", "W") == -20  # Then group-glyph
+    assert kerning.lookup("Aacute", "V") == -10  # Then group-group
+    assert kerning.lookup("B", "V") == 0 and kerning.lookup("B", "V", None) is None
+
+def test_plist_roundtrip(tmp_path):
+    ufodir = str(tmp_path / "test.ufo")
+    shutil.copytree(testufo, ufodir)
+    font = openfont(ufodir)
+    kerning = font.getKerning()
+    kerning.merge([("A", "V", -40), ("A", "W", 12.5), ("B", "V", 5)])
+    kerning.remove("B", "V")
+    font.write(ufodir)
+
+    kerning = openfont(ufodir).getKerning()
+    assert list(kerning) == [("A", "V", -40), ("A", "W", 12.5)]
+    assert isinstance(kerning.get("A", "V"), int)
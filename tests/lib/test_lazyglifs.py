@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+''' Tests for only reading glifs when they are first accessed (lazyGlifs parameter) in silfont.ufo
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+import pytest
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+def openfont(ufodir):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    params.sets["default"].update({"lazyGlifs": True})
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+def readfile(*path):
+    with open(os.path.join(*path), "rb") as f: return f.read()
+
+@pytest.fixture
+def ufodir(tmp_path):
+    # Copy of the test font with an unnormalized glif, so it can be seen whether it was normalized on output
+    ufodir = str(tmp_path / "source.ufo")
+    shutil.copytree(testufo, ufodir)
+    glifn = os.path.join(ufodir, "glyphs", "A_mpersand.glif")
+    text = readfile(glifn).replace(b'<advance width="1222"/>', b"<advance   width='1222' />\r\n")
+    with open(glifn, "wb") as f: f.write(text)
+    return ufodir
+
+def test_unread_copied(ufodir, tmp_path):
+    font = openfont(ufodir)
+    assert font.deflayer._contents["Ampersand"] is None
+    outdir = str(tmp_path / "output.ufo")
+    font.write(outdir)
+    glifn = os.path.join("glyphs", "A_mpersand.glif")
+    assert readfile(outdir, glifn) == readfile(ufodir, glifn)  # Copied byte-for-byte
+
+    font = openfont(ufodir)
+    font.deflayer["Ampersand"]
+    font.write(outdir)
+    assert b'<advance width="1222"/>\n' in readfile(outdir, glifn)  # Normalized once read
+
+def test_unread_renamed(ufodir):
+    glyphsdir = os.path.join(ufodir, "glyphs")
+    os.rename(os.path.join(glyphsdir, "A_mpersand.glif"), os.path.join(glyphsdir, "amp.glif"))
+    contents = readfile(glyphsdir, "contents.plist").replace(b"A_mpersand.glif", b"amp.glif")
+    with open(os.path.join(glyphsdir, "contents.plist"), "wb") as f: f.write(contents)
+
+    font = openfont(ufodir)
+    font.write(ufodir)
+    assert not os.path.exists(os.path.join(glyphsdir, "amp.glif"))
+    assert b"<string>A_mpersand.glif</string>" in readfile(glyphsdir, "contents.plist")
+    assert openfont(ufodir).deflayer["Ampersand"]["advance"].width == "1222"
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_unread_deleted(ufodir, indexed):
+    font = openfont(ufodir)
+    if indexed: font.deflayer.usvGlyphs(0x26)  # Deleting needs the glif reading to update the unicode index
+    font.deflayer.delGlyph("Ampersand")
+    assert font.deflayer.usvGlyphs(0x26) == []
+    font.write(ufodir)
+    assert not os.path.exists(os.path.join(ufodir, "glyphs", "A_mpersand.glif"))
+    font = openfont(ufodir)
+    assert "Ampersand" not in font.deflayer and font.logger.errorcount == 0
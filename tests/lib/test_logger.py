@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+''' Tests for loggerobj in silfont.core, in particular that messages not being output are not formatted
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io
+import pytest
+from silfont.core import loggerobj
+
+class counted(object):  # Counts how often it is formatted
+    def __init__(self): self.count = 0
+    def __str__(self):
+        self.count += 1
+        return "counted"
+
+def makelogger(loglevel="W"):
+    return loggerobj(logfile=io.StringIO(), loglevel=loglevel, scrlevel="S")
+
+def test_lazy_not_evaluated():
+    logger = makelogger()
+    arg = counted()
+    calls = []
+    logger.log("Value %s", "I", arg)
+    logger.log(lambda: calls.append(1) or "Built", "V")
+    assert arg.count == 0 and calls == []
+    assert logger.logfile.getvalue() == ""
+
+def test_lazy_evaluated():
+    logger = makelogger("I")
+    arg = counted()
+    logger.log("Value %s of %d", "I", arg, 2)
+    logger.log(lambda: "Built", "I")
+    assert arg.count == 1
+    assert [line[20:] for line in logger.logfile.getvalue().splitlines()] == ["Info:     Value counted of 2", "Info:     Built"]
+
+def test_counts():
+    # Errors and warnings are counted whether or not they are output
+    logger = loggerobj(logfile=None, loglevel="E", scrlevel="S")
+    arg = counted()
+    logger.log("Warning %s", "W", arg)
+    logger.log("Error %s", "E", arg)
+    assert (logger.errorcount, logger.warningcount, arg.count) == (1, 1, 0)
+    assert logger.wanted("S") and not logger.wanted("E")
+
+def test_severe():
+    logger = makelogger()
+    with pytest.raises(SystemExit):
+        logger.log("Severe %s", "S", "problem")
+    assert "Severe problem" in logger.logfile.getvalue()
+    with pytest.raises(AssertionError):
+        logger.log(lambda: "Exception", "X")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+''' Tests for the normalization cache (normCache parameter) in silfont.ufo
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+message = "Glyph Ampersand contains a single-point contour with no anchor name"
+
+def openfont(ufodir, cachedir):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    params.sets["default"].update({"normCache": True, "cacheDir": str(cachedir)})
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+def test_messages_replayed(tmp_path):
+    ufodir = str(tmp_path / "test.ufo")
+    shutil.copytree(testufo, ufodir)
+    glifn = os.path.join(ufodir, "glyphs", "A_mpersand.glif")
+    with open(glifn, encoding="utf-8") as f: text = f.read()
+    with open(glifn, "w", encoding="utf-8") as f:
+        f.write(text.replace("<outline>", '<outline>\n    <contour>\n      <point x="10" y="10" type="move"/>\n    </contour>', 1))
+
+    results = []
+    for run in range(3):
+        font = openfont(ufodir, tmp_path / "cache")
+        results.append((font.logger.errorcount, font.logger.logfile.getvalue().count(message), len(font.deflayer.cachedglifs)))
+        font.write(ufodir)
+    assert results[0][:2] == (1, 1)
+    assert results[2] == (1, 1, len(font.deflayer))  # All glifs skipped, but the error is still reported
+
+    # Reading a skipped glif should not report its messages a second time
+    font = openfont(ufodir, tmp_path / "cache")
+    font.deflayer["Ampersand"]
+    assert font.logger.errorcount == 1
+    assert font.logger.logfile.getvalue().count(message) == 1
+
+def test_off_by_default():
+    assert silfont.core.parameters().sets["default"]["normCache"] is False
+
+def test_recording_lazy_messages():
+    logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="W", scrlevel="S")
+    recorder = silfont.ufo._recordingLogger(logger)
+    recorder.log("Glyph %s has %d anchors", "W", "A", 2)
+    recorder.log(lambda: "Built lazily", "I")
+    recorder.log("Plain", "I")
+    assert recorder.messages == [("Glyph A has 2 anchors", "W"), ("Built lazily", "I"), ("Plain", "I")]
+    assert "Glyph A has 2 anchors" in logger.logfile.getvalue() and logger.warningcount == 1
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+''' Tests for comparing output with existing files (filematches() and recordfile() in silfont.util, outputManifest parameter)
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+import silfont.core, silfont.ufo
+from silfont.util import fileCache, filematches, recordfile
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+oldtime = 1000000000 * 10**9  # A modification time files written by the tests won't have
+
+def writefile(filen, text, mtime=None):
+    with open(filen, "w", encoding="utf-8") as f: f.write(text)
+    if mtime is not None: os.utime(filen, ns=(mtime, mtime))
+
+def test_filematches(tmp_path):
+    filen = str(tmp_path / "test.xml")
+    assert not filematches(filen, "<a/>\n")  # No file
+    writefile(filen, "<a/>\n")
+    assert filematches(filen, "<a/>\n")
+    assert not filematches(filen, "<b/>\n")
+    assert not filematches(filen, "<a/>\n\n")  # Different size
+
+def test_manifest(tmp_path):
+    filen = str(tmp_path / "test.xml")
+    manifest = fileCache(str(tmp_path / "manifest.json"), 10)
+    writefile(filen, "<a/>\n", oldtime)
+    recordfile(manifest, filen, "<a/>\n")
+    assert filematches(filen, "<a/>\n", manifest) and not filematches(filen, "<b/>\n", manifest)
+    # If the size and modification time are unchanged, the recorded digest is trusted without reading the file
+    writefile(filen, "<b/>\n", oldtime)
+    assert filematches(filen, "<a/>\n", manifest) and not filematches(filen, "<a/>\n")
+    # Otherwise the file is read
+    writefile(filen, "<b/>\n", oldtime + 1)
+    assert filematches(filen, "<b/>\n", manifest) and not filematches(filen, "<a/>\n", manifest)
+
+def openfont(ufodir, cachedir):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    params.sets["default"].update({"outputManifest": True, "cacheDir": cachedir, "updateTimestamps": False})
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+def glifs(ufodir):  # Modification times and contents of glifs
+    glyphsdir = os.path.join(ufodir, "glyphs")
+    result = {}
+    for filen in os.listdir(glyphsdir):
+        with open(os.path.join(glyphsdir, filen), encoding="utf-8") as f:
+            result[filen] = (os.stat(os.path.join(glyphsdir, filen)).st_mtime_ns, f.read())
+    return result
+
+def test_write(tmp_path):
+    cachedir = str(tmp_path / "cache")
+    ufodir = str(tmp_path / "source.ufo")
+    outdir = str(tmp_path / "output.ufo")
+    shutil.copytree(testufo, ufodir)
+    openfont(ufodir, cachedir).write(outdir)
+    assert os.path.exists(os.path.join(cachedir, "outputmanifest.json"))
+
+    # Unchanged output is not rewritten
+    before = glifs(outdir)
+    openfont(ufodir, cachedir).write(outdir)
+    assert glifs(outdir) == before
+
+    # Changed output is
+    font = openfont(ufodir, cachedir)
+    font.deflayer["LtnCapA"]["advance"].width = 999
+    font.write(outdir)
+    after = glifs(outdir)
+    assert {filen for filen in after if after[filen] != before[filen]} == {"L_tnC_apA_.glif"}
+    assert '<advance width="999"/>' in after["L_tnC_apA_.glif"][1]
+
+    # The output is checked against the files on disk, so is still right if they are changed by something else
+    glifn = os.path.join(outdir, "glyphs", "A_mpersand.glif")
+    writefile(glifn, after["A_mpersand.glif"][1].replace("1222", "1223"))
+    openfont(ufodir, cachedir).write(outdir)
+    assert glifs(outdir)["A_mpersand.glif"][1] == after["A_mpersand.glif"][1]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+''' Tests that reading and writing glifs in parallel (parallel parameter) gives the same results as doing so serially
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+from xml.etree import ElementTree as ET
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+def openfont(ufodir, parallel):
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="V", scrlevel="S")
+    params.sets["default"].update({"parallel": parallel, "updateTimestamps": False})
+    return silfont.ufo.Ufont(ufodir, params=params)
+
+def glifxml(font):
+    # The text and parsed xml for the glifs in each layer, in order
+    result = []
+    for layer in font.layers:
+        for glyphn in layer:
+            glif = layer[glyphn]
+            result.append((layer.layername, glyphn, glif.inxmlstr, ET.tostring(glif.etree, encoding="unicode")))
+    return result
+
+def logtext(font):  # Log messages without the time stamps
+    return [line[20:] for line in font.logger.logfile.getvalue().splitlines()]
+
+def readufo(ufodir):
+    files = {}
+    for (dirn, subdirs, filens) in os.walk(ufodir):
+        for filen in filens:
+            with open(os.path.join(dirn, filen), "rb") as f: files[os.path.relpath(os.path.join(dirn, filen), ufodir)] = f.read()
+    return files
+
+def test_parallel_read():
+    serial = openfont(testufo, 0)
+    parallel = openfont(testufo, 2)
+    assert [layer.layername for layer in parallel.layers] == [layer.layername for layer in serial.layers]
+    assert glifxml(parallel) == glifxml(serial)
+    assert logtext(parallel) == logtext(serial)
+
+def test_parallel_write(tmp_path):
+    outputs = []
+    for parallel in (0, 2):
+        dirn = tmp_path / str(parallel)
+        ufodir = str(dirn / "test.ufo")
+        shutil.copytree(testufo, ufodir)
+        font = openfont(ufodir, parallel)
+        font.deflayer["LtnCapA"]["advance"].width = 999  # So there are changes to write
+        font.write(ufodir)
+        font.write(str(dirn / "new.ufo"))  # To a new UFO
+        log = [line.replace(str(dirn), "") for line in logtext(font)]
+        outputs.append((readufo(ufodir), readufo(str(dirn / "new.ufo")), log))
+    assert outputs[1] == outputs[0]
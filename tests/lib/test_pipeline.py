@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+''' Tests for checking steps in psfpipeline job files
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, json, importlib, types, pytest
+import silfont.core
+import silfont.scripts.psfpipeline as pipeline
+
+def rundoit(tmp_path, steps):
+    jobfile = tmp_path / "job.json"
+    jobfile.write_text(json.dumps({"steps": steps}))
+    logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    args = types.SimpleNamespace(logger=logger, ifont=types.SimpleNamespace(ufodir="test.ufo"), job=str(jobfile),
+                                 paramsobj=types.SimpleNamespace(profiler=silfont.core.profiler()), quiet=True)
+    with pytest.raises(SystemExit):
+        pipeline.doit(args)
+    return logger.logfile.getvalue()
+
+def test_scripttool():  # Each script's tool attribute is what it passes to execute()
+    for (script, tool) in (("psfnormalize", "UFO"), ("psfdeflang", "FT"), ("psfsetglyphdata", "")):
+        assert importlib.import_module("silfont.scripts." + script).tool == tool
+
+def test_nonufo_rejected(tmp_path):  # fontParts scripts also have an infont argument, but can't be passed a Ufont
+    log = rundoit(tmp_path, [{"script": "psfdupglyphs"}])
+    assert "psfdupglyphs can't be used in a pipeline since it does not process a UFO" in log
+
+def test_unknown_script(tmp_path):
+    log = rundoit(tmp_path, [{"script": "psfnosuchscript"}])
+    assert "psfnosuchscript is not a pysilfont script" in log
+
+def test_import_error_reported(tmp_path, monkeypatch):
+    def import_module(name):
+        raise ModuleNotFoundError("No module named 'missingdep'", name="missingdep")
+    monkeypatch.setattr(pipeline.importlib, "import_module", import_module)
+    log = rundoit(tmp_path, [{"script": "psfnormalize"}])
+    assert "unable to import psfnormalize: No module named 'missingdep'" in log
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+''' Tests for holding plist values as python objects with Uplist.getnative() and setnative()
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io, os, shutil
+from xml.etree import ElementTree as ET
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+plistxml = '''<plist version="1.0">
+<dict>
+  <key>numbers</key>
+  <array><integer>05</integer><integer>7</integer><real>1.50</real><real>2.5</real><real>3</real></array>
+  <key>nested</key>
+  <dict><key>a</key><array><string>x</string><string/><true/><false/></array><key>b</key><real>-0.0</real></dict>
+  <key>date</key>
+  <date>2025-01-01T00:00:00Z</date>
+</dict>
+</plist>'''
+
+def makeplist():
+    plist = silfont.ufo.Uplist()
+    plist.etree = ET.fromstring(plistxml)
+    plist.populate_dict()
+    return plist
+
+def elemxml(plist, key):
+    return ET.tostring(plist[key][1], encoding="unicode").rstrip()  # Without the tail
+
+def test_getnative():
+    plist = makeplist()
+    assert plist.getnative("numbers") == [5, 7, 1.5, 2.5, 3.0]
+    assert plist.getnative("nested") == {"a": ["x", "", True, False], "b": -0.0}
+    assert plist.getnative("date").tag == "date"  # Other types are kept as elements
+    assert plist.getnative("numbers") is plist.getnative("numbers")
+    assert plist.getnative("missing", 1) == 1
+    assert plist.getval("numbers") == [5, 7, 1.5, 2.5, 3.0] and type(plist.getval("numbers")[0]) is int
+
+def test_unchanged_roundtrip():
+    original = makeplist()
+    plist = makeplist()
+    for key in ("numbers", "nested", "date"): plist.getnative(key)
+    for key in ("numbers", "nested", "date"): assert elemxml(plist, key) == elemxml(original, key)
+
+def test_changed_values():
+    plist = makeplist()
+    numbers = plist.getnative("numbers")
+    numbers[0] += 1
+    numbers[2] = 1.75
+    numbers.append(10)
+    assert elemxml(plist, "numbers") == ("<array><integer>6</integer><integer>7</integer><real>1.75</real>"
+                                         "<real>2.5</real><real>3</real><integer>10</integer></array>")
+
+def test_setnative():
+    plist = makeplist()
+    plist.setnative("numbers", [1, 2.0])
+    plist.setnative("new", {"x": [True, "y"]})
+    assert plist.getnative("numbers") == [1, 2.0]
+    assert elemxml(plist, "numbers") == "<array><integer>1</integer><real>2.0</real></array>"
+    assert elemxml(plist, "new") == "<dict><key>x</key><array><true /><string>y</string></array></dict>"
+    assert list(plist.keys()) == ["numbers", "nested", "date", "new"]
+
+def test_font_roundtrip(tmp_path):
+    # Output should be the same whether or not getnative() has been used
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    outputs = []
+    for usenative in (False, True):
+        ufodir = str(tmp_path / ("test%d.ufo" % usenative))
+        shutil.copytree(testufo, ufodir)
+        font = silfont.ufo.Ufont(ufodir, params=params)
+        font.lib.addelem("org.sil.test", ET.fromstring("<array><integer>05</integer><real>2.50</real></array>"))
+        if usenative: assert font.lib.getnative("org.sil.test") == [5, 2.5]
+        font.write(ufodir)
+        with open(os.path.join(ufodir, "lib.plist"), encoding="utf-8") as f: outputs.append(f.read())
+    assert outputs[0] == outputs[1]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+''' Tests for reporting the time and memory used by each phase of a script (profile and profilefile parameters)
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import os, pstats, shutil
+from silfont.core import execute
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+argspec = [
+    ('ifont', {'help': 'Input font file'}, {'type': 'infont'}),
+    ('ofont', {'help': 'Output font file', 'nargs': '?'}, {'type': 'outfont'}),
+    ('-l', '--log', {'help': 'Log file'}, {'type': 'outfile', 'def': '_profiletest.log'})]
+
+def doit(args):
+    return args.ifont
+
+def runscript(tmp_path, *params):
+    ufodir = str(tmp_path / "test.ufo")
+    if not os.path.exists(ufodir): shutil.copytree(testufo, ufodir)
+    argv = ["profiletest", ufodir, "-p", "checkfix=none", "-p", "backup=n", "-q"]
+    for param in params: argv += ["-p", param]
+    (args, font) = execute("UFO", doit, argspec, argv=argv)
+    args.logger.logfile.close()
+    with open(os.path.join(tmp_path, "logs", "test_profiletest.log"), encoding="utf-8") as f: return f.read()
+
+def test_times(tmp_path):
+    log = runscript(tmp_path, "profile=times")
+    assert "Profile of phases" in log
+    for phase in ("Open font", "Read layer public.default", "Run script profiletest", "Write font"): assert phase in log
+    assert "Profile of phases" not in runscript(tmp_path)  # Off by default
+
+def test_profilefile(tmp_path):
+    profilefile = str(tmp_path / "profile.out")
+    log = runscript(tmp_path, "profile=cprofile", "profilefile=" + profilefile)
+    assert "cProfile statistics written to " + profilefile in log
+    stats = pstats.Stats(profilefile)
+    assert any(func[2] == "doit" for func in stats.stats)  # The script's doit() was profiled
+
+    log = runscript(tmp_path, "profile=cprofile")  # Without profilefile, statistics are logged
+    assert "cProfile statistics:" in log
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+''' Tests for the unicode index of a layer (usvGlyphs() and glyphUSVs()) being kept up to date as glyphs change
+'''
+__url__ = 'https://github.com/silnrsi/pysilfont'
+__copyright__ = 'Copyright (c) 2025 SIL Global (https://www.sil.org)'
+__license__ = 'Released under the MIT License (https://opensource.org/licenses/MIT)'
+__author__ = 'SIL Global'
+
+import io
+import pytest
+import silfont.core, silfont.ufo
+
+testufo = "tests/input/font-psf-test/source/PsfTest-Regular.ufo"
+
+@pytest.fixture(params=[True, False], ids=["indexed", "unindexed"])
+def layer(request):
+    # The layer's index is either built before the changes are made, so needs updating, or built after
+    params = silfont.core.parameters()
+    params.logger = silfont.core.loggerobj(logfile=io.StringIO(), loglevel="I", scrlevel="S")
+    layer = silfont.ufo.Ufont(testufo, params=params).deflayer
+    if request.param: layer.usvGlyphs(0)
+    return layer
+
+def checkindex(layer):  # The index should always match one built from scratch
+    layer.usvGlyphs(0)
+    expected = {}
+    for glyphn in layer:
+        for usv in layer.glyphUSVs(glyphn): expected.setdefault(usv, []).append(glyphn)
+    assert {usv: sorted(glyphns) for (usv, glyphns) in layer._usvindex.items()} == \
+           {usv: sorted(glyphns) for (usv, glyphns) in expected.items()}
+
+def test_lookup(layer):
+    assert layer.usvGlyphs(0x41) == ["LtnCapA"]
+    assert layer.glyphUSVs("LtnCapA") == [0x41]
+    assert layer.usvGlyphs(0xE000) == []
+    checkindex(layer)
+
+def test_add_del_glyph(layer):
+    glyph = silfont.ufo.Uglif(layer=layer, name="NewGlyph")
+    glyph.add("unicode", {"hex": "E000"})
+    glyph.add("unicode", {"hex": "0041"})
+    layer.addGlyph(glyph)
+    assert layer.usvGlyphs(0xE000) == ["NewGlyph"]
+    assert sorted(layer.usvGlyphs(0x41)) == ["LtnCapA", "NewGlyph"]
+    checkindex(layer)
+    layer.delGlyph("LtnCapA")
+    assert layer.usvGlyphs(0x41) == ["NewGlyph"]
+    checkindex(layer)
+
+def test_rename(layer):
+    layer["LtnCapA"].name = "A"
+    assert layer.usvGlyphs(0x41) == ["A"]
+    checkindex(layer)
+
+def test_unicode_changes(layer):
+    glyph = layer["LtnCapA"]
+    glyph.add("unicode", {"hex": "0391"})
+    assert layer.usvGlyphs(0x391) == ["LtnCapA"]
+    glyph["unicode"][0].hex = "E041"
+    assert layer.usvGlyphs(0x41) == [] and layer.usvGlyphs(0xE041) == ["LtnCapA"]
+    assert layer.glyphUSVs("LtnCapA") == [0xE041, 0x391]
+    checkindex(layer)
+    glyph.remove("unicode", index=1)
+    assert layer.usvGlyphs(0x391) == []
+    assert layer.glyphUSVs("LtnCapA") == [0xE041]
+    checkindex(layer)
+
+def test_unattached_glyph(layer):
+    # Glyphs created for a layer but not added to it should not be indexed
+    glyph = silfont.ufo.Uglif(layer=layer, name="Loose")
+    glyph.add("unicode", {"hex": "E001"})
+    assert layer.usvGlyphs(0xE001) == []
+    checkindex(layer)